@@ -1,55 +1,154 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from pydantic import BaseModel
-from datetime import datetime
-from backend.app.core.database import get_db
-from backend.app.models.appointments import Appointment
-from backend.app.models.doctors import Doctor
-from backend.app.services.summarizer import generate_summary
-
-router = APIRouter()
-
-# Pydantic Model for incoming data
-class AppointmentCreate(BaseModel):
-    doctor_id: int
-    patient_id: int # Hardcoded to 1 for demo
-    symptoms: str   # From the chat
-
-@router.post("/")
-def create_appointment(appt: AppointmentCreate, db: Session = Depends(get_db)):
-    # 1. Generate AI Summary immediately
-    print("🧠 Generating medical summary for doctor...")
-    summary = generate_summary(appt.symptoms)
-    
-    # 2. Save to Database
-    db_appt = Appointment(
-        patient_id=appt.patient_id,
-        doctor_id=appt.doctor_id,
-        symptoms=appt.symptoms,
-        ai_summary=summary,
-        status="pending",
-        appointment_date=datetime.utcnow()
-    )
-    db.add(db_appt)
-    db.commit()
-    db.refresh(db_appt)
-    
-    return {"status": "success", "id": db_appt.id, "summary": summary}
-
-@router.get("/doctor/{doctor_id}")
-def get_doctor_queue(doctor_id: int, db: Session = Depends(get_db)):
-    # Get all pending appointments for this doctor
-    return db.query(Appointment)\
-        .filter(Appointment.doctor_id == doctor_id)\
-        .filter(Appointment.status == "pending")\
-        .all()
-
-@router.put("/{appt_id}/complete")
-def complete_appointment(appt_id: int, db: Session = Depends(get_db)):
-    appt = db.query(Appointment).filter(Appointment.id == appt_id).first()
-    if not appt:
-        raise HTTPException(status_code=404, detail="Appointment not found")
-    
-    appt.status = "completed"
-    db.commit()
+import base64
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+from pydantic import BaseModel
+from datetime import datetime
+from backend.app.core.database import get_db
+from backend.app.core.security import doctor_id_of, get_current_user
+from backend.app.models.appointments import Appointment
+from backend.app.models.doctors import Doctor
+from backend.app.services.summary_queue import summary_queue
+from backend.app.services.chat_sessions import chat_sessions
+from backend.app.services.summarizer import SUMMARY_VERSION
+
+router = APIRouter()
+
+# Pydantic Model for incoming data
+class AppointmentCreate(BaseModel):
+    doctor_id: int  # The patient is the signed-in user (bearer token), never taken from the body
+    symptoms: str   # From the chat
+    session_id: Optional[str] = None  # Chat session whose rolling summary is reused
+
+# Lean queue row: no symptoms / ai_summary text, those come from the detail endpoint
+class AppointmentListItem(BaseModel):
+    id: int
+    patient_id: Optional[int] = None
+    doctor_id: Optional[int] = None
+    appointment_date: Optional[datetime] = None
+    status: Optional[str] = None
+    summary_status: Optional[str] = None
+
+class AppointmentPage(BaseModel):
+    items: List[AppointmentListItem]
+    next_cursor: Optional[str] = None
+
+class AppointmentDetail(AppointmentListItem):
+    symptoms: Optional[str] = None
+    ai_summary: Optional[str] = None
+    summary_error: Optional[str] = None
+
+LIST_COLUMNS = (
+    Appointment.id,
+    Appointment.patient_id,
+    Appointment.doctor_id,
+    Appointment.appointment_date,
+    Appointment.status,
+    Appointment.summary_status,
+)
+
+def _encode_cursor(appointment_date: datetime, appt_id: int):
+    raw = f"{appointment_date.isoformat()}|{appt_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def _decode_cursor(cursor: str):
+    try:
+        date_part, id_part = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(date_part), int(id_part)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+@router.post("/")
+def create_appointment(
+    appt: AppointmentCreate,
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    # 1. Reuse the chat's rolling summary when it already covers every message
+    summary, up_to_date = None, False
+    if appt.session_id:
+        # Only the patient's own chat: another patient's session is reported as missing
+        if not chat_sessions.is_owner(appt.session_id, current_user["user_id"]):
+            raise HTTPException(status_code=404, detail="Chat session not found")
+        summary, up_to_date = chat_sessions.latest_summary(appt.session_id)
+
+    # 2. Save to Database right away, any missing summary is generated in the background
+    db_appt = Appointment(
+        patient_id=current_user["user_id"],
+        doctor_id=appt.doctor_id,
+        symptoms=appt.symptoms,
+        status="pending",
+        chat_session_id=appt.session_id,
+        ai_summary=summary if up_to_date else None,
+        summary_version=SUMMARY_VERSION if up_to_date else None,
+        summary_status="done" if up_to_date else "pending",
+        appointment_date=datetime.utcnow()
+    )
+    db.add(db_appt)
+    db.commit()
+    db.refresh(db_appt)
+
+    # 3. Queue the AI Summary for the doctor
+    if not up_to_date:
+        summary_queue.enqueue(db_appt.id)
+    
+    return {"status": "success", "id": db_appt.id, "summary_status": db_appt.summary_status}
+
+@router.get("/doctor/{doctor_id}", response_model=AppointmentPage)
+def get_doctor_queue(
+    doctor_id: int,
+    status: str = "pending",
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    """
+    One page of a doctor's queue, oldest first. Walks the
+    (doctor_id, status, appointment_date) index with keyset pagination:
+    pass `next_cursor` back as `cursor` for the next page.
+    """
+    query = db.query(*LIST_COLUMNS)\
+        .filter(Appointment.doctor_id == doctor_id)\
+        .filter(Appointment.status == status)
+
+    if cursor:
+        after_date, after_id = _decode_cursor(cursor)
+        query = query.filter(Appointment.appointment_date >= after_date)\
+            .filter(or_(
+                Appointment.appointment_date > after_date,
+                and_(Appointment.appointment_date == after_date, Appointment.id > after_id),
+            ))
+
+    rows = query.order_by(Appointment.appointment_date, Appointment.id)\
+        .limit(limit + 1)\
+        .all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_cursor(rows[-1].appointment_date, rows[-1].id)
+
+    return {"items": [row._asdict() for row in rows], "next_cursor": next_cursor}
+
+@router.get("/{appt_id}", response_model=AppointmentDetail)
+def get_appointment(appt_id: int, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+    """Full appointment, including the symptoms and AI summary text; only for its patient or its doctor"""
+    appt = db.query(Appointment).filter(Appointment.id == appt_id).first()
+    if appt and appt.patient_id != current_user["user_id"]:
+        doctor_id = doctor_id_of(db, current_user)
+        if doctor_id is None or appt.doctor_id != doctor_id:
+            appt = None  # Same answer as a missing one, so ids cannot be probed
+    if not appt:
+        raise HTTPException(status_code=404, detail="Appointment not found")
+    return {column.name: getattr(appt, column.name) for column in Appointment.__table__.columns}
+
+@router.put("/{appt_id}/complete")
+def complete_appointment(appt_id: int, db: Session = Depends(get_db)):
+    appt = db.query(Appointment).filter(Appointment.id == appt_id).first()
+    if not appt:
+        raise HTTPException(status_code=404, detail="Appointment not found")
+    
+    appt.status = "completed"
+    db.commit()
     return {"status": "marked as completed"}
\ No newline at end of file
@@ -1,78 +1,111 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from pydantic import BaseModel
-from passlib.context import CryptContext
-from backend.app.core.database import get_db
-from backend.app.models.users import User
-
-router = APIRouter()
-
-# Password Hashing Tool
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-# Pydantic Models
-class UserCreate(BaseModel):
-    full_name: str
-    email: str
-    password: str
-    role: str = "patient" # default
-
-class UserLogin(BaseModel):
-    email: str
-    password: str
-
-# Helpers
-def verify_password(plain, hashed):
-    return pwd_context.verify(plain, hashed)
-
-def get_password_hash(password):
-    return pwd_context.hash(password)
-
-# --- ENDPOINTS ---
-
-@router.post("/signup")
-def signup(user: UserCreate, db: Session = Depends(get_db)):
-    # 1. Check if email exists
-    db_user = db.query(User).filter(User.email == user.email).first()
-    if db_user:
-        raise HTTPException(status_code=400, detail="Email already registered")
-    
-    # 2. Create User
-    new_user = User(
-        full_name=user.full_name,
-        email=user.email,
-        hashed_password=get_password_hash(user.password),
-        role=user.role
-    )
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
-    
-    return {"status": "success", "user_id": new_user.id, "role": new_user.role}
-
-@router.post("/login")
-def login(user: UserLogin, db: Session = Depends(get_db)):
-    # 1. Find User
-    db_user = db.query(User).filter(User.email == user.email).first()
-    if not db_user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    # 2. Check Password
-    if not verify_password(user.password, db_user.hashed_password):
-        raise HTTPException(status_code=400, detail="Incorrect password")
-    
-    # 3. Return Info (In real app, return JWT Token here)
-    return {
-        "status": "success",
-        "user_id": db_user.id,
-        "full_name": db_user.full_name,
-        "email": db_user.email,
-        "role": db_user.role
-    }
-
-@router.get("/profile/{user_id}")
-def get_profile(user_id: int, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    return user
\ No newline at end of file
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from pydantic import BaseModel
+from backend.app.core.database import get_async_db, get_db
+from backend.app.core.security import create_access_token, doctor_id_of, get_current_user
+from backend.app.models.appointments import Appointment
+from backend.app.models.users import User
+from backend.app.services.password_hasher import password_hasher
+from backend.app.core.errors import PoolFullError
+
+router = APIRouter()
+
+# Pydantic Models
+class UserCreate(BaseModel):
+    full_name: str
+    email: str
+    password: str  # No role: self-signup is always a patient, see create_doctor_account.py
+
+class UserLogin(BaseModel):
+    email: str
+    password: str
+
+# Everything but hashed_password
+PROFILE_FIELDS = ("id", "full_name", "email", "role", "age", "gender", "blood_group")
+
+# Helpers (bcrypt runs on the hasher's process pool, off the request threadpool)
+async def verify_password(plain, hashed):
+    try:
+        return await password_hasher.verify(plain, hashed)
+    except PoolFullError:
+        raise _busy()
+
+async def get_password_hash(password):
+    try:
+        return await password_hasher.hash(password)
+    except PoolFullError:
+        raise _busy()
+
+def _busy():
+    return HTTPException(
+        status_code=503,
+        detail="Too many sign-ins right now, please try again shortly.",
+        headers={"Retry-After": "2"},
+    )
+
+async def _find_user(db, email: str):
+    return await db.scalar(select(User).where(User.email == email).limit(1))
+
+# --- ENDPOINTS ---
+
+@router.post("/signup")
+async def signup(user: UserCreate, db=Depends(get_async_db)):
+    # 1. Check if email exists
+    db_user = await _find_user(db, user.email)
+    if db_user:
+        raise HTTPException(status_code=400, detail="Email already registered")
+    
+    # 2. Create User
+    new_user = User(
+        full_name=user.full_name,
+        email=user.email,
+        hashed_password=await get_password_hash(user.password),
+        role="patient"
+    )
+    db.add(new_user)
+    await db.commit()
+    await db.refresh(new_user)
+    
+    return {"status": "success", "user_id": new_user.id, "role": new_user.role}
+
+@router.post("/login")
+async def login(user: UserLogin, db=Depends(get_async_db)):
+    # 1. Find User
+    db_user = await _find_user(db, user.email)
+    if not db_user:
+        raise HTTPException(status_code=404, detail="User not found")
+    
+    # 2. Check Password
+    if not await verify_password(user.password, db_user.hashed_password):
+        raise HTTPException(status_code=400, detail="Incorrect password")
+    
+    # 3. Return Info + a signed token for the protected endpoints
+    return {
+        "status": "success",
+        "access_token": create_access_token(db_user),
+        "token_type": "bearer",
+        "user_id": db_user.id,
+        "full_name": db_user.full_name,
+        "email": db_user.email,
+        "role": db_user.role
+    }
+
+@router.get("/me")
+def get_me(current_user: dict = Depends(get_current_user)):
+    """Identity from the bearer token alone, no database lookup"""
+    return current_user
+
+@router.get("/profile/{user_id}")
+def get_profile(user_id: int, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+    """A user's own profile; doctors may also look up patients who booked with them"""
+    if current_user["user_id"] != user_id:
+        doctor_id = doctor_id_of(db, current_user)
+        booked = doctor_id is not None and db.query(Appointment.id).filter(
+            Appointment.patient_id == user_id, Appointment.doctor_id == doctor_id).first()
+        if not booked:
+            raise HTTPException(status_code=403, detail="Not allowed to view this profile")
+    user = db.query(User).filter(User.id == user_id).first()
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    return {column: getattr(user, column) for column in PROFILE_FIELDS}
\ No newline at end of file
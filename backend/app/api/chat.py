@@ -1,27 +1,216 @@
-# File: backend/app/api/chat.py
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from backend.app.services.rag_service import rag_service
-from backend.app.services.llm_service import llm_service
-
-router = APIRouter()
-
-class ChatRequest(BaseModel):
-    message: str
-
-@router.post("/")
-def chat_with_ai(request: ChatRequest):
-    user_msg = request.message
-    
-    # 1. Retrieve Context (The "Memory")
-    print(f"🔍 Searching for: {user_msg}")
-    context = rag_service.search(user_msg)
-    
-    # 2. Generate Answer (The "Brain")
-    print("🤖 Generating response...")
-    ai_reply = llm_service.generate_response(user_msg, context)
-    
-    return {
-        "reply": ai_reply,
-        "sources": context  # Optional: Show user what data was used
-    }
\ No newline at end of file
+# File: backend/app/api/chat.py
+import json
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from pydantic import BaseModel
+from backend.app.core import config
+from backend.app.core.database import async_session, get_async_db
+from backend.app.core.metrics import span
+from backend.app.core.security import get_current_user, get_optional_user
+from backend.app.services.rag_service import rag_service
+from backend.app.services.llm_service import llm_service, NO_CONTEXT_REPLY
+from backend.app.services.semantic_cache import semantic_cache
+from backend.app.services.chat_sessions import chat_sessions
+from backend.app.services.domain_router import route
+
+router = APIRouter()
+
+class ChatRequest(BaseModel):
+    message: str
+    session_id: Optional[str] = None  # From POST /sessions; omit for a one-off question
+    specialty: Optional[str] = None  # Booking context (Doctor.specialization), narrows retrieval to that partition
+
+def _is_cacheable(reply: str):
+    # Never cache transport errors, the next request should retry Ollama
+    return not reply.startswith("⚠️ AI Error")
+
+async def _load_history(session_id: Optional[str], current_user: Optional[dict]):
+    if not session_id:
+        return None
+    # Short-lived sessions here and in _record_turn: no connection is held while the model generates
+    async with async_session() as db:
+        # Another patient's session is reported as missing, not as forbidden
+        owned = current_user is not None and await chat_sessions.is_owner_async(db, session_id, current_user["user_id"])
+        history = await chat_sessions.history_async(db, session_id) if owned else None
+    if history is None:
+        raise HTTPException(status_code=404, detail="Chat session not found")
+    return history
+
+def _is_follow_up(history):
+    # A follow-up's answer depends on earlier turns, so it is never served from / stored in the semantic cache
+    return bool(history and history["recent"])
+
+def _retrieval_query(user_msg: str, history):
+    """Follow-ups ("what about the dosage?") are searched together with the previous question"""
+    if not _is_follow_up(history):
+        return user_msg
+    previous = [content for role, content in history["recent"] if role == "user"]
+    return f"{previous[-1]} {user_msg}" if previous else user_msg
+
+def _cache_scope(specialty: Optional[str]):
+    """
+    Answers are cached per specialty partition the booking pins retrieval to, so one
+    built from cardiology documents is never served to a dermatology booking
+    """
+    domains = route(specialty=specialty) if config.ROUTING_ENABLED else None
+    return domains[0] if domains else None
+
+def _retrieve(user_msg: str, use_cache: bool = True, specialty: Optional[str] = None):
+    """Embeds the query once, checks the semantic cache, and retrieves context on a miss"""
+    query_embedding = rag_service.embed_query(user_msg)
+
+    if config.SEMANTIC_CACHE_ENABLED and use_cache:
+        with span("semantic_cache_lookup"):
+            cached = semantic_cache.lookup(query_embedding, rag_service.data_version(), _cache_scope(specialty))
+        if cached:
+            print(f"⚡ Cache hit ({cached['similarity']:.3f}) for: {user_msg}")
+            return query_embedding, cached["sources"], None, None, cached
+
+    print(f"🔍 Searching for: {user_msg}")
+    context, scores, lexical = rag_service.search_by_embedding(
+        query_embedding, query_text=user_msg, specialty=specialty, with_scores=True
+    )
+    return query_embedding, context, scores, lexical, None
+
+async def _record_turn(session_id: Optional[str], user_msg: str, reply: str):
+    if session_id and _is_cacheable(reply):
+        async with async_session() as db:
+            await chat_sessions.append_turn(db, session_id, user_msg, reply)
+
+@router.post("/sessions")
+async def create_chat_session(current_user: dict = Depends(get_current_user), db=Depends(get_async_db)):
+    """Starts a server-side conversation for the signed-in patient; pass the returned session_id with each message"""
+    return {"session_id": await chat_sessions.create(db, current_user["user_id"])}
+
+@router.get("/sessions/{session_id}")
+async def get_chat_session(session_id: str, current_user: dict = Depends(get_current_user), db=Depends(get_async_db)):
+    """Full transcript plus the rolling summary, for the session's own patient only"""
+    if not await chat_sessions.is_owner_async(db, session_id, current_user["user_id"]):
+        raise HTTPException(status_code=404, detail="Chat session not found")
+    summary, up_to_date = await chat_sessions.latest_summary_async(db, session_id)
+    return {
+        "session_id": session_id,
+        "summary": summary,
+        "summary_up_to_date": up_to_date,
+        "messages": await chat_sessions.messages_async(db, session_id),
+    }
+
+@router.post("/")
+async def chat_with_ai(request: ChatRequest, current_user: Optional[dict] = Depends(get_optional_user)):
+    user_msg = request.message
+    history = await _load_history(request.session_id, current_user)
+    use_cache = not _is_follow_up(history)
+    
+    # 1. Retrieve Context (The "Memory"), blocking model + Chroma call kept off the event loop
+    query_embedding, context, scores, lexical, cached = await run_in_threadpool(
+        _retrieve, _retrieval_query(user_msg, history), use_cache, request.specialty
+    )
+    if cached:
+        await _record_turn(request.session_id, user_msg, cached["reply"])
+        return {"reply": cached["reply"], "sources": context, "cached": True, "session_id": request.session_id}
+
+    # 2. Nothing relevant retrieved: answer without spending an LLM call
+    plan = llm_service.plan(user_msg, scores, lexical, gate=not _is_follow_up(history))
+    if plan["tier"] == "gated":
+        print(f"🚧 Low retrieval confidence ({plan['confidence']}, lexical {plan['lexical']}), skipping the LLM")
+        await _record_turn(request.session_id, user_msg, NO_CONTEXT_REPLY)
+        return {"reply": NO_CONTEXT_REPLY, "sources": [], "cached": False, "tier": "gated",
+                "confidence": plan["confidence"], "session_id": request.session_id}
+
+    # 3. Generate Answer (The "Brain") on the tier's model, awaited on the shared Ollama pool
+    print(f"🤖 Generating response with {plan['model']} ({plan['tier']} tier)...")
+    ai_reply, prompt = await llm_service.answer(user_msg, context, plan, history=history)
+
+    if config.SEMANTIC_CACHE_ENABLED and use_cache and _is_cacheable(ai_reply):
+        semantic_cache.store(query_embedding, ai_reply, context, rag_service.data_version(), _cache_scope(request.specialty))
+    await _record_turn(request.session_id, user_msg, ai_reply)
+    
+    return {
+        "reply": ai_reply,
+        "sources": context,  # Optional: Show user what data was used
+        "cached": False,
+        "tier": plan["tier"],
+        "model": prompt["model"],
+        "confidence": plan["confidence"],
+        "prompt_tokens": prompt["prompt_tokens"],
+        "context": prompt["context"],
+        "session_id": request.session_id,
+    }
+
+@router.post("/stream")
+async def chat_with_ai_stream(request: ChatRequest, current_user: Optional[dict] = Depends(get_optional_user)):
+    """
+    Streaming variant of chat_with_ai. Responds with NDJSON lines:
+    {"type": "sources", ...} first, then {"type": "token", ...} per token, then {"type": "done"}
+    """
+    user_msg = request.message
+    history = await _load_history(request.session_id, current_user)
+    use_cache = not _is_follow_up(history)
+
+    # 1. Retrieve Context (blocking model + Chroma call, keep it off the event loop)
+    query_embedding, context, scores, lexical, cached = await run_in_threadpool(
+        _retrieve, _retrieval_query(user_msg, history), use_cache, request.specialty
+    )
+
+    async def event_stream():
+        if cached:
+            yield json.dumps({"type": "sources", "sources": context, "cached": True}) + "\n"
+            yield json.dumps({"type": "token", "content": cached["reply"]}) + "\n"
+            await _record_turn(request.session_id, user_msg, cached["reply"])
+            yield json.dumps({"type": "done", "session_id": request.session_id}) + "\n"
+            return
+
+        # No escalation here: tokens already sent can't be taken back
+        plan = llm_service.plan(user_msg, scores, lexical, gate=not _is_follow_up(history))
+        if plan["tier"] == "gated":
+            yield json.dumps({"type": "sources", "sources": [], "cached": False, "tier": "gated",
+                              "confidence": plan["confidence"]}) + "\n"
+            yield json.dumps({"type": "token", "content": NO_CONTEXT_REPLY}) + "\n"
+            await _record_turn(request.session_id, user_msg, NO_CONTEXT_REPLY)
+            yield json.dumps({"type": "done", "session_id": request.session_id}) + "\n"
+            return
+
+        prompt = llm_service.build_prompt(user_msg, context, history=history, model=plan["model"])
+        yield json.dumps({
+            "type": "sources",
+            "sources": context,
+            "cached": False,
+            "tier": plan["tier"],
+            "model": prompt["model"],
+            "confidence": plan["confidence"],
+            "prompt_tokens": prompt["prompt_tokens"],
+            "context": prompt["context"],
+        }) + "\n"
+
+        # 2. Stream Answer token by token
+        print(f"🤖 Streaming response ({prompt['prompt_tokens']} prompt tokens)...")
+        tokens = []
+        async for token in llm_service.stream_response(user_msg, context, prompt=prompt):
+            tokens.append(token)
+            yield json.dumps({"type": "token", "content": token}) + "\n"
+
+        ai_reply = "".join(tokens)
+        if config.SEMANTIC_CACHE_ENABLED and use_cache and _is_cacheable(ai_reply):
+            semantic_cache.store(query_embedding, ai_reply, context, rag_service.data_version(), _cache_scope(request.specialty))
+        await _record_turn(request.session_id, user_msg, ai_reply)
+
+        yield json.dumps({"type": "done", "session_id": request.session_id}) + "\n"
+
+    return StreamingResponse(event_stream(), media_type="application/x-ndjson")
+
+@router.get("/cache/stats")
+def chat_cache_stats():
+    """Hit/miss counters for tuning CURACORE_SEMANTIC_CACHE_THRESHOLD"""
+    return semantic_cache.stats()
+
+@router.get("/cascade/stats")
+def chat_cascade_stats():
+    """Answers per tier, for tuning CURACORE_CONFIDENCE_MIN_SCORE / CURACORE_CONFIDENCE_MIN_LEXICAL / CURACORE_CASCADE_SMALL_MIN_SCORE"""
+    return llm_service.tier_stats()
+
+@router.delete("/cache")
+def clear_chat_cache():
+    semantic_cache.invalidate()
+    return {"status": "cleared"}
@@ -1,10 +1,105 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from backend.app.core.database import get_db
-from backend.app.models.doctors import Doctor
-
-router = APIRouter()
-
-@router.get("/")
-def get_all_doctors(db: Session = Depends(get_db)):
-    return db.query(Doctor).all()
\ No newline at end of file
+import json
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import and_, event, func, or_
+from sqlalchemy.orm import Session
+from backend.app.core import config
+from backend.app.core.database import get_db
+from backend.app.models.doctors import Doctor
+from backend.app.services.response_cache import ResponseCache
+
+router = APIRouter()
+
+doctor_cache = ResponseCache(
+    ttl_seconds=config.DOCTOR_CACHE_TTL_SECONDS,
+    max_entries=config.DOCTOR_CACHE_MAX_ENTRIES,
+)
+
+# Any ORM write to a doctor drops every cached listing / search page once it is
+# committed. Not at flush time: a request rebuilding between the flush and the
+# commit would read the old rows and cache them for the whole TTL.
+@event.listens_for(Session, "after_flush")
+def _note_doctor_changes(session, flush_context):
+    if any(isinstance(obj, Doctor) for obj in (*session.new, *session.dirty, *session.deleted)):
+        session.info["doctors_changed"] = True
+
+@event.listens_for(Session, "do_orm_execute")
+def _note_doctor_bulk_changes(state):
+    if (state.is_insert or state.is_update or state.is_delete) and state.bind_mapper is Doctor.__mapper__:
+        state.session.info["doctors_changed"] = True
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_doctor_cache(session):
+    if session.info.pop("doctors_changed", False):
+        doctor_cache.invalidate()
+
+@event.listens_for(Session, "after_rollback")
+def _forget_doctor_changes(session):
+    session.info.pop("doctors_changed", None)
+
+def _starts_with(column, prefix: str):
+    """Case-insensitive prefix match as a range on lower(column), so its expression index is used"""
+    low = prefix.lower()
+    return and_(func.lower(column) >= low, func.lower(column) < low[:-1] + chr(ord(low[-1]) + 1))
+
+def _serialize(doctors):
+    return [{column.name: getattr(doc, column.name) for column in Doctor.__table__.columns} for doc in doctors]
+
+def _cached_json(request: Request, key, build):
+    """Serves a cached body, or 304 when the client's If-None-Match is current"""
+    body, etag = doctor_cache.get_or_build(key, lambda: json.dumps(jsonable_encoder(build())).encode("utf-8"))
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}  # no-cache = always revalidate
+    if etag in [tag.strip() for tag in request.headers.get("if-none-match", "").split(",")]:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+@router.get("/")
+def get_all_doctors(request: Request, db: Session = Depends(get_db)):
+    return _cached_json(request, "all", lambda: _serialize(db.query(Doctor).order_by(Doctor.id).all()))
+
+@router.get("/search")
+def search_doctors(
+    request: Request,
+    specialization: Optional[str] = None,
+    location: Optional[str] = None,
+    min_fee: Optional[int] = None,
+    max_fee: Optional[int] = None,
+    min_experience: Optional[int] = None,
+    name: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+):
+    """
+    Server-side doctor search. `specialization` is an exact match, `location` a
+    case-insensitive exact match and `name` a case-insensitive prefix of the name,
+    with or without the "Dr." title. Each is served by an index.
+    Returns {items, total, limit, offset}.
+    """
+    def build():
+        query = db.query(Doctor)
+        if specialization:
+            query = query.filter(Doctor.specialization == specialization)
+        if location:
+            query = query.filter(func.lower(Doctor.location) == location.strip().lower())
+        if name and name.strip():
+            prefixes = {name.strip(), f"Dr. {name.strip()}"}
+            query = query.filter(or_(*(_starts_with(Doctor.full_name, prefix) for prefix in prefixes)))
+        if min_fee is not None:
+            query = query.filter(Doctor.consultation_fee >= min_fee)
+        if max_fee is not None:
+            query = query.filter(Doctor.consultation_fee <= max_fee)
+        if min_experience is not None:
+            query = query.filter(Doctor.experience_years >= min_experience)
+
+        total = query.count()
+        doctors = query.order_by(Doctor.id).offset(offset).limit(limit).all()
+        return {"items": _serialize(doctors), "total": total, "limit": limit, "offset": offset}
+
+    key = ("search", specialization, location, name, min_fee, max_fee, min_experience, limit, offset)
+    return _cached_json(request, key, build)
+
+@router.get("/cache/stats")
+def doctor_cache_stats():
+    return doctor_cache.stats()
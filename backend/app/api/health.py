@@ -0,0 +1,40 @@
+# File: backend/app/api/health.py
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from backend.app.core.lazy import LazyService
+from backend.app.services.ollama_client import ollama_pool
+from backend.app.services.model_client import model_client, ModelServerError
+
+router = APIRouter()
+
+@router.get("/live")
+def liveness():
+    return {"status": "online"}
+
+@router.get("/ready")
+def readiness(warm: bool = False):
+    """
+    Per-model readiness and load time. With ?warm=true any model that is not
+    loaded yet starts loading in the background (the call itself never blocks).
+    Returns 503 until every model is ready, so it can gate a load balancer.
+    """
+    services = LazyService.all()
+    if warm:
+        for service in services.values():
+            service.warm_up()
+
+    models = {name: service.status() for name, service in services.items()}
+    if model_client is not None:
+        # Multi-worker mode: the real models live in the shared model server
+        try:
+            remote = model_client.status()["models"]
+        except ModelServerError as e:
+            remote = {"server": {"state": "failed", "load_seconds": None, "error": str(e)}}
+        models.update({f"model_server.{name}": status for name, status in remote.items()})
+    ready = all(model["state"] == "ready" for model in models.values())
+    return JSONResponse(status_code=200 if ready else 503, content={"ready": ready, "models": models})
+
+@router.get("/ollama")
+def ollama_stats():
+    """Shared Ollama client: requests, coalesced duplicates, timeouts, active/waiting per model"""
+    return ollama_pool.stats()
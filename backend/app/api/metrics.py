@@ -0,0 +1,33 @@
+# File: backend/app/api/metrics.py
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from backend.app.core import metrics
+from backend.app.core.metrics import CallbackMetric
+from backend.app.services.ollama_client import ollama_pool
+from backend.app.services.rag_service import rag_service
+from backend.app.services.semantic_cache import semantic_cache
+from backend.app.services.summary_queue import summary_queue
+from backend.app.services.transcription_pool import transcription_pool
+
+router = APIRouter()
+
+# Queue depths and counters the services already keep, read at scrape time
+CallbackMetric("curacore_summary_queue_depth", "Appointment summaries waiting for a worker", summary_queue.depth)
+CallbackMetric("curacore_transcription_in_flight", "Transcriptions running or queued", transcription_pool.in_flight)
+CallbackMetric("curacore_ollama_active", "Generations running per model", lambda: ollama_pool.stats()["active"], labelname="model")
+CallbackMetric("curacore_ollama_waiting", "Generations queued per model", lambda: ollama_pool.stats()["waiting"], labelname="model")
+CallbackMetric("curacore_ollama_requests_total", "Ollama requests", lambda: ollama_pool.requests, kind="counter")
+CallbackMetric("curacore_ollama_coalesced_total", "Requests served by an identical in-flight one", lambda: ollama_pool.coalesced, kind="counter")
+CallbackMetric("curacore_ollama_timeouts_total", "Ollama requests that timed out", lambda: ollama_pool.timeouts, kind="counter")
+CallbackMetric("curacore_semantic_cache_hits_total", "Semantic cache hits", lambda: semantic_cache.hits, kind="counter")
+CallbackMetric("curacore_semantic_cache_misses_total", "Semantic cache misses", lambda: semantic_cache.misses, kind="counter")
+CallbackMetric("curacore_semantic_cache_entries", "Semantic cache entries", lambda: semantic_cache.stats()["entries"])
+CallbackMetric(
+    "curacore_embedding_batches_total", "Batched query-embedding encodes",
+    lambda: rag_service.query_batcher.batches if rag_service.loaded else 0, kind="counter",
+)
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    """Prometheus scrape endpoint"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
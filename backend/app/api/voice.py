@@ -1,30 +1,95 @@
-# File: backend/app/api/voice.py
-from fastapi import APIRouter, UploadFile, File, HTTPException
-from backend.app.services.whisper_service import whisper_service
-import shutil
-import os
-import uuid
-
-router = APIRouter()
-UPLOAD_DIR = "backend/data/uploads"
-
-os.makedirs(UPLOAD_DIR, exist_ok=True)
-
-@router.post("/transcribe")
-async def transcribe_audio(file: UploadFile = File(...)):
-    # 1. Save the upload temporarily
-    file_ext = file.filename.split(".")[-1]
-    filename = f"{uuid.uuid4()}.{file_ext}"
-    file_path = os.path.join(UPLOAD_DIR, filename)
-    
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-        
-    # 2. Transcribe
-    print(f"🎤 Processing audio: {filename}")
-    text = whisper_service.transcribe(file_path)
-    
-    # 3. Cleanup (Optional: delete file after processing)
-    # os.remove(file_path)
-    
-    return {"text": text}
\ No newline at end of file
+# File: backend/app/api/voice.py
+import asyncio
+import json
+import os
+from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi.responses import StreamingResponse
+from backend.app.core import config
+from backend.app.core.errors import PoolFullError
+from backend.app.services.whisper_service import whisper_service
+from backend.app.services.transcription_pool import transcription_pool
+
+router = APIRouter()
+
+READ_CHUNK_BYTES = 1024 * 1024
+
+def _too_large():
+    return HTTPException(status_code=413, detail="Audio file too large")
+
+async def _read_upload(file: UploadFile):
+    """
+    Reads the upload into memory (nothing else is written to disk), a chunk at a
+    time, so an oversized file is rejected before more than the limit is held
+    """
+    limit = int(config.TRANSCRIBE_MAX_UPLOAD_MB * 1024 * 1024)
+    if file.size is not None and file.size > limit:
+        raise _too_large()
+
+    chunks, size = [], 0
+    while chunk := await file.read(READ_CHUNK_BYTES):
+        size += len(chunk)
+        if size > limit:
+            raise _too_large()
+        chunks.append(chunk)
+    data = b"".join(chunks)
+    print(f"🎤 Processing audio: {file.filename} ({len(data)} bytes)")
+    return data, os.path.splitext(file.filename or "")[1]
+
+def _transcribe(*args):
+    # Resolved on the worker thread, so a first-use model load never blocks the event loop
+    return whisper_service.transcribe_bytes(*args)
+
+def _submit(*args):
+    """Queues a job on the transcription pool, 503 when it is full"""
+    try:
+        return transcription_pool.submit(_transcribe, *args)
+    except PoolFullError:
+        raise HTTPException(
+            status_code=503,
+            detail="Transcription is busy, please try again shortly.",
+            headers={"Retry-After": "5"},
+        )
+
+def _sse(event: str, payload: dict):
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+@router.post("/transcribe")
+async def transcribe_audio(file: UploadFile = File(...)):
+    # 1. Read the upload
+    data, suffix = await _read_upload(file)
+        
+    # 2. Transcribe on the worker pool, the event loop stays free
+    text = await asyncio.wrap_future(_submit(data, suffix))
+    
+    return {"text": text}
+
+@router.post("/transcribe/stream")
+async def transcribe_audio_stream(file: UploadFile = File(...)):
+    """
+    Server-Sent Events: one `partial` event per segment as it finishes
+    ({index, start, end, text, total}, possibly out of order), then a `done`
+    event with the full transcript stitched in audio order.
+    """
+    data, suffix = await _read_upload(file)
+
+    loop = asyncio.get_running_loop()
+    events = asyncio.Queue()
+
+    def on_partial(partial):
+        loop.call_soon_threadsafe(events.put_nowait, partial)
+
+    future = _submit(data, suffix, on_partial)
+    future.add_done_callback(lambda _: loop.call_soon_threadsafe(events.put_nowait, None))
+
+    async def event_stream():
+        while True:
+            partial = await events.get()
+            if partial is None:
+                break
+            yield _sse("partial", partial)
+        try:
+            yield _sse("done", {"text": future.result()})
+        except Exception as e:
+            yield _sse("error", {"detail": str(e)})
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
@@ -0,0 +1,146 @@
+# File: backend/app/core/config.py
+import os
+
+# Settings are read from the environment so each deployment can tune them
+# without code changes. Defaults match a single CPU-only clinic box.
+
+def _env_float(name, default):
+    return float(os.getenv(name, default))
+
+def _env_int(name, default):
+    return int(os.getenv(name, default))
+
+def _env_bool(name, default):
+    return os.getenv(name, str(default)).lower() in ("1", "true", "yes", "on")
+
+def _env_model_map(name, default=None):
+    """Parses "model=value,model=value" (model names may contain ':' but not '=')"""
+    values = dict(default or {})
+    for item in os.getenv(name, "").split(","):
+        if "=" in item:
+            model, _, value = item.rpartition("=")
+            values[model.strip()] = int(value)
+    return values
+
+# --- API worker processes ---
+# run.py --workers N sets this in every worker. Each worker has its own Ollama pool
+# and summary threads, so the Ollama limits below are machine-wide totals that are
+# split between the workers. Every worker keeps at least one slot: with more
+# workers than a limit allows, the effective total is the worker count.
+API_WORKERS = max(1, _env_int("CURACORE_API_WORKERS", 1))
+
+def _per_worker(total):
+    return max(1, total // API_WORKERS)
+
+# --- Semantic answer cache (chat) ---
+SEMANTIC_CACHE_ENABLED = _env_bool("CURACORE_SEMANTIC_CACHE", True)
+SEMANTIC_CACHE_THRESHOLD = _env_float("CURACORE_SEMANTIC_CACHE_THRESHOLD", 0.92)  # cosine similarity
+SEMANTIC_CACHE_MAX_ENTRIES = _env_int("CURACORE_SEMANTIC_CACHE_MAX_ENTRIES", 1000)
+SEMANTIC_CACHE_MAX_BYTES = _env_int("CURACORE_SEMANTIC_CACHE_MAX_BYTES", 32 * 1024 * 1024)
+SEMANTIC_CACHE_TTL_SECONDS = _env_float("CURACORE_SEMANTIC_CACHE_TTL", 6 * 60 * 60)
+
+# --- Query embedding micro-batching ---
+EMBED_BATCH_MAX_SIZE = _env_int("CURACORE_EMBED_BATCH_MAX_SIZE", 32)
+EMBED_BATCH_MAX_WAIT_MS = _env_float("CURACORE_EMBED_BATCH_MAX_WAIT_MS", 5)
+EMBED_CACHE_SIZE = _env_int("CURACORE_EMBED_CACHE_SIZE", 2048)  # 0 disables the LRU
+
+# --- Hybrid (BM25 + vector) retrieval ---
+HYBRID_SEARCH_ENABLED = _env_bool("CURACORE_HYBRID_SEARCH", True)
+HYBRID_CANDIDATES = _env_int("CURACORE_HYBRID_CANDIDATES", 20)  # per retriever, before fusion
+RRF_K = _env_int("CURACORE_RRF_K", 60)
+
+# --- Specialty routing (see services/domain_router.py) ---
+ROUTING_ENABLED = _env_bool("CURACORE_ROUTING", True)
+ROUTING_MIN_SCORE = _env_float("CURACORE_ROUTING_MIN_SCORE", 0.35)  # Best routed cosine below this -> search everything
+
+# --- Background appointment summaries ---
+SUMMARY_WORKERS = _per_worker(_env_int("CURACORE_SUMMARY_WORKERS", 1))  # Concurrent generations against Ollama
+SUMMARY_MAX_ATTEMPTS = _env_int("CURACORE_SUMMARY_MAX_ATTEMPTS", 3)
+SUMMARY_RETRY_BACKOFF_SECONDS = _env_float("CURACORE_SUMMARY_RETRY_BACKOFF", 5)
+
+# --- Voice transcription pool ---
+TRANSCRIBE_WORKERS = _env_int("CURACORE_TRANSCRIBE_WORKERS", 1)
+TRANSCRIBE_QUEUE_DEPTH = _env_int("CURACORE_TRANSCRIBE_QUEUE_DEPTH", 4)  # Waiting jobs before 503
+TRANSCRIBE_MAX_UPLOAD_MB = _env_float("CURACORE_TRANSCRIBE_MAX_UPLOAD_MB", 25)
+
+# --- Whisper / long-audio segmentation ---
+WHISPER_MODEL_SIZE = os.getenv("CURACORE_WHISPER_MODEL", "base")  # tiny / base / small ... accuracy vs latency
+SEGMENT_MAX_SECONDS = _env_float("CURACORE_SEGMENT_MAX_SECONDS", 30)  # Whisper's own window is 30 s
+SEGMENT_MIN_SILENCE_MS = _env_int("CURACORE_SEGMENT_MIN_SILENCE_MS", 400)
+SEGMENT_WORKERS = _env_int("CURACORE_SEGMENT_WORKERS", max(1, (os.cpu_count() or 2) // 2))
+VAD_AGGRESSIVENESS = _env_int("CURACORE_VAD_AGGRESSIVENESS", 2)  # webrtcvad 0-3, if installed
+VAD_ENERGY_MARGIN_DB = _env_float("CURACORE_VAD_ENERGY_MARGIN_DB", 12)  # Fallback energy VAD
+
+# --- Model loading ---
+WARM_MODELS_ON_STARTUP = _env_bool("CURACORE_WARM_MODELS", False)  # Otherwise loaded on first use
+
+# --- Shared Ollama client ---
+OLLAMA_HOST = os.getenv("OLLAMA_HOST")  # None = ollama library default (http://127.0.0.1:11434)
+OLLAMA_TIMEOUT_SECONDS = _env_float("CURACORE_OLLAMA_TIMEOUT", 180)
+OLLAMA_MAX_IN_FLIGHT = _per_worker(_env_int("CURACORE_OLLAMA_MAX_IN_FLIGHT", 2))  # Across all models
+OLLAMA_DEFAULT_MODEL_CONCURRENCY = _per_worker(_env_int("CURACORE_OLLAMA_MODEL_CONCURRENCY", 1))
+# Per-model overrides, e.g. "gemma:2b=2,llama3:8b-instruct-q4_K_M=1"
+OLLAMA_MODEL_CONCURRENCY = {model: _per_worker(limit) for model, limit in _env_model_map("CURACORE_OLLAMA_CONCURRENCY").items()}
+
+# --- Context packing (prompt size per model) ---
+# Token budget for the retrieved CONTEXT block, e.g. "gemma:2b=1500,llama3:8b-instruct-q4_K_M=3000"
+CONTEXT_TOKEN_BUDGETS = _env_model_map("CURACORE_CONTEXT_BUDGETS", {
+    "gemma:2b": 1500,
+    "llama3:8b-instruct-q4_K_M": 3000,
+})
+DEFAULT_CONTEXT_TOKEN_BUDGET = _env_int("CURACORE_DEFAULT_CONTEXT_BUDGET", 2000)
+
+# --- Doctor directory cache ---
+DOCTOR_CACHE_TTL_SECONDS = _env_float("CURACORE_DOCTOR_CACHE_TTL", 300)  # Safety net for writes from other processes
+DOCTOR_CACHE_MAX_ENTRIES = _env_int("CURACORE_DOCTOR_CACHE_MAX_ENTRIES", 256)
+
+# --- Database ---
+DATABASE_URL = os.getenv("CURACORE_DATABASE_URL", "sqlite:///./curacore.db")
+SQLITE_WAL = _env_bool("CURACORE_SQLITE_WAL", True)  # Readers no longer block on the writer
+SQLITE_BUSY_TIMEOUT_MS = _env_int("CURACORE_SQLITE_BUSY_TIMEOUT_MS", 15000)
+SQLITE_SYNCHRONOUS = os.getenv("CURACORE_SQLITE_SYNCHRONOUS", "NORMAL")  # NORMAL is durable enough under WAL
+DB_POOL_SIZE = _env_int("CURACORE_DB_POOL_SIZE", 10)
+DB_MAX_OVERFLOW = _env_int("CURACORE_DB_MAX_OVERFLOW", 20)
+DB_POOL_TIMEOUT_SECONDS = _env_float("CURACORE_DB_POOL_TIMEOUT", 30)
+ASYNC_DB_ENABLED = _env_bool("CURACORE_ASYNC_DB", True)  # Needs aiosqlite (+ greenlet)
+
+# --- Auth ---
+BCRYPT_WORKERS = _env_int("CURACORE_BCRYPT_WORKERS", 2)  # 0 = hash inline on the request threadpool
+BCRYPT_QUEUE_DEPTH = _env_int("CURACORE_BCRYPT_QUEUE_DEPTH", 16)
+BCRYPT_ROUNDS = _env_int("CURACORE_BCRYPT_ROUNDS", 12)
+JWT_SECRET = os.getenv("CURACORE_JWT_SECRET", "")  # Empty = generated once and kept in JWT_SECRET_FILE
+JWT_SECRET_FILE = os.getenv("CURACORE_JWT_SECRET_FILE", "backend/data/jwt_secret")
+JWT_ALGORITHM = "HS256"
+JWT_EXPIRE_MINUTES = _env_int("CURACORE_JWT_EXPIRE_MINUTES", 12 * 60)
+TOKEN_CACHE_SIZE = _env_int("CURACORE_TOKEN_CACHE_SIZE", 4096)
+
+# --- Metrics ---
+METRICS_ENABLED = _env_bool("CURACORE_METRICS", True)  # Off = spans and observations become no-ops
+
+# --- Chat sessions ---
+CHAT_RECENT_MESSAGES = _env_int("CURACORE_CHAT_RECENT_MESSAGES", 6)  # Verbatim turns kept in the prompt
+CHAT_HISTORY_TOKEN_BUDGET = _env_int("CURACORE_CHAT_HISTORY_TOKENS", 800)  # Summary + recent turns, whatever the session length
+CHAT_SUMMARY_MAX_TOKENS = _env_int("CURACORE_CHAT_SUMMARY_MAX_TOKENS", 400)
+CHAT_SUMMARY_WORKERS = _per_worker(_env_int("CURACORE_CHAT_SUMMARY_WORKERS", 1))
+
+# --- Vector store ---
+VECTOR_BACKEND = os.getenv("CURACORE_VECTOR_BACKEND", "chroma")  # chroma, quantized
+QUANTIZED_STORE_PATH = os.getenv("CURACORE_QUANTIZED_STORE_PATH", "backend/data/vector_store")
+QUANTIZED_DTYPE = os.getenv("CURACORE_QUANTIZED_DTYPE", "int8")  # int8, float16
+QUANTIZED_RESCORE_FACTOR = _env_int("CURACORE_QUANTIZED_RESCORE_FACTOR", 8)  # Candidates rescored exactly = k * factor
+
+# --- Answer gating + model cascade ---
+CONFIDENCE_GATE_ENABLED = _env_bool("CURACORE_CONFIDENCE_GATE", True)
+CONFIDENCE_MIN_SCORE = _env_float("CURACORE_CONFIDENCE_MIN_SCORE", 0.25)  # Best cosine below this...
+CONFIDENCE_MIN_LEXICAL = _env_float("CURACORE_CONFIDENCE_MIN_LEXICAL", 0.5)  # ...and best BM25 term coverage below this -> canned reply, no LLM call
+LLM_CASCADE_ENABLED = _env_bool("CURACORE_LLM_CASCADE", True)  # Off = every answer uses LLM_SMALL_MODEL
+LLM_SMALL_MODEL = os.getenv("CURACORE_LLM_SMALL_MODEL", "gemma:2b")
+LLM_LARGE_MODEL = os.getenv("CURACORE_LLM_LARGE_MODEL", "llama3:8b-instruct-q4_K_M")
+CASCADE_SMALL_MIN_SCORE = _env_float("CURACORE_CASCADE_SMALL_MIN_SCORE", 0.5)  # Easy = retrieval at least this confident...
+CASCADE_SMALL_MAX_QUERY_TOKENS = _env_int("CURACORE_CASCADE_SMALL_MAX_QUERY_TOKENS", 32)  # ...and a short question
+CASCADE_ESCALATE_REFUSALS = _env_bool("CURACORE_CASCADE_ESCALATE", True)  # Retry a small-model refusal on the large model
+
+# --- Shared model server (run.py --workers N) ---
+MODEL_SERVER_ADDRESS = os.getenv("CURACORE_MODEL_SERVER", "")  # Unix socket / named pipe; empty = models load in-process
+MODEL_SERVER_CONNECTIONS = _env_int("CURACORE_MODEL_SERVER_CONNECTIONS", 8)  # Idle connections kept per API worker
+SUMMARY_RESET_RUNNING = _env_bool("CURACORE_SUMMARY_RESET_RUNNING", True)  # Off in workers: run.py resets once
@@ -1,23 +1,173 @@
-# File: backend/app/core/database.py
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
-
-# Using SQLite for 100% offline local storage
-SQLALCHEMY_DATABASE_URL = "sqlite:///./curacore.db"
-
-# connect_args is needed only for SQLite
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-)
-
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-Base = declarative_base()
-
-# Dependency to get DB session in API endpoints
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
\ No newline at end of file
+# File: backend/app/core/database.py
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.schema import CreateIndex
+from starlette.concurrency import run_in_threadpool
+from backend.app.core import config
+
+# Using SQLite for 100% offline local storage
+SQLALCHEMY_DATABASE_URL = config.DATABASE_URL
+
+def _is_file_sqlite(url):
+    return url.startswith("sqlite") and ":memory:" not in url and url.rstrip("/") not in ("sqlite:", "sqlite+aiosqlite:")
+
+def _sqlite_pragmas(dbapi_connection, connection_record):
+    """Applied to every new pooled connection"""
+    cursor = dbapi_connection.cursor()
+    if config.SQLITE_WAL:
+        cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute(f"PRAGMA busy_timeout={int(config.SQLITE_BUSY_TIMEOUT_MS)}")
+    cursor.execute(f"PRAGMA synchronous={config.SQLITE_SYNCHRONOUS}")
+    cursor.close()
+
+def make_engine(url=SQLALCHEMY_DATABASE_URL, tuned=True):
+    """
+    tuned=False is the old bare engine (rollback journal, default locking);
+    kept for benchmarks/bench_db_concurrency.py to compare against.
+    """
+    if not url.startswith("sqlite"):
+        return create_engine(url, pool_size=config.DB_POOL_SIZE, max_overflow=config.DB_MAX_OVERFLOW)
+
+    # connect_args is needed only for SQLite
+    connect_args = {"check_same_thread": False}
+    if not tuned:
+        return create_engine(url, connect_args=connect_args)
+
+    connect_args["timeout"] = config.SQLITE_BUSY_TIMEOUT_MS / 1000
+    pool_args = {}
+    if _is_file_sqlite(url):
+        pool_args = dict(
+            poolclass=QueuePool,
+            pool_size=config.DB_POOL_SIZE,
+            max_overflow=config.DB_MAX_OVERFLOW,
+            pool_timeout=config.DB_POOL_TIMEOUT_SECONDS,
+        )
+    tuned_engine = create_engine(url, connect_args=connect_args, **pool_args)
+    event.listen(tuned_engine, "connect", _sqlite_pragmas)
+    return tuned_engine
+
+engine = make_engine()
+
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+Base = declarative_base()
+
+# Optional async path (aiosqlite) so async endpoints don't block the event loop on DB I/O
+async_engine = None
+AsyncSessionLocal = None
+if config.ASYNC_DB_ENABLED and SQLALCHEMY_DATABASE_URL.startswith("sqlite:"):
+    try:
+        import aiosqlite  # noqa: F401
+        import greenlet  # noqa: F401
+        from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+        _async_url = SQLALCHEMY_DATABASE_URL.replace("sqlite:", "sqlite+aiosqlite:", 1)
+        _async_pool_args = {}
+        if _is_file_sqlite(_async_url):
+            _async_pool_args = dict(pool_size=config.DB_POOL_SIZE, max_overflow=config.DB_MAX_OVERFLOW)
+        async_engine = create_async_engine(
+            _async_url,
+            connect_args={"timeout": config.SQLITE_BUSY_TIMEOUT_MS / 1000},
+            **_async_pool_args,
+        )
+        event.listen(async_engine.sync_engine, "connect", _sqlite_pragmas)
+        AsyncSessionLocal = sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+    except ImportError:
+        print("⚠️ aiosqlite/greenlet not installed, async DB sessions disabled")
+
+# Dependency to get DB session in API endpoints
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+def async_db_available():
+    return AsyncSessionLocal is not None
+
+class ThreadpoolSession:
+    """
+    Stand-in for AsyncSession when aiosqlite is unavailable: the same awaitable
+    calls, each run on the threadpool against a plain sync session.
+    """
+    def __init__(self):
+        self._session = SessionLocal(expire_on_commit=False)
+
+    def _execute(self, statement, *args, **kwargs):
+        result = self._session.execute(statement, *args, **kwargs)
+        # Buffered like AsyncSession's results, so rows aren't fetched on the event loop
+        return result.freeze()() if getattr(result, "returns_rows", True) else result
+
+    async def execute(self, statement, *args, **kwargs):
+        return await run_in_threadpool(self._execute, statement, *args, **kwargs)
+
+    async def scalar(self, statement, *args, **kwargs):
+        return await run_in_threadpool(self._session.scalar, statement, *args, **kwargs)
+
+    async def get(self, entity, ident):
+        return await run_in_threadpool(self._session.get, entity, ident)
+
+    def add(self, instance):
+        self._session.add(instance)
+
+    def add_all(self, instances):
+        self._session.add_all(instances)
+
+    async def commit(self):
+        await run_in_threadpool(self._session.commit)
+
+    async def rollback(self):
+        await run_in_threadpool(self._session.rollback)
+
+    async def refresh(self, instance):
+        await run_in_threadpool(self._session.refresh, instance)
+
+    async def close(self):
+        await run_in_threadpool(self._session.close)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+def async_session():
+    """An AsyncSession on aiosqlite, or the threadpool stand-in without it"""
+    return AsyncSessionLocal() if AsyncSessionLocal is not None else ThreadpoolSession()
+
+# Async counterpart of get_db, for `async def` endpoints
+async def get_async_db():
+    async with async_session() as db:
+        yield db
+
+def add_missing_columns(bind=engine):
+    """
+    create_all() never alters tables that already exist, so columns added to a
+    model later are missing from existing local databases. Adds them in place.
+    """
+    inspector = inspect(bind)
+    with bind.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(bind.dialect)}"
+                if column.server_default is not None:
+                    ddl += f" DEFAULT {column.server_default.arg}"
+                conn.execute(text(ddl))
+                print(f"🛠️ Added column {table.name}.{column.name}")
+
+def add_missing_indexes(bind=engine):
+    """
+    Creates indexes declared on models after their table already existed.
+    IF NOT EXISTS rather than checkfirst: expression indexes cannot be reflected.
+    """
+    with bind.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                conn.execute(CreateIndex(index, if_not_exists=True))
@@ -0,0 +1,4 @@
+# File: backend/app/core/errors.py
+
+class PoolFullError(Exception):
+    """Raised by a bounded worker pool when every worker is busy and the waiting queue is full"""
@@ -0,0 +1,71 @@
+# File: backend/app/core/lazy.py
+import threading
+import time
+
+class LazyService:
+    """
+    Stand-in for a heavy singleton (embedding model, Whisper...). The real object is
+    built on first attribute access, exactly once even under concurrent requests,
+    and then every attribute is forwarded to it. Importing the module that declares
+    the singleton therefore costs nothing.
+    """
+    _registry = {}
+
+    def __init__(self, name: str, factory):
+        self._name = name
+        self._factory = factory
+        self._instance = None
+        self._lock = threading.Lock()
+        self._state = "not_loaded"  # not_loaded, loading, ready, failed
+        self._load_seconds = None
+        self._error = None
+        LazyService._registry[name] = self
+
+    def load(self):
+        """Returns the real service, building it if needed"""
+        instance = self._instance
+        if instance is not None:
+            return instance
+        with self._lock:
+            if self._instance is None:
+                self._state = "loading"
+                started = time.perf_counter()
+                try:
+                    self._instance = self._factory()
+                except Exception as e:
+                    self._state = "failed"
+                    self._error = str(e)
+                    raise
+                self._load_seconds = round(time.perf_counter() - started, 3)
+                self._state = "ready"
+                self._error = None
+                print(f"✅ {self._name} ready in {self._load_seconds}s")
+            return self._instance
+
+    @property
+    def loaded(self):
+        return self._instance is not None
+
+    def warm_up(self):
+        """Starts loading in a background thread (no-op if loaded or already loading)"""
+        if self._instance is not None or self._state == "loading":
+            return
+
+        def run():
+            try:
+                self.load()
+            except Exception as e:
+                print(f"⚠️ Warm-up of {self._name} failed: {e}")
+
+        threading.Thread(target=run, name=f"warm-{self._name}", daemon=True).start()
+
+    def status(self):
+        return {"state": self._state, "load_seconds": self._load_seconds, "error": self._error}
+
+    def __getattr__(self, attr):
+        # Only called for attributes not found on the proxy itself
+        return getattr(self.load(), attr)
+
+    @classmethod
+    def all(cls):
+        return dict(cls._registry)
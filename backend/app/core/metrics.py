@@ -0,0 +1,233 @@
+# File: backend/app/core/metrics.py
+import bisect
+import threading
+import time
+from backend.app.core import config
+
+# Minimal Prometheus text-format metrics, no prometheus_client dependency.
+# With CURACORE_METRICS=0 every observe / inc returns immediately and span()
+# hands back one shared no-op context manager, so instrumented code pays
+# only a function call.
+ENABLED = config.METRICS_ENABLED
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+_registry = []
+
+INF_LABEL = 'le="+Inf"'
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(names, values, extra=None):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Histogram:
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # label values -> [per-bucket counts, sum, count]
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def observe(self, value, **labels):
+        if not ENABLED:
+            return
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            if index < len(self.buckets):
+                series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = [(key, list(s[0]), s[1], s[2]) for key, s in self._series.items()]
+        for key, counts, total, count in snapshot:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = 'le="%s"' % _number(bound)
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, INF_LABEL)} {count}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {total}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {count}")
+        return lines
+
+class Counter:
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def inc(self, amount=1, **labels):
+        if not ENABLED:
+            return
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = list(self._values.items())
+        lines += [f"{self.name}{_labels(self.labelnames, key)} {value}" for key, value in items]
+        return lines
+
+class CallbackMetric:
+    """
+    Value read at scrape time from `fn`, for state other services already track
+    (queue depths, pool counters). `fn` returns a number, or {label value: number}
+    when `labelname` is set.
+    """
+    def __init__(self, name, help_text, fn, labelname=None, kind="gauge"):
+        self.name = name
+        self.help = help_text
+        self.fn = fn
+        self.labelname = labelname
+        self.kind = kind
+        _registry.append(self)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        try:
+            value = self.fn()
+        except Exception:
+            return lines
+        if self.labelname:
+            lines += [f"{self.name}{_labels((self.labelname,), (key,))} {val}" for key, val in value.items()]
+        else:
+            lines.append(f"{self.name} {value}")
+        return lines
+
+def render():
+    """All registered metrics in Prometheus text exposition format"""
+    lines = []
+    for metric in _registry:
+        lines += metric.render()
+    return "\n".join(lines) + "\n"
+
+# --- Shared metrics ---
+STAGE_SECONDS = Histogram("curacore_stage_seconds", "Time spent in each pipeline stage", ("stage",))
+LLM_SECONDS = Histogram(
+    "curacore_llm_seconds",
+    "Ollama call phases: queue (waiting for a slot), first_token, prefill, generation, total",
+    ("model", "phase"),
+)
+LLM_TOKENS = Counter("curacore_llm_tokens_total", "Tokens processed by Ollama", ("model", "kind"))
+RAG_ROUTES = Counter(
+    "curacore_rag_route_total",
+    "Retrievals by partition routing outcome: routed, fallback (low confidence, searched everything), global",
+    ("domain", "outcome"),
+)
+LLM_TIERS = Counter(
+    "curacore_llm_tier_total",
+    "Chat answers by cascade tier: gated (no LLM call), small, large, escalated (small refusal retried on large)",
+    ("tier",),
+)
+HTTP_SECONDS = Histogram(
+    "curacore_http_request_duration_seconds",
+    "HTTP request latency, until the last body byte is sent",
+    ("method", "route", "status"),
+)
+
+class _Span:
+    __slots__ = ("stage", "started")
+
+    def __init__(self, stage):
+        self.stage = stage
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        STAGE_SECONDS.observe(time.perf_counter() - self.started, stage=self.stage)
+        return False
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NOOP_SPAN = _NoopSpan()
+
+def span(stage: str):
+    """`with span("rag_embed"): ...` records the block's duration under that stage"""
+    return _Span(stage) if ENABLED else _NOOP_SPAN
+
+def record_llm_response(model: str, response):
+    """Ollama's own prefill / generation timings and token counts from a final (done) response"""
+    if not ENABLED or response is None:
+        return
+    prompt_tokens = response.get("prompt_eval_count")
+    completion_tokens = response.get("eval_count")
+    if prompt_tokens:
+        LLM_TOKENS.inc(prompt_tokens, model=model, kind="prompt")
+    if completion_tokens:
+        LLM_TOKENS.inc(completion_tokens, model=model, kind="completion")
+    if response.get("prompt_eval_duration"):
+        LLM_SECONDS.observe(response["prompt_eval_duration"] / 1e9, model=model, phase="prefill")
+    if response.get("eval_duration"):
+        LLM_SECONDS.observe(response["eval_duration"] / 1e9, model=model, phase="generation")
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware (no BaseHTTPMiddleware buffering): times each HTTP request
+    to its final body chunk, so streamed responses count their full duration.
+    Labelled with the route template, not the raw path, to keep cardinality bounded.
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_SECONDS.observe(
+                time.perf_counter() - started,
+                method=scope["method"],
+                route=_route_template(scope),
+                status=status["code"],
+            )
+
+def _route_template(scope):
+    """"/api/appointments/doctor/{doctor_id}" for "/api/appointments/doctor/7", "unmatched" for 404s"""
+    if scope.get("route") is None:
+        return "unmatched"
+    by_value = {str(value): name for name, value in scope.get("path_params", {}).items()}
+    return "/".join("{%s}" % by_value[part] if part in by_value else part for part in scope["path"].split("/"))
@@ -0,0 +1,116 @@
+# File: backend/app/core/security.py
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from fastapi import Depends, HTTPException
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from jose import JWTError, jwt
+from backend.app.core import config
+from backend.app.models.doctors import Doctor
+
+def _load_secret():
+    """Env secret, else one generated on first run and shared by every worker via a file"""
+    if config.JWT_SECRET:
+        return config.JWT_SECRET
+    path = config.JWT_SECRET_FILE
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, "w") as f:
+            f.write(secrets.token_urlsafe(48))
+        print(f"🔑 Generated JWT secret in {path}")
+    except FileExistsError:
+        pass
+    with open(path) as f:
+        return f.read().strip()
+
+SECRET_KEY = _load_secret()
+
+def create_access_token(user):
+    now = datetime.utcnow()
+    claims = {
+        "sub": str(user.id),
+        "email": user.email,
+        "name": user.full_name,
+        "role": user.role,
+        "iat": now,
+        "exp": now + timedelta(minutes=config.JWT_EXPIRE_MINUTES),
+    }
+    return jwt.encode(claims, SECRET_KEY, algorithm=config.JWT_ALGORITHM)
+
+class TokenCache:
+    """LRU of already-verified tokens -> claims, so repeat requests skip the HMAC + JSON decode"""
+    def __init__(self, max_entries=4096):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token):
+        with self._lock:
+            claims = self._entries.get(token)
+            if claims is None:
+                return None
+            if claims["exp"] <= time.time():
+                del self._entries[token]
+                return None
+            self._entries.move_to_end(token)
+            return claims
+
+    def put(self, token, claims):
+        with self._lock:
+            self._entries[token] = claims
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+token_cache = TokenCache(config.TOKEN_CACHE_SIZE)
+
+def decode_access_token(token: str):
+    """Returns the token's claims, or None when it is invalid or expired"""
+    claims = token_cache.get(token)
+    if claims is not None:
+        return claims
+    try:
+        claims = jwt.decode(token, SECRET_KEY, algorithms=[config.JWT_ALGORITHM])
+    except JWTError:
+        return None
+    token_cache.put(token, claims)
+    return claims
+
+_bearer = HTTPBearer(auto_error=False)
+
+def _user(claims):
+    return {
+        "user_id": int(claims["sub"]),
+        "email": claims.get("email"),
+        "full_name": claims.get("name"),
+        "role": claims.get("role"),
+    }
+
+# Dependency: identity straight from the signed token, no users query
+def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(_bearer)):
+    claims = decode_access_token(credentials.credentials) if credentials else None
+    if claims is None:
+        raise HTTPException(
+            status_code=401,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return _user(claims)
+
+# Dependency for endpoints that also serve anonymous visitors: None without a valid token
+def get_optional_user(credentials: HTTPAuthorizationCredentials = Depends(_bearer)):
+    claims = decode_access_token(credentials.credentials) if credentials else None
+    return _user(claims) if claims is not None else None
+
+def doctor_id_of(db, current_user: dict):
+    """
+    The Doctor record a doctor account acts for (matched on email), or None.
+    Doctor accounts are only created by create_doctor_account.py, never by self-signup.
+    """
+    if current_user["role"] != "doctor" or not current_user["email"]:
+        return None
+    return db.query(Doctor.id).filter(Doctor.email == current_user["email"]).scalar()
@@ -1,38 +1,75 @@
-# File: backend/app/main.py
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware # <--- NEW IMPORT
-from backend.app.core.database import engine, Base
-from backend.app.models import users, doctors, appointments
-
-# Imports
-from backend.app.api import doctors as doctors_router
-from backend.app.api import chat as chat_router
-from backend.app.api import voice as voice_router
-from backend.app.api import appointments as appt_router
-
-from backend.app.api import auth as auth_router
-app = FastAPI(title="CuraCore Brain", version="1.0")
-
-# --- 🛡️ CORS MIDDLEWARE (The Fix) ---
-# This tells the backend: "Accept requests from the Frontend"
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["http://localhost:5173", "http://127.0.0.1:5173"], # Frontend URL
-    allow_credentials=True,
-    allow_methods=["*"], # Allow GET, POST, etc.
-    allow_headers=["*"],
-)
-
-# Create Database Tables
-Base.metadata.create_all(bind=engine)
-
-# --- REGISTER ROUTERS ---
-app.include_router(doctors_router.router, prefix="/api/doctors", tags=["Doctors"])
-app.include_router(chat_router.router, prefix="/api/chat", tags=["Chat"])
-app.include_router(voice_router.router, prefix="/api/voice", tags=["Voice"])
-app.include_router(appt_router.router,prefix="/api/appointments", tags=["Appointments"])
-app.include_router(auth_router.router, prefix="/api/auth", tags=["Auth"])
-
-@app.get("/")
-def read_root():
+# File: backend/app/main.py
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware # <--- NEW IMPORT
+from backend.app.core.database import engine, async_engine, Base, add_missing_columns, add_missing_indexes
+from backend.app.models import users, doctors, appointments, chat_sessions
+
+# Imports
+from backend.app.api import doctors as doctors_router
+from backend.app.api import chat as chat_router
+from backend.app.api import voice as voice_router
+from backend.app.api import appointments as appt_router
+
+from backend.app.api import auth as auth_router
+from backend.app.api import health as health_router
+from backend.app.api import metrics as metrics_router
+from backend.app.core import config
+from backend.app.core.lazy import LazyService
+from backend.app.core.metrics import MetricsMiddleware
+from backend.app.services.summary_queue import summary_queue
+from backend.app.services.password_hasher import password_hasher
+from backend.app.services.chat_sessions import chat_sessions as chat_session_store
+from backend.app.services.transcription_pool import transcription_pool
+from backend.app.services.whisper_service import whisper_service
+app = FastAPI(title="CuraCore Brain", version="1.0")
+
+# --- 🛡️ CORS MIDDLEWARE (The Fix) ---
+# This tells the backend: "Accept requests from the Frontend"
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["http://localhost:5173", "http://127.0.0.1:5173"], # Frontend URL
+    allow_credentials=True,
+    allow_methods=["*"], # Allow GET, POST, etc.
+    allow_headers=["*"],
+)
+
+# --- 📈 Request latency histograms, published at /metrics ---
+if config.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# Create Database Tables
+Base.metadata.create_all(bind=engine)
+add_missing_columns(engine)
+add_missing_indexes(engine)
+
+# --- BACKGROUND WORKERS ---
+@app.on_event("startup")
+def start_workers():
+    summary_queue.start()
+    if config.WARM_MODELS_ON_STARTUP:
+        for service in LazyService.all().values():
+            service.warm_up()
+
+@app.on_event("shutdown")
+async def stop_workers():
+    summary_queue.stop()
+    transcription_pool.shutdown()
+    password_hasher.shutdown()
+    chat_session_store.shutdown()
+    if whisper_service.loaded:
+        whisper_service.shutdown()
+    if async_engine is not None:
+        await async_engine.dispose()
+
+# --- REGISTER ROUTERS ---
+app.include_router(doctors_router.router, prefix="/api/doctors", tags=["Doctors"])
+app.include_router(chat_router.router, prefix="/api/chat", tags=["Chat"])
+app.include_router(voice_router.router, prefix="/api/voice", tags=["Voice"])
+app.include_router(appt_router.router,prefix="/api/appointments", tags=["Appointments"])
+app.include_router(auth_router.router, prefix="/api/auth", tags=["Auth"])
+app.include_router(health_router.router, prefix="/api/health", tags=["Health"])
+app.include_router(metrics_router.router, tags=["Metrics"])
+
+@app.get("/")
+def read_root():
     return {"status": "online"}
\ No newline at end of file
@@ -1,24 +1,37 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text
-from sqlalchemy.orm import relationship
-from datetime import datetime
-from backend.app.core.database import Base
-
-class Appointment(Base):
-    __tablename__ = "appointments"
-
-    id = Column(Integer, primary_key=True, index=True)
-    
-    # Foreign Keys
-    patient_id = Column(Integer, ForeignKey("users.id"))
-    doctor_id = Column(Integer, ForeignKey("doctors.id"))
-    
-    # Data
-    appointment_date = Column(DateTime, default=datetime.utcnow)
-    status = Column(String, default="pending") # pending, completed, cancelled
-    symptoms = Column(Text)
-    ai_summary = Column(Text, nullable=True)
-
-    # --- RELATIONSHIPS ---
-    # These must match the names in User/Doctor models
-    patient = relationship("User", back_populates="appointments")
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, Index
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from backend.app.core.database import Base
+
+class Appointment(Base):
+    __tablename__ = "appointments"
+    __table_args__ = (
+        # Doctor queue: WHERE doctor_id = ? AND status = ? ORDER BY appointment_date, id
+        Index("ix_appointments_doctor_status_date", "doctor_id", "status", "appointment_date"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    
+    # Foreign Keys
+    patient_id = Column(Integer, ForeignKey("users.id"))
+    doctor_id = Column(Integer, ForeignKey("doctors.id"))
+    
+    # Data
+    appointment_date = Column(DateTime, default=datetime.utcnow)
+    status = Column(String, default="pending") # pending, completed, cancelled
+    symptoms = Column(Text)
+    ai_summary = Column(Text, nullable=True)
+
+    # Background summary job (see services/summary_queue.py)
+    summary_status = Column(String, default="pending", index=True) # pending, running, done, failed
+    summary_attempts = Column(Integer, default=0)
+    summary_error = Column(Text, nullable=True)
+    summary_version = Column(String, nullable=True, index=True)  # summarizer.SUMMARY_VERSION that wrote ai_summary
+
+    # Chat the patient booked from; its rolling summary becomes ai_summary
+    chat_session_id = Column(String, nullable=True)
+
+    # --- RELATIONSHIPS ---
+    # These must match the names in User/Doctor models
+    patient = relationship("User", back_populates="appointments")
     doctor = relationship("Doctor", back_populates="appointments")
\ No newline at end of file
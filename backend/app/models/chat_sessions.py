@@ -0,0 +1,32 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from backend.app.core.database import Base
+
+class ChatSession(Base):
+    __tablename__ = "chat_sessions"
+
+    id = Column(String, primary_key=True)  # uuid4 hex, handed to the client
+    patient_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+    # Rolling summary (see services/chat_sessions.py): folds in messages incrementally
+    summary = Column(Text, nullable=True)
+    message_count = Column(Integer, default=0)
+    summarized_count = Column(Integer, default=0)  # Messages already folded into `summary`
+
+    # --- RELATIONSHIPS ---
+    messages = relationship("ChatMessage", back_populates="session", order_by="ChatMessage.position")
+
+class ChatMessage(Base):
+    __tablename__ = "chat_messages"
+
+    id = Column(Integer, primary_key=True, index=True)
+    session_id = Column(String, ForeignKey("chat_sessions.id"), index=True)
+    position = Column(Integer)  # 0-based order within the session
+    role = Column(String)  # user, assistant
+    content = Column(Text)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    session = relationship("ChatSession", back_populates="messages")
@@ -1,20 +1,24 @@
-from sqlalchemy import Column, Integer, String
-from sqlalchemy.orm import relationship # <--- Import this
-from backend.app.core.database import Base
-
-class Doctor(Base):
-    __tablename__ = "doctors"
-
-    id = Column(Integer, primary_key=True, index=True)
-    full_name = Column(String, index=True)
-    specialization = Column(String, index=True)
-    qualification = Column(String)
-    experience_years = Column(Integer)
-    location = Column(String)
-    consultation_fee = Column(Integer)
-    email = Column(String)
-    image_url = Column(String)
-
-    # --- RELATIONSHIPS ---
-    # Links Doctor -> Appointments
-    appointments = relationship("Appointment", back_populates="doctor")
\ No newline at end of file
+from sqlalchemy import Column, Integer, String, Index, func
+from sqlalchemy.orm import relationship # <--- Import this
+from backend.app.core.database import Base
+
+class Doctor(Base):
+    __tablename__ = "doctors"
+
+    id = Column(Integer, primary_key=True, index=True)
+    full_name = Column(String, index=True)
+    specialization = Column(String, index=True)
+    qualification = Column(String)
+    experience_years = Column(Integer)
+    location = Column(String)
+    consultation_fee = Column(Integer)
+    email = Column(String)
+    image_url = Column(String)
+
+    # --- RELATIONSHIPS ---
+    # Links Doctor -> Appointments
+    appointments = relationship("Appointment", back_populates="doctor")
+
+# Case-insensitive location / name filters of GET /api/doctors/search (see api/doctors.py)
+Index("ix_doctors_location_lower", func.lower(Doctor.location))
+Index("ix_doctors_full_name_lower", func.lower(Doctor.full_name))
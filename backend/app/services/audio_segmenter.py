@@ -0,0 +1,171 @@
+# File: backend/app/services/audio_segmenter.py
+# Long-audio support: split on silence with a local VAD, then transcribe the
+# segments in parallel worker processes. Each process holds its own Whisper
+# model, because Whisper's decoder installs kv-cache hooks on the shared model
+# and is not safe to run concurrently from threads.
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+
+try:
+    import webrtcvad  # Optional, better than the energy fallback on noisy audio
+except ImportError:
+    webrtcvad = None
+
+SAMPLE_RATE = 16000
+FRAME_MS = 30
+PAD_MS = 200  # Context kept around each segment so words are not clipped
+
+def _speech_frames(audio: np.ndarray, aggressiveness: int, margin_db: float):
+    """One bool per FRAME_MS frame: is there speech in it?"""
+    frame_len = SAMPLE_RATE * FRAME_MS // 1000
+    n_frames = len(audio) // frame_len
+    if n_frames == 0:
+        return np.zeros(0, dtype=bool)
+    frames = audio[:n_frames * frame_len].reshape(n_frames, frame_len)
+
+    if webrtcvad is not None:
+        vad = webrtcvad.Vad(aggressiveness)
+        pcm = (np.clip(frames, -1, 1) * 32767).astype(np.int16)
+        return np.array([vad.is_speech(frame.tobytes(), SAMPLE_RATE) for frame in pcm])
+
+    # Energy VAD: frames well above the noise floor are speech. Capping the
+    # threshold below the loud frames keeps pause-free recordings from being dropped.
+    rms_db = 20 * np.log10(np.sqrt(np.mean(frames ** 2, axis=1)) + 1e-10)
+    noise_floor = np.percentile(rms_db, 2)
+    loud = np.percentile(rms_db, 95)
+    return rms_db > max(min(noise_floor + margin_db, loud - margin_db), -50)
+
+def split_on_silence(audio: np.ndarray, max_seconds=30, min_silence_ms=400, aggressiveness=2, margin_db=12):
+    """
+    Returns [(start_sample, end_sample)] speech segments, each at most `max_seconds`.
+    Pauses shorter than `min_silence_ms` don't split. Speech regions are packed into
+    segments up to the limit and cut at the pauses between them; a single region
+    longer than the limit is hard-cut.
+    """
+    speech = _speech_frames(audio, aggressiveness, margin_db)
+    frame_len = SAMPLE_RATE * FRAME_MS // 1000
+    min_gap = max(1, min_silence_ms // FRAME_MS)
+    pad = PAD_MS // FRAME_MS
+    max_frames = max(1, int(max_seconds * 1000 // FRAME_MS) - 2 * pad)  # Padded length stays within the limit
+
+    # 1. Speech regions, bridging short pauses
+    regions = []
+    start, silence = None, 0
+    for i, is_speech in enumerate(speech):
+        if is_speech:
+            if start is None:
+                start = i
+            silence = 0
+        elif start is not None:
+            silence += 1
+            if silence >= min_gap:
+                regions.append((start, i - silence + 1))
+                start, silence = None, 0
+    if start is not None:
+        regions.append((start, len(speech) - silence))
+
+    # 2. Pack regions into segments up to max_frames, hard-splitting long regions
+    segments = []
+    cur_start, cur_end = None, None
+    for r_start, r_end in regions:
+        while r_end - r_start > max_frames:
+            if cur_start is not None:
+                segments.append((cur_start, cur_end))
+                cur_start = None
+            segments.append((r_start, r_start + max_frames))
+            r_start += max_frames
+        if cur_start is None:
+            cur_start, cur_end = r_start, r_end
+        elif r_end - cur_start <= max_frames:
+            cur_end = r_end
+        else:
+            segments.append((cur_start, cur_end))
+            cur_start, cur_end = r_start, r_end
+    if cur_start is not None:
+        segments.append((cur_start, cur_end))
+
+    return [
+        (max(0, (s - pad) * frame_len), min(len(audio), (e + pad) * frame_len))
+        for s, e in segments
+    ]
+
+# --- Worker process side ---
+_worker_model = None
+
+def _init_worker(model_size: str, threads: int):
+    global _worker_model
+    import torch
+    import whisper
+    torch.set_num_threads(threads)
+    _worker_model = whisper.load_model(model_size)
+
+def _transcribe_segment(index: int, audio: np.ndarray):
+    result = _worker_model.transcribe(audio, fp16=False, condition_on_previous_text=False)
+    return index, result["text"].strip()
+
+class SegmentedTranscriber:
+    """Fans VAD segments out to a process pool and stitches the text back in order"""
+    def __init__(self, model_size="base", workers=2, max_seconds=30, min_silence_ms=400,
+                 vad_aggressiveness=2, energy_margin_db=12):
+        self.model_size = model_size
+        self.workers = workers
+        self.max_seconds = max_seconds
+        self.min_silence_ms = min_silence_ms
+        self.vad_aggressiveness = vad_aggressiveness
+        self.energy_margin_db = energy_margin_db
+        self._executor = None
+
+    def _pool(self):
+        if self._executor is None:
+            threads = max(1, (os.cpu_count() or 1) // self.workers)
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                # spawn: never fork a threaded server process holding torch state
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.model_size, threads),
+            )
+        return self._executor
+
+    def segment(self, audio: np.ndarray):
+        return split_on_silence(audio, self.max_seconds, self.min_silence_ms,
+                                self.vad_aggressiveness, self.energy_margin_db)
+
+    def transcribe(self, audio: np.ndarray, on_partial=None):
+        """
+        Transcribes every segment in parallel. `on_partial(partial)` is called as each
+        segment finishes (in completion order) with {index, start, end, text, total}.
+        Returns the full text, stitched in audio order.
+        """
+        segments = self.segment(audio)
+        texts = [""] * len(segments)
+        if not segments:
+            return ""
+
+        pool = self._pool()
+        futures = [pool.submit(_transcribe_segment, i, audio[s:e]) for i, (s, e) in enumerate(segments)]
+        try:
+            for future in as_completed(futures):
+                index, text = future.result()
+                texts[index] = text
+                if on_partial:
+                    start, end = segments[index]
+                    on_partial({
+                        "index": index,
+                        "start": round(start / SAMPLE_RATE, 2),
+                        "end": round(end / SAMPLE_RATE, 2),
+                        "text": text,
+                        "total": len(segments),
+                    })
+        finally:
+            for future in futures:
+                future.cancel()
+
+        return " ".join(t for t in texts if t)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,161 @@
+# File: backend/app/services/bm25_index.py
+import heapq
+import math
+import os
+import pickle
+import re
+from collections import Counter
+
+# CONFIG
+BM25_PATH = "backend/data/bm25_index.pkl"
+
+# Keeps drug names, dosages ("500mg", "0.5") and ICD codes ("E11.9", "I10") as single tokens
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[.\-/][a-z0-9]+)*")
+
+# Words any question carries, whether or not the corpus can answer it; ignored by coverage()
+QUESTION_WORDS = frozenset(
+    "a an and are can could do does for from how i in is it me mean means my of on or should "
+    "tell the to what when where which who why with".split()
+)
+
+def tokenize(text: str):
+    return TOKEN_PATTERN.findall(text.lower())
+
+class BM25Index:
+    """
+    Persistent lexical inverted index over the same chunk IDs as the vector store.
+    postings: term -> {chunk_id: term frequency}
+    """
+    def __init__(self, path=BM25_PATH, k1=1.5, b=0.75):
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        self._reset()
+
+    def _reset(self):
+        self.postings = {}
+        self.doc_len = {}
+        self.doc_terms = {}   # chunk_id -> unique terms (needed to delete a chunk)
+        self.doc_source = {}  # chunk_id -> source file
+        self.source_docs = {}  # source file -> {chunk_id}
+        self.total_len = 0
+
+    def __len__(self):
+        return len(self.doc_len)
+
+    def add(self, ids: list, texts: list, sources: list):
+        for doc_id, text, source in zip(ids, texts, sources):
+            if doc_id in self.doc_len:
+                self._remove_doc(doc_id)
+            counts = Counter(tokenize(text))
+            for term, tf in counts.items():
+                self.postings.setdefault(term, {})[doc_id] = tf
+            length = sum(counts.values())
+            self.doc_len[doc_id] = length
+            self.doc_terms[doc_id] = list(counts)
+            self.doc_source[doc_id] = source
+            self.source_docs.setdefault(source, set()).add(doc_id)
+            self.total_len += length
+
+    def _remove_doc(self, doc_id):
+        for term in self.doc_terms.pop(doc_id):
+            docs = self.postings[term]
+            docs.pop(doc_id, None)
+            if not docs:
+                del self.postings[term]
+        self.total_len -= self.doc_len.pop(doc_id)
+        source = self.doc_source.pop(doc_id)
+        docs = self.source_docs.get(source)
+        if docs is not None:
+            docs.discard(doc_id)
+            if not docs:
+                del self.source_docs[source]
+
+    def remove_source(self, source: str, keep_ids=None):
+        for doc_id in list(self.source_docs.get(source, ())):
+            if not keep_ids or doc_id not in keep_ids:
+                self._remove_doc(doc_id)
+
+    def remove(self, ids: list):
+        for doc_id in ids:
+            if doc_id in self.doc_len:
+                self._remove_doc(doc_id)
+
+    @staticmethod
+    def _idf(n_docs: int, n_containing: int):
+        return math.log(1 + (n_docs - n_containing + 0.5) / (n_containing + 0.5))
+
+    def search(self, query: str, k=10):
+        """Returns [(chunk_id, score)] best first"""
+        n_docs = len(self.doc_len)
+        if not n_docs:
+            return []
+        avg_len = self.total_len / n_docs
+
+        scores = {}
+        for term in set(tokenize(query)):
+            docs = self.postings.get(term)
+            if not docs:
+                continue
+            idf = self._idf(n_docs, len(docs))
+            for doc_id, tf in docs.items():
+                norm = tf + self.k1 * (1 - self.b + self.b * self.doc_len[doc_id] / avg_len)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / norm
+
+        return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+
+    def coverage(self, query: str, doc_id):
+        """
+        Share of the query's terms that occur in one chunk (0..1), each weighted by
+        its idf: a matching ICD code or drug name counts for far more than "what is".
+        Terms no chunk contains weigh the most, the corpus has no answer for them.
+        Unlike BM25 scores this is comparable across queries.
+        """
+        n_docs = len(self.doc_len)
+        terms = set(tokenize(query)) - QUESTION_WORDS
+        if doc_id not in self.doc_len or not terms:
+            return 0.0
+        total = matched = 0.0
+        for term in terms:
+            docs = self.postings.get(term, {})
+            idf = self._idf(n_docs, len(docs))
+            total += idf
+            if doc_id in docs:
+                matched += idf
+        return matched / total if total > 1e-9 else 0.0
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        state = {
+            "postings": self.postings,
+            "doc_len": self.doc_len,
+            "doc_terms": self.doc_terms,
+            "doc_source": self.doc_source,
+            "source_docs": self.source_docs,
+            "total_len": self.total_len,
+        }
+        with open(tmp_path, "wb") as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.path)
+
+    def load(self):
+        self._reset()
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            state = pickle.load(f)
+        self.postings = state["postings"]
+        self.doc_len = state["doc_len"]
+        self.doc_terms = state["doc_terms"]
+        self.doc_source = state["doc_source"]
+        self.source_docs = state["source_docs"]
+        self.total_len = state["total_len"]
+
+def reciprocal_rank_fusion(rankings: list, k=60):
+    """Fuses several best-first lists of IDs; returns IDs ordered by RRF score"""
+    scores = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank + 1)
+    return sorted(scores, key=scores.get, reverse=True)
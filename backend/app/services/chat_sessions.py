@@ -0,0 +1,191 @@
+# File: backend/app/services/chat_sessions.py
+import threading
+import uuid
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from backend.app.core import config
+from sqlalchemy import select, update
+from backend.app.core.database import SessionLocal
+from backend.app.models.chat_sessions import ChatSession, ChatMessage
+from backend.app.services.summarizer import update_summary
+
+LOCK_STRIPES = 64
+
+class ChatSessionStore:
+    """
+    Server-side chat sessions. Every message is stored; after each turn the
+    session's rolling summary is brought up to date in the background by folding
+    in only the messages it hasn't seen yet. Prompts then carry that summary plus
+    the last few messages, so their size stays flat however long the chat runs,
+    and booking an appointment can reuse the summary instead of re-summarising.
+    """
+    def __init__(self, workers=1, recent_messages=6):
+        self.recent_messages = recent_messages
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="chat-summary")
+        self._queued = set()
+        self._queued_lock = threading.Lock()
+        # Striped locks: one session is never folded by two threads at once
+        self._fold_locks = [threading.Lock() for _ in range(LOCK_STRIPES)]
+
+    # The chat endpoints use the async methods with the caller's async session
+    # (database.get_async_db); appointments and the backfill job keep the sync
+    # ones. Both share the statements below.
+
+    def _recent_query(self, session_id: str):
+        return select(ChatMessage.role, ChatMessage.content)\
+            .where(ChatMessage.session_id == session_id)\
+            .order_by(ChatMessage.position.desc())\
+            .limit(self.recent_messages)
+
+    @staticmethod
+    def _history(session, recent):
+        return {
+            "summary": session.summary,
+            "recent": [(role, content) for role, content in reversed(recent)],
+            "message_count": session.message_count or 0,
+        }
+
+    @staticmethod
+    def _summary_query(session_id: str):
+        return select(ChatSession.summary, ChatSession.message_count, ChatSession.summarized_count)\
+            .where(ChatSession.id == session_id)
+
+    @staticmethod
+    def _summary_state(row):
+        if row is None:
+            return None, False
+        summary, message_count, summarized_count = row
+        return summary, bool(summary) and (summarized_count or 0) >= (message_count or 0)
+
+    @staticmethod
+    def _messages_query(session_id: str):
+        return select(ChatMessage.role, ChatMessage.content, ChatMessage.created_at)\
+            .where(ChatMessage.session_id == session_id)\
+            .order_by(ChatMessage.position)
+
+    @staticmethod
+    def _owner_query(session_id: str, patient_id: int):
+        return select(ChatSession.id).where(ChatSession.id == session_id, ChatSession.patient_id == patient_id)
+
+    def is_owner(self, session_id: str, patient_id: int):
+        """False for another patient's session and for an unknown one alike"""
+        db = SessionLocal()
+        try:
+            return db.scalar(self._owner_query(session_id, patient_id)) is not None
+        finally:
+            db.close()
+
+    async def is_owner_async(self, db, session_id: str, patient_id: int):
+        return await db.scalar(self._owner_query(session_id, patient_id)) is not None
+
+    async def create(self, db, patient_id: int = None):
+        session = ChatSession(id=uuid.uuid4().hex, patient_id=patient_id)
+        db.add(session)
+        await db.commit()
+        return session.id
+
+    def history(self, session_id: str):
+        """Rolling summary + the most recent messages, or None for an unknown session"""
+        db = SessionLocal()
+        try:
+            session = db.get(ChatSession, session_id)
+            if session is None:
+                return None
+            return self._history(session, db.execute(self._recent_query(session_id)).all())
+        finally:
+            db.close()
+
+    async def history_async(self, db, session_id: str):
+        session = await db.get(ChatSession, session_id)
+        if session is None:
+            return None
+        return self._history(session, (await db.execute(self._recent_query(session_id))).all())
+
+    async def append_turn(self, db, session_id: str, user_message: str, reply: str):
+        """Stores one question/answer pair and schedules the summary update"""
+        # The UPDATE takes SQLite's write lock, so reading the count back is race-free
+        await db.execute(
+            update(ChatSession)
+            .where(ChatSession.id == session_id)
+            .values(message_count=ChatSession.message_count + 2, updated_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        count = await db.scalar(select(ChatSession.message_count).where(ChatSession.id == session_id))
+        db.add_all([
+            ChatMessage(session_id=session_id, position=count - 2, role="user", content=user_message),
+            ChatMessage(session_id=session_id, position=count - 1, role="assistant", content=reply),
+        ])
+        await db.commit()
+        self.schedule_summary(session_id)
+
+    def schedule_summary(self, session_id: str):
+        with self._queued_lock:
+            if session_id in self._queued:
+                return  # The queued update will pick up this turn too
+            self._queued.add(session_id)
+        self._executor.submit(self._background_refresh, session_id)
+
+    def _background_refresh(self, session_id: str):
+        with self._queued_lock:
+            self._queued.discard(session_id)
+        try:
+            self.refresh_summary(session_id, strict=True)
+        except Exception as e:
+            # Not fatal: the next turn (or the booking) folds these messages in
+            print(f"⚠️ Rolling summary for chat session {session_id} failed: {e}")
+
+    def refresh_summary(self, session_id: str, strict: bool = False):
+        """Folds messages not yet in the summary into it; returns the up-to-date summary"""
+        with self._fold_locks[zlib.crc32(session_id.encode()) % LOCK_STRIPES]:
+            db = SessionLocal()
+            try:
+                session = db.query(ChatSession).filter(ChatSession.id == session_id).first()
+                if session is None:
+                    return None
+                summarized = session.summarized_count or 0
+                new_messages = db.query(ChatMessage.position, ChatMessage.role, ChatMessage.content)\
+                    .filter(ChatMessage.session_id == session_id)\
+                    .filter(ChatMessage.position >= summarized)\
+                    .order_by(ChatMessage.position)\
+                    .all()
+                if not new_messages:
+                    return session.summary
+
+                summary = update_summary(session.summary, [(role, content) for _, role, content in new_messages], strict=strict)
+                session.summary = summary
+                session.summarized_count = new_messages[-1].position + 1
+                db.commit()
+                return summary
+            finally:
+                db.close()
+
+    def latest_summary(self, session_id: str):
+        """(summary, up_to_date), without generating anything; (None, False) for an unknown session"""
+        db = SessionLocal()
+        try:
+            return self._summary_state(db.execute(self._summary_query(session_id)).first())
+        finally:
+            db.close()
+
+    async def latest_summary_async(self, db, session_id: str):
+        return self._summary_state((await db.execute(self._summary_query(session_id))).first())
+
+    def messages(self, session_id: str):
+        db = SessionLocal()
+        try:
+            return [row._asdict() for row in db.execute(self._messages_query(session_id))]
+        finally:
+            db.close()
+
+    async def messages_async(self, db, session_id: str):
+        return [row._asdict() for row in await db.execute(self._messages_query(session_id))]
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+# Singleton
+chat_sessions = ChatSessionStore(
+    workers=config.CHAT_SUMMARY_WORKERS,
+    recent_messages=config.CHAT_RECENT_MESSAGES,
+)
@@ -0,0 +1,120 @@
+# File: backend/app/services/context_packer.py
+import re
+from backend.app.services.pdf_chunker import CHUNK_OVERLAP
+
+MIN_OVERLAP = 40  # Shorter suffix/prefix matches are treated as coincidence
+MIN_TRUNCATED_TOKENS = 60  # Don't append a tail fragment smaller than this
+
+_WORD = re.compile(r"\w+")
+_PUNCT = re.compile(r"[^\w\s]")
+_SENTENCE_END = re.compile(r"[.!?](\s|$)")
+
+def estimate_tokens(text: str):
+    """
+    Cheap, tokenizer-free estimate: ~1.3 tokens per word (sub-word splits) plus one
+    per punctuation mark. Close enough for SentencePiece/BPE models on English text.
+    """
+    return int(len(_WORD.findall(text)) * 1.3 + len(_PUNCT.findall(text)))
+
+def _overlap(a: str, b: str):
+    """Length of the longest suffix of `a` that is a prefix of `b` (0 if < MIN_OVERLAP)"""
+    window = CHUNK_OVERLAP + MIN_OVERLAP
+    tail = a[-window:]
+    probe = b[:MIN_OVERLAP]
+    if len(probe) < MIN_OVERLAP:
+        return 0
+    idx = tail.find(probe)
+    while idx != -1:
+        if b.startswith(tail[idx:]):
+            return len(tail) - idx
+        idx = tail.find(probe, idx + 1)
+    return 0
+
+def _truncate(text: str, max_tokens: int):
+    """Cuts `text` to roughly `max_tokens`, preferring the last sentence boundary"""
+    words = list(_WORD.finditer(text))
+    keep = int(max_tokens / 1.5)  # Conservative: leaves room for punctuation tokens
+    if keep >= len(words):
+        return text
+    cut = words[keep].start() if keep > 0 else 0
+    sentence_ends = list(_SENTENCE_END.finditer(text, 0, cut))
+    if sentence_ends and sentence_ends[-1].end() > cut // 2:
+        cut = sentence_ends[-1].end()
+    return text[:cut].rstrip()
+
+def fit_tokens(text: str, max_tokens: int):
+    """`text` unchanged if it fits `max_tokens`, else truncated at a sentence boundary"""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    return _truncate(text, max_tokens)
+
+def pack_context(chunks: list, budget_tokens: int):
+    """
+    Turns ranked retrieval hits into a compact CONTEXT block:
+    1. drops exact duplicates and chunks contained in another hit,
+    2. stitches neighbouring chunks whose texts overlap (the splitter's
+       chunk_overlap) into one passage, so the shared text appears once,
+    3. keeps passages in order of their best-ranked chunk,
+    4. fills `budget_tokens`, truncating the last passage at a sentence boundary.
+    Returns {"chunks": [...], "tokens": int, "stats": {...}}.
+    """
+    # (text, best rank)
+    passages = []
+    for rank, text in enumerate(chunks):
+        text = text.strip()
+        if text and not any(text in existing for existing, _ in passages):
+            passages = [(t, r) for t, r in passages if t not in text]  # Drop hits this one contains
+            passages.append((text, rank))
+    deduped = len(chunks) - len(passages)
+
+    # Stitch overlap chains until nothing changes
+    merges = 0
+    merged = True
+    while merged:
+        merged = False
+        for i in range(len(passages)):
+            for j in range(len(passages)):
+                if i == j:
+                    continue
+                (a, rank_a), (b, rank_b) = passages[i], passages[j]
+                n = _overlap(a, b)
+                if n:
+                    passages[i] = (a + b[n:], min(rank_a, rank_b))
+                    del passages[j]
+                    merges += 1
+                    merged = True
+                    break
+            if merged:
+                break
+
+    passages.sort(key=lambda item: item[1])
+
+    packed, used, truncated = [], 0, 0
+    for text, _ in passages:
+        tokens = estimate_tokens(text)
+        if used + tokens <= budget_tokens:
+            packed.append(text)
+            used += tokens
+            continue
+        remaining = budget_tokens - used
+        if remaining >= MIN_TRUNCATED_TOKENS:
+            fragment = _truncate(text, remaining)
+            if fragment:
+                packed.append(fragment)
+                used += estimate_tokens(fragment)
+                truncated += 1
+        break
+
+    return {
+        "chunks": packed,
+        "tokens": used,
+        "stats": {
+            "retrieved": len(chunks),
+            "deduplicated": deduped,
+            "merged": merges,
+            "packed": len(packed),
+            "truncated": truncated,
+            "dropped": len(passages) - len(packed),
+            "budget": budget_tokens,
+        },
+    }
@@ -0,0 +1,123 @@
+# File: backend/app/services/domain_router.py
+import os
+from collections import Counter
+from backend.app.services.bm25_index import tokenize
+
+# Chunks and queries are tagged with one of these domains; "general" is the catch-all partition
+GENERAL = "general"
+DOMAIN_KEYWORDS = {
+    "cardiology": {
+        "heart", "cardiac", "cardiovascular", "coronary", "angina", "arrhythmia", "hypertension",
+        "myocardial", "infarction", "atrial", "fibrillation", "ecg", "ekg", "cholesterol", "statin",
+        "palpitations", "valve", "aortic", "stroke", "thrombosis", "beta-blocker",
+    },
+    "dermatology": {
+        "skin", "rash", "eczema", "psoriasis", "acne", "dermatitis", "itching", "pruritus", "fungal",
+        "melanoma", "mole", "urticaria", "hives", "scabies", "vitiligo", "lesion", "blister", "topical",
+    },
+    "pediatrics": {
+        "child", "children", "infant", "infants", "newborn", "neonatal", "pediatric", "paediatric",
+        "baby", "toddler", "vaccination", "immunization", "breastfeeding", "growth", "measles",
+        "chickenpox", "colic", "teething",
+    },
+    "neurology": {
+        "brain", "neurological", "seizure", "epilepsy", "migraine", "headache", "neuropathy",
+        "parkinson", "alzheimer", "dementia", "sclerosis", "numbness", "tremor", "vertigo",
+        "nerve", "spinal", "concussion",
+    },
+    "orthopedics": {
+        "bone", "bones", "fracture", "joint", "joints", "arthritis", "osteoporosis", "ligament",
+        "tendon", "sprain", "spine", "knee", "hip", "shoulder", "cartilage", "orthopedic", "backache",
+    },
+}
+
+# Doctor.specialization values are free text ("Cardiologist", "MD (Cardiology)"), matched by stem
+SPECIALTY_STEMS = {
+    "cardio": "cardiology",
+    "dermat": "dermatology",
+    "skin": "dermatology",
+    "pediat": "pediatrics",
+    "paediat": "pediatrics",
+    "child": "pediatrics",
+    "neuro": "neurology",
+    "ortho": "orthopedics",
+    "general": GENERAL,
+    "physician": GENERAL,
+}
+
+MIN_HITS = 2  # Keyword hits needed before a text is tagged with a specialty
+MIN_SHARE = 0.6  # ...and the share of those hits the winning domain must have
+FILE_MAJORITY = 0.5  # Share of a file's chunks one specialty must exceed before its untagged chunks follow
+
+def domain_for_specialty(specialty: str):
+    """Maps a Doctor.specialization (or a domain name) to a domain, None if unknown"""
+    if not specialty:
+        return None
+    value = specialty.strip().lower()
+    if value in DOMAIN_KEYWORDS or value == GENERAL:
+        return value
+    for stem, domain in SPECIALTY_STEMS.items():
+        if stem in value:
+            return domain
+    return None
+
+def _hits(text: str):
+    hits = Counter()
+    for token in tokenize(text):
+        for domain, keywords in DOMAIN_KEYWORDS.items():
+            if token in keywords:
+                hits[domain] += 1
+    return hits
+
+def classify(text: str, min_hits: int = MIN_HITS):
+    """Returns (domain, confidence); GENERAL with confidence 0 when no specialty clearly wins"""
+    hits = _hits(text)
+    total = sum(hits.values())
+    if total < min_hits:
+        return GENERAL, 0.0
+    domain, count = hits.most_common(1)[0]
+    share = count / total
+    if share < MIN_SHARE:
+        return GENERAL, 0.0
+    return domain, share
+
+def domain_from_name(source: str):
+    """Specialty a file name points at ("heart_failure.pdf", "Cardiology-Handbook.pdf"), else GENERAL"""
+    name = os.path.splitext(os.path.basename(source))[0].replace("_", " ").replace("-", " ")
+    domain, _ = classify(name, min_hits=1)
+    if domain == GENERAL:
+        named = {domain_for_specialty(token) for token in tokenize(name)} - {None, GENERAL}
+        if len(named) == 1:
+            domain = named.pop()
+    return domain
+
+def tag_chunks(source: str, chunks: list):
+    """
+    Domain of each chunk of one file. A chunk that clearly belongs to a specialty
+    keeps it. The rest stay GENERAL unless the whole file is about one specialty:
+    its name says so, or that specialty claims a clear majority of its chunks.
+    A cardiology textbook's anatomy chapter then lands in cardiology, while a
+    general textbook with a cardiology chapter keeps its other chapters general.
+    """
+    own = [classify(chunk) for chunk in chunks]
+    file_domain = domain_from_name(source)
+    if file_domain == GENERAL:
+        votes = Counter(domain for domain, _ in own if domain != GENERAL)
+        if votes:
+            domain, count = votes.most_common(1)[0]
+            if count / len(chunks) > FILE_MAJORITY:
+                file_domain = domain
+    return [domain if domain != GENERAL else file_domain for domain, _ in own]
+
+def route(query_text: str = None, specialty: str = None):
+    """
+    Partitions to search for one query: the booking specialty if given, else a
+    confidently classified query. Specialty partitions are always searched
+    together with "general". None means search everything.
+    """
+    domain = domain_for_specialty(specialty)
+    if domain is None and query_text:
+        domain, _ = classify(query_text, min_hits=1)  # Queries are short, one keyword is a signal
+    if domain is None or domain == GENERAL:
+        return None
+    return [domain, GENERAL]
@@ -0,0 +1,118 @@
+# File: backend/app/services/embedding_batcher.py
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+class EmbeddingBatcher:
+    """
+    Collects query strings from concurrent callers for up to `max_wait_ms`
+    (or until `max_batch_size` are waiting) and embeds them with ONE batched
+    encode call. Each caller blocks only on its own Future.
+    Recently embedded queries are served from an LRU cache without touching the model.
+    """
+    def __init__(self, encode_fn, max_batch_size=32, max_wait_ms=5, cache_size=2048):
+        self.encode_fn = encode_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.cache_size = cache_size
+
+        self._queue = queue.Queue()
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+        # Counters
+        self.batches = 0
+        self.encoded = 0
+        self.cache_hits = 0
+
+    def _ensure_worker(self):
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+                    self._thread.start()
+
+    def _cache_get(self, text):
+        if not self.cache_size:
+            return None
+        with self._cache_lock:
+            vector = self._cache.get(text)
+            if vector is not None:
+                self._cache.move_to_end(text)
+                self.cache_hits += 1
+            return vector
+
+    def _cache_put(self, text, vector):
+        if not self.cache_size:
+            return
+        with self._cache_lock:
+            self._cache[text] = vector
+            self._cache.move_to_end(text)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def submit(self, text: str) -> Future:
+        """Queues one query for the next batch"""
+        future = Future()
+        cached = self._cache_get(text)
+        if cached is not None:
+            future.set_result(list(cached))
+            return future
+
+        self._ensure_worker()
+        self._queue.put((text, future))
+        return future
+
+    def embed(self, text: str) -> list:
+        """Blocking helper, returns the embedding of a single query"""
+        return self.submit(text).result()
+
+    def _collect_batch(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect_batch()
+
+            # Identical queries in the same window are encoded once
+            texts = list(dict.fromkeys(text for text, _ in batch))
+            try:
+                vectors = self.encode_fn(texts)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.encoded += len(texts)
+            by_text = {}
+            for text, vector in zip(texts, vectors):
+                vector = vector.tolist() if hasattr(vector, "tolist") else list(vector)
+                by_text[text] = vector
+                self._cache_put(text, vector)
+
+            for text, future in batch:
+                future.set_result(list(by_text[text]))
+
+    def stats(self):
+        return {
+            "batches": self.batches,
+            "encoded": self.encoded,
+            "avg_batch_size": self.encoded / self.batches if self.batches else 0.0,
+            "cache_hits": self.cache_hits,
+            "cache_entries": len(self._cache),
+        }
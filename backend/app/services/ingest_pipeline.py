@@ -0,0 +1,222 @@
+# File: backend/app/services/ingest_pipeline.py
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from backend.app.core import config
+from backend.app.services.domain_router import tag_chunks
+from backend.app.services.pdf_chunker import extract_chunks, file_sha256
+
+# CONFIG
+MANIFEST_PATH = "backend/data/ingest_manifest.json"
+DEFAULT_EMBED_BATCH_SIZE = 1024  # Chunks per encode + Chroma write (Chroma caps a write at ~5k)
+CHECKPOINT_EVERY = 20  # Flushes between manifest + BM25 checkpoints
+DEFAULT_STREAM_ABOVE_MB = 50  # Bigger PDFs are streamed in-process instead of chunked whole in a worker
+
+class IngestManifest:
+    """
+    Per-file record of what is currently in the vector store:
+    {source: {"sha256", "chunks", "size", "mtime_ns", "ingested_at"}}
+    Entries recorded for another vector backend are dropped, so switching
+    CURACORE_VECTOR_BACKEND re-ingests everything into the new store, and so
+    does a change of LAYOUT (how chunks are tagged and partitioned).
+    """
+    LAYOUT = "domains-v1"
+
+    def __init__(self, path=MANIFEST_PATH, backend=None):
+        self.path = path
+        self.backend = backend or config.VECTOR_BACKEND
+        self.files = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                data = json.load(f)
+            # Manifests written before the backend was recorded were always Chroma
+            if data.get("vector_backend", "chroma") == self.backend and data.get("layout") == self.LAYOUT:
+                self.files = data.get("files", {})
+
+    def get(self, source: str):
+        return self.files.get(source)
+
+    def stat_matches(self, source: str, stat):
+        """Same size + mtime as last run, so the file is skipped without even hashing it"""
+        entry = self.files.get(source)
+        return bool(entry) and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns
+
+    def record(self, source: str, sha256: str, chunks: int, stat):
+        self.files[source] = {
+            "sha256": sha256,
+            "chunks": chunks,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "ingested_at": time.time(),
+        }
+
+    def remove(self, source: str):
+        self.files.pop(source, None)
+
+    def save(self):
+        # Write-then-rename so a crash mid-run never leaves a corrupt manifest
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"vector_backend": self.backend, "layout": self.LAYOUT, "files": self.files}, f, indent=1)
+        os.replace(tmp_path, self.path)
+
+class _ChunkBuffer:
+    """Accumulates chunks from many files so they are embedded in large batches"""
+    def __init__(self, rag_service, manifest, batch_size):
+        self.rag_service = rag_service
+        self.manifest = manifest
+        self.batch_size = batch_size
+        self.ids, self.docs, self.metas, self.owners = [], [], [], []
+        self.pending = {}  # source -> [chunks left to write, sha256, chunk count, stat]
+        self.written = 0
+        self.flushes = 0
+
+    def add_file(self, source, sha256, chunks, pages, stat):
+        if not chunks:
+            self.rag_service.delete_source(source)
+            self.manifest.record(source, sha256, 0, stat)
+            return
+        self.pending[source] = [len(chunks), sha256, len(chunks), stat]
+        self.ids.extend(self.rag_service.chunk_ids(source, sha256, 0, len(chunks)))
+        self.docs.extend(chunks)
+        domains = tag_chunks(source, chunks)
+        self.metas.extend({"source": source, "page": page, "domain": domain} for page, domain in zip(pages, domains))
+        self.owners.extend(source for _ in chunks)
+        while len(self.docs) >= self.batch_size:
+            self.flush(self.batch_size)
+
+    def flush(self, n=None):
+        n = len(self.docs) if n is None else n
+        if n == 0:
+            return
+        ids, docs, metas, owners = self.ids[:n], self.docs[:n], self.metas[:n], self.owners[:n]
+        del self.ids[:n], self.docs[:n], self.metas[:n], self.owners[:n]
+
+        print(f"   ↳ Embedding + writing {len(docs)} chunks...")
+        self.rag_service.add_chunks(ids, docs, metas)
+        self.written += len(docs)
+
+        # A file only lands in the manifest once ALL of its chunks are stored
+        for source in owners:
+            self.pending[source][0] -= 1
+        for source in set(owners):
+            left, sha256, count, stat = self.pending[source]
+            if left == 0:
+                # Only now drop the previous version, so a failed run never loses it
+                self.rag_service.delete_source(source, keep_ids=self.rag_service.chunk_ids(source, sha256, 0, count))
+                self.manifest.record(source, sha256, count, stat)
+                del self.pending[source]
+
+        # The manifest is only saved together with the BM25 index, so both always
+        # describe the same set of files if the run is interrupted
+        self.flushes += 1
+        if self.flushes % CHECKPOINT_EVERY == 0:
+            self.checkpoint()
+
+    def checkpoint(self):
+        self.rag_service.bm25.save()
+        self.manifest.save()
+
+def run_ingest(folder: str, workers: int = None, embed_batch_size: int = DEFAULT_EMBED_BATCH_SIZE,
+               force: bool = False, prune: bool = True, manifest_path: str = MANIFEST_PATH,
+               stream: bool = False, stream_above_mb: float = DEFAULT_STREAM_ABOVE_MB):
+    """
+    Incremental, parallel ingestion of every PDF in `folder`:
+    extraction + chunking in a process pool, embedding in large batches in this process.
+    Unchanged files are skipped, changed files have their old chunks replaced,
+    and (with `prune`) files that disappeared from the folder are removed from the store.
+    Files above `stream_above_mb` (or every file with `stream`) go through the
+    bounded-memory streaming path instead of the pool. Only those are bounded: a
+    pool worker returns all chunks of its file at once and they are held here
+    until embedded, so memory on the pool path grows with the largest file.
+    """
+    # Heavy import (embedding model + Chroma) stays in the parent process only
+    from backend.app.services.rag_service import rag_service
+
+    started = time.perf_counter()
+    manifest = IngestManifest(manifest_path)
+    stats = {"scanned": 0, "skipped": 0, "ingested": 0, "failed": 0, "removed": 0, "chunks": 0}
+
+    # 1. Decide what needs work
+    to_process, to_stream = [], []
+    present = set()
+    for name in sorted(os.listdir(folder)):
+        if not name.endswith(".pdf"):
+            continue
+        path = os.path.join(folder, name)
+        stat = os.stat(path)
+        present.add(name)
+        stats["scanned"] += 1
+        if not force and manifest.stat_matches(name, stat):
+            stats["skipped"] += 1
+            continue
+        known = None if force else (manifest.get(name) or {}).get("sha256")
+        if stream or stat.st_size > stream_above_mb * 1024 * 1024:
+            to_stream.append((path, known, stat))
+        else:
+            to_process.append((path, known, stat))
+
+    buffer = _ChunkBuffer(rag_service, manifest, embed_batch_size)
+    if prune:
+        for source in [s for s in manifest.files if s not in present]:
+            print(f"🗑️ Removing chunks of deleted file: {source}")
+            rag_service.delete_source(source)
+            manifest.remove(source)
+            stats["removed"] += 1
+        buffer.checkpoint()
+
+    print(f"📊 {stats['scanned']} PDFs, {len(to_process) + len(to_stream)} to check, {stats['skipped']} unchanged.")
+
+    # 2. Extract + chunk in parallel, embed + write in big batches as results arrive
+    if to_process:
+        workers = workers or max(1, (os.cpu_count() or 2) - 1)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(extract_chunks, path, known): stat for path, known, stat in to_process}
+            for future in as_completed(futures):
+                stat = futures[future]
+                result = future.result()
+                source = result["source"]
+
+                if "error" in result:
+                    print(f"❌ Failed to read {source}: {result['error']}")
+                    stats["failed"] += 1
+                    continue
+
+                if result.get("unchanged"):
+                    # Touched but identical content: refresh size/mtime only
+                    entry = manifest.get(source)
+                    manifest.record(source, result["sha256"], entry["chunks"], stat)
+                    stats["skipped"] += 1
+                    continue
+
+                print(f"📄 {source}: {len(result['chunks'])} chunks")
+                buffer.add_file(source, result["sha256"], result["chunks"], result["pages"], stat)
+                stats["ingested"] += 1
+
+        buffer.flush()
+
+    # 3. Very large books: stream page by page so RSS stays flat
+    for path, known, stat in to_stream:
+        source = os.path.basename(path)
+        if known and file_sha256(path) == known:
+            manifest.record(source, known, manifest.get(source)["chunks"], stat)
+            stats["skipped"] += 1
+            continue
+        result = rag_service.ingest_file(path, batch_size=min(embed_batch_size, 256))
+        if result is None:
+            stats["failed"] += 1
+            continue
+        manifest.record(source, result["sha256"], result["chunks"], stat)
+        manifest.save()
+        buffer.written += result["chunks"]
+        stats["ingested"] += 1
+
+    if stats["ingested"] or stats["removed"]:
+        rag_service.commit()
+    manifest.save()
+
+    stats["chunks"] = buffer.written
+    stats["seconds"] = round(time.perf_counter() - started, 2)
+    return stats
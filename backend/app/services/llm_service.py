@@ -1,42 +1,191 @@
-# File: backend/app/services/llm_service.py
-import ollama
-
-class LLMService:
-    def __init__(self):
-        self.model = "gemma:2b" # Or "gemma:2b" if you have low RAM
-
-    def generate_response(self, user_query: str, context_chunks: list):
-        """
-        Constructs the prompt and calls Ollama
-        """
-        # 1. Format Context
-        context_text = "\n\n".join(context_chunks)
-        
-        # 2. Build System Prompt
-        system_prompt = f"""
-        You are CuraCore, an expert AI Medical Assistant.
-        Use the following MEDICAL CONTEXT to answer the user's question.
-        
-        CONTEXT:
-        {context_text}
-        
-        RULES:
-        1. Only use the provided context. If the answer isn't there, say "I don't have enough information."
-        2. Do NOT hallucinate treatments.
-        3. Be concise and professional.
-        """
-
-        # 3. Call Ollama
-        try:
-            response = ollama.chat(
-                model=self.model,
-                messages=[
-                    {'role': 'system', 'content': system_prompt},
-                    {'role': 'user', 'content': user_query},
-                ]
-            )
-            return response['message']['content']
-        except Exception as e:
-            return f"⚠️ AI Error: {str(e)}. Is Ollama running?"
-
-llm_service = LLMService()
\ No newline at end of file
+# File: backend/app/services/llm_service.py
+from backend.app.core import config
+from backend.app.core.metrics import span, LLM_TIERS
+from backend.app.services.ollama_client import ollama_pool
+from backend.app.services.context_packer import pack_context, estimate_tokens, fit_tokens
+
+# Returned without an LLM call when retrieval found nothing relevant; it is
+# what the model would have been told to say anyway (see _system_prompt)
+NO_CONTEXT_REPLY = (
+    "I don't have enough information in my medical library to answer that. "
+    "Please book a consultation with a doctor."
+)
+REFUSAL_MARKER = "don't have enough information"
+
+class LLMService:
+    def __init__(self):
+        self.model = config.LLM_SMALL_MODEL  # Default tier, and the only one with the cascade off
+        self.tier_counts = {"gated": 0, "small": 0, "large": 0, "escalated": 0}
+
+    def context_budget(self, model: str = None):
+        return config.CONTEXT_TOKEN_BUDGETS.get(model or self.model, config.DEFAULT_CONTEXT_TOKEN_BUDGET)
+
+    def _count(self, tier: str):
+        self.tier_counts[tier] += 1
+        LLM_TIERS.inc(tier=tier)
+
+    def plan(self, user_query: str, scores: list = None, lexical: list = None, gate: bool = True):
+        """
+        Picks how to answer from the retrieval scores: `scores` are cosine similarities
+        (None for BM25-only hits), `lexical` the BM25 term coverage of the same hits.
+        - "gated": neither search found anything relevant, reply NO_CONTEXT_REPLY without an LLM call
+        - "small": confident vector retrieval and a short question, LLM_SMALL_MODEL
+        - "large": everything else, LLM_LARGE_MODEL
+        Returns {"tier", "model", "confidence", "lexical"}. `gate=False` for follow-ups,
+        which can be answerable from the conversation alone.
+        """
+        known = [score for score in (scores or []) if score is not None]
+        confidence = max(known) if known else 0.0
+        # An exact ICD code or drug name match is evidence even when the embedding misses it
+        known = [score for score in (lexical or []) if score is not None]
+        lexical_confidence = max(known) if known else 0.0
+
+        if (gate and config.CONFIDENCE_GATE_ENABLED and confidence < config.CONFIDENCE_MIN_SCORE
+                and lexical_confidence < config.CONFIDENCE_MIN_LEXICAL):
+            tier, model = "gated", None
+        elif not config.LLM_CASCADE_ENABLED:
+            tier, model = "small", self.model
+        elif confidence >= config.CASCADE_SMALL_MIN_SCORE and estimate_tokens(user_query) <= config.CASCADE_SMALL_MAX_QUERY_TOKENS:
+            tier, model = "small", config.LLM_SMALL_MODEL
+        else:
+            tier, model = "large", config.LLM_LARGE_MODEL
+
+        self._count(tier)
+        return {"tier": tier, "model": model, "confidence": round(confidence, 4), "lexical": round(lexical_confidence, 4)}
+
+    def tier_stats(self):
+        total = sum(self.tier_counts[tier] for tier in ("gated", "small", "large"))  # Escalations are re-tries
+        return {
+            **self.tier_counts,
+            "total": total,
+            "llm_calls_saved_ratio": self.tier_counts["gated"] / total if total else 0.0,
+        }
+
+    def _system_prompt(self, context_text: str):
+        return f"""
+        You are CuraCore, an expert AI Medical Assistant.
+        Use the following MEDICAL CONTEXT to answer the user's question.
+        
+        CONTEXT:
+        {context_text}
+        
+        RULES:
+        1. Only use the provided context. If the answer isn't there, say "I don't have enough information."
+        2. Do NOT hallucinate treatments.
+        3. Be concise and professional.
+        """
+
+    def _history_messages(self, history: dict):
+        """
+        Chat-session history (see services/chat_sessions.py) as prompt messages:
+        the rolling summary, then as many of the latest turns as fit
+        CHAT_HISTORY_TOKEN_BUDGET, newest kept first.
+        """
+        if not history:
+            return []
+        budget = config.CHAT_HISTORY_TOKEN_BUDGET
+        messages = []
+
+        if history.get("summary"):
+            summary = fit_tokens(history["summary"], min(config.CHAT_SUMMARY_MAX_TOKENS, budget))
+            budget -= estimate_tokens(summary)
+            messages.append({'role': 'system', 'content': f"Summary of the conversation so far:\n{summary}"})
+
+        recent = []
+        for role, content in reversed(history.get("recent", [])):
+            if budget <= 0:
+                break
+            content = fit_tokens(content, budget)
+            budget -= estimate_tokens(content)
+            recent.insert(0, {'role': role, 'content': content})
+        return messages + recent
+
+    def build_prompt(self, user_query: str, context_chunks: list, history: dict = None, model: str = None):
+        """
+        Builds the system + user messages sent to Ollama. With a chat-session
+        `history` the rolling summary and latest turns go between them, within a fixed budget.
+        Returns {"messages", "model", "prompt_tokens" (estimated), "context" (packing stats)}
+        """
+        model = model or self.model
+
+        # 1. Pack Context: de-duplicate overlapping chunks, fit the model's token budget
+        with span("llm_pack_context"):
+            packed = pack_context(context_chunks, self.context_budget(model))
+        context_text = "\n\n".join(packed["chunks"])
+        
+        # 2. Build System Prompt
+        system_prompt = self._system_prompt(context_text)
+
+        messages = [
+            {'role': 'system', 'content': system_prompt},
+            *self._history_messages(history),
+            {'role': 'user', 'content': user_query},
+        ]
+        return {
+            "messages": messages,
+            "model": model,
+            "prompt_tokens": sum(estimate_tokens(m['content']) for m in messages),
+            "context": packed["stats"],
+        }
+
+    def generate_response(self, user_query: str, context_chunks: list, prompt: dict = None):
+        """
+        Constructs the prompt and calls Ollama
+        """
+        prompt = prompt or self.build_prompt(user_query, context_chunks)
+        messages, model = prompt["messages"], prompt.get("model", self.model)
+
+        # 3. Call Ollama (shared pooled client)
+        try:
+            with span("llm_generate"):
+                response = ollama_pool.chat_sync(model, messages)
+            return response['message']['content']
+        except Exception as e:
+            return f"⚠️ AI Error: {str(e)}. Is Ollama running?"
+
+    async def agenerate_response(self, user_query: str, context_chunks: list, prompt: dict = None):
+        """
+        Async generate_response: the request waits on the pool without holding a thread
+        """
+        prompt = prompt or self.build_prompt(user_query, context_chunks)
+        messages, model = prompt["messages"], prompt.get("model", self.model)
+
+        try:
+            with span("llm_generate"):
+                response = await ollama_pool.chat(model, messages)
+            return response['message']['content']
+        except Exception as e:
+            return f"⚠️ AI Error: {str(e)}. Is Ollama running?"
+
+    async def answer(self, user_query: str, context_chunks: list, plan: dict, history: dict = None):
+        """
+        Generates with the planned tier's model. A small-model refusal despite a
+        confident retrieval is retried once on the large model.
+        Returns (reply, prompt) where prompt is the one that produced the reply.
+        """
+        prompt = self.build_prompt(user_query, context_chunks, history=history, model=plan["model"])
+        reply = await self.agenerate_response(user_query, context_chunks, prompt=prompt)
+
+        if (plan["tier"] == "small" and config.LLM_CASCADE_ENABLED and config.CASCADE_ESCALATE_REFUSALS
+                and REFUSAL_MARKER in reply and config.LLM_LARGE_MODEL != prompt["model"]):
+            self._count("escalated")
+            prompt = self.build_prompt(user_query, context_chunks, history=history, model=config.LLM_LARGE_MODEL)
+            reply = await self.agenerate_response(user_query, context_chunks, prompt=prompt)
+        return reply, prompt
+
+    async def stream_response(self, user_query: str, context_chunks: list, prompt: dict = None):
+        """
+        Same prompt as generate_response, but yields tokens as Ollama produces them
+        """
+        prompt = prompt or self.build_prompt(user_query, context_chunks)
+        messages, model = prompt["messages"], prompt.get("model", self.model)
+
+        try:
+            async for chunk in ollama_pool.stream_chat(model, messages):
+                token = chunk['message']['content']
+                if token:
+                    yield token
+        except Exception as e:
+            yield f"⚠️ AI Error: {str(e)}. Is Ollama running?"
+
+llm_service = LLMService()
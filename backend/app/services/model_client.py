@@ -0,0 +1,106 @@
+# File: backend/app/services/model_client.py
+import os
+import queue
+from multiprocessing.connection import Client
+import numpy as np
+from backend.app.core import config
+
+class ModelServerError(Exception):
+    """The model server is unreachable or a request failed on it"""
+
+class ModelClient:
+    """
+    API-worker side of services/model_server.py. Keeps up to `pool_size` idle
+    connections so concurrent requests in one worker don't queue behind each
+    other; each call is one request/response on a connection it owns.
+    A call that fails on a stale connection (server restarted) is retried once.
+    """
+    def __init__(self, address, pool_size=8):
+        self.address = address
+        self.pool_size = pool_size
+        self._idle = queue.LifoQueue()
+
+    def _connect(self):
+        try:
+            return Client(self.address)
+        except (OSError, EOFError) as e:
+            raise ModelServerError(f"Model server not reachable at {self.address}: {e}")
+
+    def _checkout(self):
+        try:
+            return self._idle.get_nowait(), True
+        except queue.Empty:
+            return self._connect(), False
+
+    def _checkin(self, conn):
+        if self._idle.qsize() < self.pool_size:
+            self._idle.put(conn)
+        else:
+            conn.close()
+
+    def call(self, op: str, *args, on_partial=None):
+        for attempt in range(2):
+            conn, reused = self._checkout()
+            try:
+                conn.send((op, args))
+                while True:
+                    kind, payload = conn.recv()
+                    if kind != "partial":
+                        break
+                    if on_partial:
+                        on_partial(payload)
+            except (OSError, EOFError) as e:
+                conn.close()
+                if reused and attempt == 0:
+                    continue
+                raise ModelServerError(f"Model server connection lost: {e}")
+            self._checkin(conn)
+            if kind == "error":
+                raise ModelServerError(payload)
+            return payload
+
+    # --- Operations ---
+    def encode_queries(self, texts: list):
+        """Query embeddings, batched on the server together with other workers' queries"""
+        return np.asarray(self.call("embed_queries", list(texts)), dtype=np.float32)
+
+    def encode_documents(self, texts: list):
+        """Document (chunk) embeddings for ingestion, encoded as one batch"""
+        return np.asarray(self.call("embed_documents", list(texts)), dtype=np.float32)
+
+    def transcribe(self, data: bytes, suffix: str = "", on_partial=None):
+        return self.call("transcribe", data, suffix, on_partial is not None, on_partial=on_partial)
+
+    def status(self):
+        """Per-model state on the server, plus its embedding batcher stats"""
+        return self.call("status")
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+class RemoteWhisperService:
+    """Drop-in for WhisperService when Whisper lives in the model server"""
+    model = True  # Loaded (or loading) on the server
+
+    def transcribe(self, file_path: str):
+        if not os.path.exists(file_path):
+            return "Error: File not found."
+        with open(file_path, "rb") as f:
+            return self.transcribe_bytes(f.read(), os.path.splitext(file_path)[1])
+
+    def transcribe_bytes(self, data: bytes, suffix: str = "", on_partial=None):
+        try:
+            return model_client.transcribe(data, suffix, on_partial)
+        except ModelServerError as e:
+            return f"Error processing audio: {str(e)}"
+
+    def shutdown(self):
+        model_client.close()
+
+# Singleton, None when the models load in-process
+model_client = ModelClient(config.MODEL_SERVER_ADDRESS, config.MODEL_SERVER_CONNECTIONS) \
+    if config.MODEL_SERVER_ADDRESS else None
@@ -0,0 +1,130 @@
+# File: backend/app/services/model_server.py
+"""
+One process that owns the embedding model and Whisper for every API worker
+(see run.py --workers). Workers talk to it through services/model_client.py
+over a Unix socket (a named pipe on Windows), so N workers cost one copy of
+each model. Query embeddings from all workers go through one EmbeddingBatcher,
+so concurrent queries are encoded together whichever worker they came from.
+
+    python -m backend.app.services.model_server --address backend/data/model_server.sock
+"""
+import argparse
+import os
+import sys
+import threading
+from multiprocessing.connection import Listener
+from backend.app.core import config
+from backend.app.core.lazy import LazyService
+from backend.app.services.embedding_batcher import EmbeddingBatcher
+
+def _load_embedding_model():
+    from sentence_transformers import SentenceTransformer
+    from backend.app.services.rag_service import EMBED_MODEL_NAME
+    return SentenceTransformer(EMBED_MODEL_NAME)
+
+def _load_whisper():
+    from backend.app.services.whisper_service import WhisperService
+    return WhisperService()
+
+class ModelServer:
+    def __init__(self, address):
+        self.address = address
+        self.embed_model = LazyService("embedding_model", _load_embedding_model)
+        self.whisper = LazyService("whisper_model", _load_whisper)
+        self.query_batcher = EmbeddingBatcher(
+            lambda texts: self.embed_model.encode(texts),
+            max_batch_size=config.EMBED_BATCH_MAX_SIZE,
+            max_wait_ms=config.EMBED_BATCH_MAX_WAIT_MS,
+            cache_size=config.EMBED_CACHE_SIZE,
+        )
+
+    # --- Operations ---
+    def embed_queries(self, texts):
+        futures = [self.query_batcher.submit(text) for text in texts]
+        return [future.result() for future in futures]
+
+    def embed_documents(self, texts):
+        return self.embed_model.encode(texts)
+
+    def transcribe(self, send, data, suffix, stream):
+        on_partial = (lambda partial: send(("partial", partial))) if stream else None
+        return self.whisper.transcribe_bytes(data, suffix, on_partial)
+
+    def status(self):
+        return {
+            "models": {"embedding": self.embed_model.status(), "whisper": self.whisper.status()},
+            "query_batcher": self.query_batcher.stats(),
+        }
+
+    # --- Connections ---
+    def _handle(self, conn):
+        send_lock = threading.Lock()  # Segment partials arrive from worker threads
+
+        def send(message):
+            with send_lock:
+                conn.send(message)
+
+        with conn:
+            while True:
+                try:
+                    op, args = conn.recv()
+                except (EOFError, OSError):
+                    return
+                try:
+                    if op == "embed_queries":
+                        result = self.embed_queries(*args)
+                    elif op == "embed_documents":
+                        result = self.embed_documents(*args)
+                    elif op == "transcribe":
+                        result = self.transcribe(send, *args)
+                    elif op == "status":
+                        result = self.status()
+                    else:
+                        raise ValueError(f"Unknown operation: {op}")
+                    send(("ok", result))
+                except (EOFError, OSError):
+                    return
+                except Exception as e:
+                    send(("error", f"{type(e).__name__}: {e}"))
+
+    def serve_forever(self):
+        family = "AF_PIPE" if sys.platform == "win32" else "AF_UNIX"
+        if family == "AF_UNIX":
+            os.makedirs(os.path.dirname(self.address) or ".", exist_ok=True)
+            if os.path.exists(self.address):
+                os.remove(self.address)  # Left over from a killed server
+
+        # Requests are pickled: only this user may connect. The socket is created
+        # under a restrictive umask, so it is never reachable by others, even briefly
+        old_umask = os.umask(0o177) if family == "AF_UNIX" else None
+        try:
+            listener = Listener(self.address, family=family)
+        finally:
+            if old_umask is not None:
+                os.umask(old_umask)
+
+        # Workers reach a ready socket at once; the models load in the background
+        self.embed_model.warm_up()
+        self.whisper.warm_up()
+
+        with listener:
+            print(f"🧩 Model server listening on {self.address}")
+            while True:
+                try:
+                    conn = listener.accept()
+                except OSError as e:
+                    print(f"⚠️ Model server accept failed: {e}")
+                    continue
+                threading.Thread(target=self._handle, args=(conn,), name="model-conn", daemon=True).start()
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared embedding + Whisper server for the API workers")
+    parser.add_argument("--address", required=True, help="Unix socket path (named pipe on Windows)")
+    args = parser.parse_args()
+    try:
+        ModelServer(args.address).serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+# File: backend/app/services/ollama_client.py
+import asyncio
+import hashlib
+import json
+import threading
+import time
+import ollama
+from backend.app.core import config
+from backend.app.core.metrics import LLM_SECONDS, record_llm_response
+
+class OllamaPool:
+    """
+    The one way the backend talks to Ollama.
+    - A single ollama.AsyncClient (one httpx connection pool) lives on a dedicated
+      event-loop thread, so sync code (threadpool handlers, job workers) and async
+      endpoints share the same connections and limits.
+    - A global semaphore plus one semaphore per model cap concurrent generations,
+      so the daemon is not made to thrash between models.
+    - Identical non-streaming requests already in flight are coalesced: the
+      duplicates wait for and share the first one's response.
+    - Every call has a timeout; a stream has it on each chunk.
+    """
+    def __init__(self, host=None, timeout=180, max_in_flight=2, default_concurrency=1, model_concurrency=None):
+        self.host = host
+        self.timeout = timeout
+        self.max_in_flight = max_in_flight
+        self.default_concurrency = default_concurrency
+        self.model_concurrency = model_concurrency or {}
+
+        self._loop = None
+        self._client = None
+        self._start_lock = threading.Lock()
+        self._global = None
+        self._semaphores = {}
+        self._in_flight = {}  # request key -> Task
+
+        # Counters
+        self.requests = 0
+        self.coalesced = 0
+        self.timeouts = 0
+        self.active = {}   # model -> generations running
+        self.waiting = {}  # model -> generations queued on the semaphores
+
+    # --- Loop management ---
+    def _ensure_loop(self):
+        if self._loop is not None:
+            return self._loop
+        with self._start_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+
+                def run():
+                    asyncio.set_event_loop(loop)
+                    self._client = ollama.AsyncClient(host=self.host, timeout=self.timeout)
+                    self._global = asyncio.Semaphore(self.max_in_flight)
+                    ready.set()
+                    loop.run_forever()
+
+                threading.Thread(target=run, name="ollama-pool", daemon=True).start()
+                ready.wait()
+                self._loop = loop
+        return self._loop
+
+    def _submit(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+    def _semaphore(self, model: str):
+        if model not in self._semaphores:
+            limit = self.model_concurrency.get(model, self.default_concurrency)
+            self._semaphores[model] = asyncio.Semaphore(limit)
+        return self._semaphores[model]
+
+    @staticmethod
+    def _key(model, messages, options):
+        payload = json.dumps([model, messages, options], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    # --- Runs on the pool loop ---
+    async def _acquire(self, model):
+        self.waiting[model] = self.waiting.get(model, 0) + 1
+        try:
+            # Model slot first: a request queued for a busy model must not hold a global slot
+            await self._semaphore(model).acquire()
+            try:
+                await self._global.acquire()
+            except BaseException:
+                self._semaphore(model).release()
+                raise
+        finally:
+            self.waiting[model] -= 1
+        self.active[model] = self.active.get(model, 0) + 1
+
+    def _release(self, model):
+        self.active[model] -= 1
+        self._global.release()
+        self._semaphore(model).release()
+
+    async def _generate(self, model, messages, options):
+        queued = time.perf_counter()
+        await self._acquire(model)
+        started = time.perf_counter()
+        LLM_SECONDS.observe(started - queued, model=model, phase="queue")
+        try:
+            response = await asyncio.wait_for(
+                self._client.chat(model=model, messages=messages, options=options or None),
+                timeout=self.timeout,
+            )
+            LLM_SECONDS.observe(time.perf_counter() - started, model=model, phase="total")
+            record_llm_response(model, response)
+            return response
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise TimeoutError(f"Ollama did not answer within {self.timeout}s")
+        finally:
+            self._release(model)
+
+    async def _chat(self, model, messages, options):
+        self.requests += 1
+        key = self._key(model, messages, options)
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._generate(model, messages, options))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            self.coalesced += 1
+        # shield: one caller going away must not cancel the generation the others share
+        return await asyncio.shield(task)
+
+    async def _stream(self, model, messages, options, push):
+        """Pushes each chunk via `push(chunk)`, then push(None); errors are pushed as exceptions"""
+        self.requests += 1
+        try:
+            queued = time.perf_counter()
+            await self._acquire(model)
+            started = time.perf_counter()
+            LLM_SECONDS.observe(started - queued, model=model, phase="queue")
+            stream = None
+            try:
+                stream = await asyncio.wait_for(
+                    self._client.chat(model=model, messages=messages, options=options or None, stream=True),
+                    timeout=self.timeout,
+                )
+                first = True
+                while True:
+                    # Every chunk gets the timeout: a daemon that stalls mid-answer must not hold the slot
+                    try:
+                        chunk = await asyncio.wait_for(anext(stream), timeout=self.timeout)
+                    except StopAsyncIteration:
+                        break
+                    if first:
+                        LLM_SECONDS.observe(time.perf_counter() - started, model=model, phase="first_token")
+                        first = False
+                    if chunk.get("done"):
+                        LLM_SECONDS.observe(time.perf_counter() - started, model=model, phase="total")
+                        record_llm_response(model, chunk)
+                    push(chunk)
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                raise TimeoutError(f"Ollama stream stalled for more than {self.timeout}s")
+            finally:
+                self._release(model)
+                if stream is not None:
+                    await stream.aclose()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            push(e)
+        push(None)
+
+    # --- Public API ---
+    def chat_sync(self, model: str, messages: list, **options):
+        """Blocking chat completion (for sync handlers and worker threads)"""
+        return self._submit(self._chat(model, messages, options)).result()
+
+    async def chat(self, model: str, messages: list, **options):
+        """Awaitable chat completion from any event loop"""
+        return await asyncio.wrap_future(self._submit(self._chat(model, messages, options)))
+
+    async def stream_chat(self, model: str, messages: list, **options):
+        """Async generator of streamed chunks, usable from any event loop"""
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+
+        def push(item):
+            loop.call_soon_threadsafe(queue.put_nowait, item)
+
+        producer = self._submit(self._stream(model, messages, options, push))
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            # Client disconnected / consumer stopped early: free the model slot
+            producer.cancel()
+
+    def stats(self):
+        return {
+            "requests": self.requests,
+            "coalesced": self.coalesced,
+            "timeouts": self.timeouts,
+            "in_flight": len(self._in_flight),
+            "active": dict(self.active),
+            "waiting": dict(self.waiting),
+        }
+
+# Singleton
+ollama_pool = OllamaPool(
+    host=config.OLLAMA_HOST,
+    timeout=config.OLLAMA_TIMEOUT_SECONDS,
+    max_in_flight=config.OLLAMA_MAX_IN_FLIGHT,
+    default_concurrency=config.OLLAMA_DEFAULT_MODEL_CONCURRENCY,
+    model_concurrency=config.OLLAMA_MODEL_CONCURRENCY,
+)
@@ -0,0 +1,75 @@
+# File: backend/app/services/password_hasher.py
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from starlette.concurrency import run_in_threadpool
+from backend.app.core import config
+from backend.app.core.errors import PoolFullError
+
+# Hashes stay in the same $2b$ format passlib wrote, so existing users still log in.
+# bcrypt only looks at the first 72 bytes of a password.
+def _hash(password: str, rounds: int):
+    import bcrypt
+    return bcrypt.hashpw(password.encode("utf-8")[:72], bcrypt.gensalt(rounds)).decode("utf-8")
+
+def _verify(password: str, hashed: str):
+    import bcrypt
+    if not hashed:
+        return False
+    try:
+        return bcrypt.checkpw(password.encode("utf-8")[:72], hashed.encode("utf-8"))
+    except ValueError:  # Malformed stored hash
+        return False
+
+class PasswordHasher:
+    """
+    bcrypt is deliberately slow (~250ms of CPU a call); run inline it ties up
+    the request threadpool during a login burst. Hashing runs
+    on a small process pool instead, with the same bounded-queue rule as the
+    transcription pool: `workers` running, `queue_depth` waiting, the rest rejected.
+    workers=0 keeps the old inline behaviour (benchmarks compare against it).
+    """
+    def __init__(self, workers=2, queue_depth=16, rounds=12):
+        self.workers = workers
+        self.rounds = rounds
+        self._executor = None
+        self._slots = threading.BoundedSemaphore(max(1, workers) + queue_depth)
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                # spawn: never fork a server process that may already hold model threads
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    async def _run(self, fn, *args):
+        if self.workers <= 0:
+            return await run_in_threadpool(fn, *args)
+        if not self._slots.acquire(blocking=False):
+            raise PoolFullError()
+        try:
+            return await asyncio.wrap_future(self._get_executor().submit(fn, *args))
+        finally:
+            self._slots.release()
+
+    async def hash(self, password: str):
+        return await self._run(_hash, password, self.rounds)
+
+    async def verify(self, password: str, hashed: str):
+        return await self._run(_verify, password, hashed)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+# Singleton
+password_hasher = PasswordHasher(
+    workers=config.BCRYPT_WORKERS,
+    queue_depth=config.BCRYPT_QUEUE_DEPTH,
+    rounds=config.BCRYPT_ROUNDS,
+)
@@ -0,0 +1,129 @@
+# File: backend/app/services/pdf_chunker.py
+# Lightweight PDF -> chunks helpers. Kept free of the embedding model / Chroma
+# imports so ingestion worker processes start fast and stay small.
+import hashlib
+import os
+from bisect import bisect_right
+from pypdf import PdfReader
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+CHUNK_SIZE = 1000
+CHUNK_OVERLAP = 200
+SEPARATORS = ["\n\n", "\n", ".", "!", "?", " ", ""]
+PAGES_PER_READER = 200
+
+def make_splitter():
+    return RecursiveCharacterTextSplitter(
+        chunk_size=CHUNK_SIZE,
+        chunk_overlap=CHUNK_OVERLAP,
+        separators=SEPARATORS
+    )
+
+def file_sha256(file_path: str):
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def iter_pages(file_path: str, pages_per_reader: int = PAGES_PER_READER):
+    """
+    Yields (page_number, text) one page at a time, calling extract_text() once per page.
+    The reader is re-opened every `pages_per_reader` pages so pypdf's parsed-object
+    cache does not grow with the size of the book.
+    """
+    page_count = len(PdfReader(file_path).pages)
+    reader = None
+    for index in range(page_count):
+        if index % pages_per_reader == 0:
+            reader = PdfReader(file_path)
+        page_text = reader.pages[index].extract_text()
+        if page_text:
+            yield index + 1, page_text
+
+def iter_chunks(pages, splitter=None, window: int = CHUNK_SIZE * 8):
+    """
+    Chunks a stream of (page_number, text) across page boundaries.
+    Text is buffered up to `window` characters and split; the last chunk of each
+    window is held back and re-split with the next pages, so neighbours keep their
+    CHUNK_OVERLAP across page and window edges and only about `window` characters
+    are held at a time.
+    This is close to, but not always the same as, splitting the whole document at
+    once: the splitter picks its separators from the text it is given, so a
+    paragraph break ("\n\n") that first appears later in the book, or a window
+    edge inside an over-long line, can move a boundary (e.g. 191 vs 192 chunks on
+    a 60-page PDF). The output is deterministic, so chunk ids stay stable per file.
+    Yields (chunk, page_number_where_the_chunk_starts).
+    """
+    splitter = splitter or make_splitter()
+    buffer = ""
+    marks = []  # (offset in buffer, page_number) for each page start
+
+    def page_at(offset):
+        return marks[max(bisect_right([m[0] for m in marks], offset) - 1, 0)][1]
+
+    def split(final):
+        chunks = splitter.split_text(buffer)
+        if not final:
+            if len(chunks) <= 1:
+                return [], None
+            chunks, held = chunks[:-1], chunks[-1]
+        out = []
+        cursor = 0
+        for chunk in chunks:
+            pos = buffer.find(chunk, cursor)
+            if pos == -1:
+                pos = cursor
+            out.append((chunk, page_at(pos)))
+            cursor = pos + 1
+        if final:
+            return out, None
+        held_at = buffer.find(held, cursor)
+        return out, (held_at if held_at != -1 else cursor)
+
+    for page_number, text in pages:
+        if buffer:
+            buffer += "\n"
+        marks.append((len(buffer), page_number))
+        buffer += text
+
+        if len(buffer) >= window:
+            out, keep_from = split(final=False)
+            yield from out
+            if keep_from is not None:
+                # Drop everything before the held-back chunk, keep page marks aligned
+                first_page = page_at(keep_from)
+                marks = [(0, first_page)] + [(off - keep_from, page) for off, page in marks if off > keep_from]
+                buffer = buffer[keep_from:]
+
+    if buffer:
+        out, _ = split(final=True)
+        yield from out
+
+def extract_text(file_path: str):
+    """Whole-document text, one extract_text() call per page"""
+    return "\n".join(text for _, text in iter_pages(file_path))
+
+def extract_chunks(file_path: str, known_sha256: str = None):
+    """
+    Process-pool worker: hashes the file and, if it changed since `known_sha256`,
+    extracts and chunks it. Returns a plain dict so it pickles cheaply.
+    Pages are read lazily, but every chunk of the file is returned at once, so
+    memory grows with the file; big books go through RAGService.ingest_file instead.
+    """
+    result = {"path": file_path, "source": os.path.basename(file_path)}
+    try:
+        result["sha256"] = file_sha256(file_path)
+        if known_sha256 and result["sha256"] == known_sha256:
+            result["unchanged"] = True
+            return result
+
+        chunks, pages = [], []
+        for chunk, page_number in iter_chunks(iter_pages(file_path)):
+            chunks.append(chunk)
+            pages.append(page_number)
+        result["chunks"] = chunks
+        result["pages"] = pages
+    except Exception as e:
+        result["error"] = str(e)
+    return result
@@ -1,92 +1,240 @@
-# File: backend/app/services/rag_service.py
-import os
-from pypdf import PdfReader
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-from sentence_transformers import SentenceTransformer
-import chromadb
-
-# CONFIG
-PDF_STORAGE_PATH = "backend/data/medical_pdfs"
-CHROMA_PATH = "backend/data/chromadb"
-
-class RAGService:
-    def __init__(self):
-        # 1. Initialize Embedding Model
-        self.embed_model = SentenceTransformer('all-MiniLM-L6-v2')
-        
-        # 2. Connect to ChromaDB
-        self.chroma_client = chromadb.PersistentClient(path=CHROMA_PATH)
-        self.collection = self.chroma_client.get_or_create_collection(name="medical_docs")
-
-    def _get_embeddings(self, texts):
-        """Helper to get embeddings list"""
-        if isinstance(texts, str):
-            texts = [texts]
-        embeddings = self.embed_model.encode(texts)
-        return embeddings.tolist()
-
-    def ingest_file(self, file_path: str):
-        """Reads a PDF, chunks it, and saves to Vector DB in batches"""
-        print(f"📄 Processing: {file_path}")
-        
-        # A. Extract Text
-        try:
-            reader = PdfReader(file_path)
-            text = ""
-            for page in reader.pages:
-                if page.extract_text():
-                    text += page.extract_text() + "\n"
-        except Exception as e:
-            print(f"❌ Error reading PDF: {e}")
-            return
-
-        # B. Smart Chunking
-        splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1000,
-            chunk_overlap=200,
-            separators=["\n\n", "\n", ".", "!", "?", " ", ""]
-        )
-        chunks = splitter.split_text(text)
-        print(f"🧠 Found {len(chunks)} chunks. Starting batch ingestion...")
-        
-        # C. Embed & Save in Batches
-        batch_size = 5000  # Safe limit for ChromaDB
-        total_chunks = len(chunks)
-        
-        for i in range(0, total_chunks, batch_size):
-            batch_end = min(i + batch_size, total_chunks)
-            batch_chunks = chunks[i:batch_end]
-            
-            print(f"   ↳ Embedding batch {i} to {batch_end}...")
-            embeddings = self._get_embeddings(batch_chunks)
-            
-            # Create unique IDs
-            base_name = os.path.basename(file_path)
-            ids = [f"{base_name}_{j}" for j in range(i, batch_end)]
-            metadatas = [{"source": base_name} for _ in range(len(batch_chunks))]
-            
-            self.collection.add(
-                ids=ids,
-                documents=batch_chunks,
-                embeddings=embeddings,
-                metadatas=metadatas
-            )
-            
-        print("✅ Ingestion Complete")
-
-    def search(self, query: str, k=3):
-        """Retrieves the top K most relevant text chunks"""
-        query_embedding = self._get_embeddings(query)
-        
-        results = self.collection.query(
-            query_embeddings=query_embedding,
-            n_results=k
-        )
-        
-        if not results['documents'] or len(results['documents'][0]) == 0:
-            return []
-            
-        return results['documents'][0]
-
-# Singleton Instance
-rag_service = RAGService()
\ No newline at end of file
+# File: backend/app/services/rag_service.py
+import os
+import time
+from backend.app.core import config
+from backend.app.core.lazy import LazyService
+from backend.app.core.metrics import span, RAG_ROUTES
+from backend.app.services.embedding_batcher import EmbeddingBatcher
+from backend.app.services.model_client import model_client
+from backend.app.services.bm25_index import BM25Index, reciprocal_rank_fusion
+from backend.app.services.domain_router import route, tag_chunks
+from backend.app.services.vector_store import make_vector_store
+from backend.app.services.pdf_chunker import file_sha256, iter_pages, iter_chunks
+
+# CONFIG
+PDF_STORAGE_PATH = "backend/data/medical_pdfs"
+CHROMA_PATH = "backend/data/chromadb"
+EMBED_MODEL_NAME = "all-MiniLM-L6-v2"
+# Touched after every ingest so other processes (API server caches) can see the collection changed
+VERSION_FILE = os.path.join(CHROMA_PATH, "curacore_version")
+
+class RAGService:
+    def __init__(self):
+        # 1. Initialize Embedding Model, or use the shared one in the model server (run.py --workers)
+        if model_client is not None:
+            self.embed_model = None
+            encode_queries, self._encode_documents = model_client.encode_queries, model_client.encode_documents
+        else:
+            # Heavy imports live here so importing this module stays cheap
+            from sentence_transformers import SentenceTransformer
+            self.embed_model = SentenceTransformer(EMBED_MODEL_NAME)
+            encode_queries = self._encode_documents = self.embed_model.encode
+
+        # Concurrent query embeds are coalesced into one batched encode (one round trip when remote)
+        self.query_batcher = EmbeddingBatcher(
+            encode_queries,
+            max_batch_size=config.EMBED_BATCH_MAX_SIZE,
+            max_wait_ms=config.EMBED_BATCH_MAX_WAIT_MS,
+            cache_size=config.EMBED_CACHE_SIZE,
+        )
+        
+        # 2. Connect to the vector store (Chroma, or the quantized mmap store)
+        self.store = make_vector_store(chroma_path=CHROMA_PATH)
+
+        # 3. Lexical (BM25) index over the same chunk IDs, for exact drug names / codes
+        self.bm25 = BM25Index()
+        self.bm25.load()
+        self._bm25_version = self.data_version()
+
+    def _get_embeddings(self, texts):
+        """Helper to get embeddings list"""
+        if isinstance(texts, str):
+            texts = [texts]
+        with span("rag_embed_documents"):
+            embeddings = self._encode_documents(texts)
+        return embeddings.tolist()
+
+    def embed_query(self, query: str):
+        """Embedding of a single search query, micro-batched with other concurrent requests"""
+        with span("rag_embed_query"):
+            return self.query_batcher.embed(query)
+
+    def commit(self):
+        """Persists the lexical index and tells other processes the collection changed"""
+        self.store.flush()
+        self.bm25.save()
+        self._bump_version()
+        self._bm25_version = self.data_version()
+
+    def _bump_version(self):
+        """Marks the collection as changed"""
+        os.makedirs(CHROMA_PATH, exist_ok=True)
+        with open(VERSION_FILE, "w") as f:
+            f.write(str(time.time_ns()))
+
+    def data_version(self):
+        """Cheap fingerprint of the collection contents, changes whenever it is re-ingested"""
+        try:
+            return os.stat(VERSION_FILE).st_mtime_ns
+        except FileNotFoundError:
+            return 0
+
+    @staticmethod
+    def chunk_ids(source: str, sha256: str, start: int, end: int):
+        """Chunk IDs carry a content hash prefix, so a changed file never collides with its old chunks"""
+        return [f"{source}_{sha256[:12]}_{j}" for j in range(start, end)]
+
+    def add_chunks(self, ids: list, chunks: list, metadatas: list, embeddings: list = None):
+        """Embeds (unless given) and writes one batch of chunks"""
+        if embeddings is None:
+            embeddings = self._get_embeddings(chunks)
+        self.store.add(ids, chunks, embeddings, metadatas)
+        self.bm25.add(ids, chunks, [meta["source"] for meta in metadatas])
+
+    def delete_source(self, source: str, keep_ids=None):
+        """
+        Removes every chunk that came from one file, from both indexes. With
+        `keep_ids` (the ids of a version just written) only the older chunks go.
+        """
+        keep_ids = set(keep_ids) if keep_ids else None
+        self.store.delete_source(source, keep_ids)
+        self.bm25.remove_source(source, keep_ids)
+
+    def delete_chunks(self, ids: list):
+        self.store.delete(ids)
+        self.bm25.remove(ids)
+
+    def rebuild_lexical_index(self, page_size: int = 5000):
+        """Rebuilds BM25 from what is already in the vector store (e.g. a store ingested before BM25 existed)"""
+        self.bm25 = BM25Index(self.bm25.path)
+        for ids, documents, metadatas in self.store.iter_all(page_size):
+            self.bm25.add(ids, documents, [meta["source"] for meta in metadatas])
+        self.commit()
+        return len(self.bm25)
+
+    def ingest_file(self, file_path: str, batch_size: int = 256):
+        """
+        Streams a PDF into the Vector DB: pages are extracted lazily, chunked across
+        page boundaries, and embedded + written every `batch_size` chunks, so memory
+        stays flat no matter how big the book is. Returns {"source", "sha256", "chunks"}.
+        The new version is written next to the old one (chunk IDs carry the content
+        hash) and the old one is only removed once it is complete: a PDF that fails
+        half way leaves the previous version searchable. Returns None on failure.
+        """
+        print(f"📄 Processing: {file_path}")
+        base_name = os.path.basename(file_path)
+        old_ids = set(self.bm25.source_docs.get(base_name, ()))
+        new_ids = []
+
+        try:
+            sha256 = file_sha256(file_path)
+
+            # A. Extract -> Chunk -> Embed & Save, one batch at a time
+            batch_chunks, batch_pages = [], []
+            for chunk, page_number in iter_chunks(iter_pages(file_path)):
+                batch_chunks.append(chunk)
+                batch_pages.append(page_number)
+                if len(batch_chunks) >= batch_size:
+                    new_ids += self._write_batch(base_name, sha256, len(new_ids), batch_chunks, batch_pages)
+                    batch_chunks, batch_pages = [], []
+
+            if batch_chunks:
+                new_ids += self._write_batch(base_name, sha256, len(new_ids), batch_chunks, batch_pages)
+        except Exception as e:
+            print(f"❌ Error reading PDF: {e}")
+            # Drop the partial new version; IDs shared with the old one (same content) stay
+            self.delete_chunks([i for i in new_ids if i not in old_ids])
+            self.commit()
+            return None
+
+        # B. Complete: now replace the previous version
+        written = len(new_ids)
+        self.delete_source(base_name, keep_ids=new_ids)
+        self.commit()
+        print(f"✅ Ingestion Complete ({written} chunks)")
+        return {"source": base_name, "sha256": sha256, "chunks": written}
+
+    def _write_batch(self, source: str, sha256: str, start: int, chunks: list, pages: list):
+        print(f"   ↳ Embedding batch {start} to {start + len(chunks)}...")
+        ids = self.chunk_ids(source, sha256, start, start + len(chunks))
+        domains = tag_chunks(source, chunks)
+        metadatas = [{"source": source, "page": page, "domain": domain} for page, domain in zip(pages, domains)]
+        self.add_chunks(ids, chunks, metadatas)
+        return ids
+
+    def search(self, query: str, k=3, specialty: str = None, with_scores: bool = False):
+        """Retrieves the top K most relevant text chunks"""
+        query_embedding = self.embed_query(query)
+        return self.search_by_embedding(query_embedding, k, query_text=query, specialty=specialty, with_scores=with_scores)
+
+    def search_by_embedding(self, query_embedding: list, k=3, query_text: str = None, specialty: str = None,
+                            with_scores: bool = False):
+        """
+        Same as search, for callers that already embedded the query.
+        With `query_text` (and hybrid search on) the vector hits are fused with BM25 hits.
+        `specialty` (a Doctor.specialization) or the query text itself picks the partitions searched.
+        With `with_scores` returns (documents, scores, lexical): the cosine similarity of
+        each document to the query (None for chunks only BM25 found) and the share of
+        the query's terms it contains (BM25Index.coverage; None without hybrid search).
+        """
+        with span("rag_search"):
+            self._refresh_indexes()
+            domains = route(query_text, specialty) if config.ROUTING_ENABLED else None
+            if query_text is None or not config.HYBRID_SEARCH_ENABLED:
+                _, documents, scores, _ = self._vector_search(query_embedding, k, domains)
+                lexical = [None] * len(documents)
+            else:
+                documents, scores, lexical = self._hybrid_search(query_embedding, query_text, k, domains)
+        return (documents, scores, lexical) if with_scores else documents
+
+    def _vector_search(self, query_embedding: list, k: int, domains: list = None):
+        """
+        Returns (ids, documents, scores, domains) best first. A routed search that comes back
+        empty or weak (best cosine under ROUTING_MIN_SCORE) is redone over every
+        partition; the returned domains are None in that case.
+        """
+        with span("rag_vector_query"):
+            if domains:
+                ids, documents, scores = self.store.query(query_embedding, k, domains)
+                if ids and scores[0] >= config.ROUTING_MIN_SCORE:
+                    RAG_ROUTES.inc(domain=domains[0], outcome="routed")
+                    return ids, documents, scores, domains
+                RAG_ROUTES.inc(domain=domains[0], outcome="fallback")
+            else:
+                RAG_ROUTES.inc(domain="all", outcome="global")
+            ids, documents, scores = self.store.query(query_embedding, k)
+        return ids, documents, scores, None
+
+    def _refresh_indexes(self):
+        """Picks up indexes rewritten by ingest_pdfs.py in another process"""
+        version = self.data_version()
+        if version != self._bm25_version:
+            self.store.refresh()
+            self.bm25.load()
+            self._bm25_version = version
+
+    def _hybrid_search(self, query_embedding: list, query_text: str, k: int, domains: list = None):
+        """Reciprocal-rank fusion of vector and BM25 candidates, returns (documents, cosine scores, lexical coverage)"""
+        candidates = max(k, config.HYBRID_CANDIDATES)
+        vector_ids, vector_docs, vector_scores, domains = self._vector_search(query_embedding, candidates, domains)
+
+        with span("rag_bm25_query"):
+            lexical_ids = [doc_id for doc_id, _ in self.bm25.search(query_text, candidates)]
+
+        # BM25 is global and BM25-only hits have no text yet: fetch them from the
+        # searched partitions before fusing, so out-of-partition hits never take a slot
+        docs = dict(zip(vector_ids, vector_docs))
+        missing = [doc_id for doc_id in lexical_ids if doc_id not in docs]
+        if missing:
+            with span("rag_fetch_documents"):
+                fetched_ids, fetched_docs = self.store.get(missing, domains)
+            docs.update(zip(fetched_ids, fetched_docs))
+        lexical_ids = [doc_id for doc_id in lexical_ids if doc_id in docs]
+
+        fused_ids = reciprocal_rank_fusion([vector_ids, lexical_ids], k=config.RRF_K)[:k]
+        scores = dict(zip(vector_ids, vector_scores))
+        lexical = [self.bm25.coverage(query_text, doc_id) for doc_id in fused_ids]
+        return [docs[doc_id] for doc_id in fused_ids], [scores.get(doc_id) for doc_id in fused_ids], lexical
+
+# Singleton Instance (built on first use, see core/lazy.py)
+rag_service = LazyService("rag", RAGService)
\ No newline at end of file
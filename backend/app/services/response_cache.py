@@ -0,0 +1,55 @@
+# File: backend/app/services/response_cache.py
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+class ResponseCache:
+    """
+    In-process cache of encoded JSON bodies + their ETag, keyed by request params.
+    `invalidate()` (wired to ORM change events) drops everything at once; a TTL
+    covers writes made by other processes that fire no events here.
+    """
+    def __init__(self, ttl_seconds=300, max_entries=256):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (body, etag, created)
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_etag(body: bytes):
+        return '"' + hashlib.sha1(body).hexdigest() + '"'
+
+    def get_or_build(self, key, build):
+        """Returns (body, etag); `build()` must return the encoded body bytes"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and time.monotonic() - entry[2] < self.ttl_seconds:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0], entry[1]
+            self.misses += 1
+            generation = self._generation
+
+        body = build()
+        etag = self.make_etag(body)
+
+        with self._lock:
+            # Don't store a body built from data that changed while we were building it
+            if generation == self._generation:
+                self._entries[key] = (body, etag, time.monotonic())
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return body, etag
+
+    def invalidate(self, *args):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self):
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
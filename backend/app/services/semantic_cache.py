@@ -0,0 +1,158 @@
+# File: backend/app/services/semantic_cache.py
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+from backend.app.core import config
+
+class SemanticCache:
+    """
+    Caches chat answers keyed on the query embedding.
+    A new query hits if its cosine similarity to a cached query is above `threshold`
+    and both were asked in the same `scope` (e.g. the specialty retrieval was routed to).
+    Entries are evicted LRU-first when over `max_entries` / `max_bytes`, expire after
+    `ttl_seconds`, and are all dropped when the vector store's data version changes.
+    """
+    def __init__(self, threshold=0.92, max_entries=1000, max_bytes=32 * 1024 * 1024, ttl_seconds=6 * 60 * 60):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+
+        self._entries = OrderedDict()  # key -> dict(vector, reply, sources, created, size)
+        self._lock = threading.Lock()
+        self._next_key = 0
+        self._bytes = 0
+        self._data_version = None
+
+        # Lazily rebuilt matrix of all cached (normalised) query vectors
+        self._matrix = None
+        self._matrix_keys = []
+        self._matrix_scopes = []
+
+        # Counters for tuning the threshold against real traffic
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def _normalise(embedding):
+        vec = np.asarray(embedding, dtype=np.float32).ravel()
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm else vec
+
+    @staticmethod
+    def _entry_size(vector, reply, sources):
+        return vector.nbytes + len(reply.encode("utf-8")) + sum(len(s.encode("utf-8")) for s in sources)
+
+    def _check_version(self, data_version):
+        """Drops everything if the collection changed since the entries were cached"""
+        if data_version != self._data_version:
+            if self._entries:
+                self.invalidations += 1
+            self._clear()
+            self._data_version = data_version
+
+    def _clear(self):
+        self._entries.clear()
+        self._bytes = 0
+        self._matrix = None
+        self._matrix_keys = []
+        self._matrix_scopes = []
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self._bytes -= entry["size"]
+        self._matrix = None
+
+    def _expire(self, now):
+        expired = [key for key, entry in self._entries.items() if now - entry["created"] > self.ttl_seconds]
+        for key in expired:
+            self._remove(key)
+            self.evictions += 1
+
+    def lookup(self, embedding, data_version=None, scope=None):
+        """Returns {"reply", "sources", "similarity"} for a close-enough cached query, else None"""
+        vector = self._normalise(embedding)
+        with self._lock:
+            self._check_version(data_version)
+            self._expire(time.monotonic())
+
+            if not self._entries:
+                self.misses += 1
+                return None
+
+            if self._matrix is None:
+                self._matrix_keys = list(self._entries.keys())
+                self._matrix = np.stack([self._entries[k]["vector"] for k in self._matrix_keys])
+                self._matrix_scopes = [self._entries[k]["scope"] for k in self._matrix_keys]
+
+            scores = self._matrix @ vector
+            scores[[n for n, entry_scope in enumerate(self._matrix_scopes) if entry_scope != scope]] = -np.inf
+            best = int(np.argmax(scores))
+            similarity = float(scores[best])
+            if similarity < self.threshold:
+                self.misses += 1
+                return None
+
+            key = self._matrix_keys[best]
+            self._entries.move_to_end(key)  # LRU touch
+            self.hits += 1
+            entry = self._entries[key]
+            return {"reply": entry["reply"], "sources": entry["sources"], "similarity": similarity}
+
+    def store(self, embedding, reply: str, sources: list, data_version=None, scope=None):
+        vector = self._normalise(embedding)
+        size = self._entry_size(vector, reply, sources)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            self._check_version(data_version)
+            key = self._next_key
+            self._next_key += 1
+            self._entries[key] = {
+                "vector": vector,
+                "reply": reply,
+                "sources": list(sources),
+                "scope": scope,
+                "created": time.monotonic(),
+                "size": size,
+            }
+            self._bytes += size
+            self._matrix = None
+
+            # Evict least recently used until within bounds
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self):
+        with self._lock:
+            if self._entries:
+                self.invalidations += 1
+            self._clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": config.SEMANTIC_CACHE_ENABLED,
+                "threshold": self.threshold,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+# Singleton Instance
+semantic_cache = SemanticCache(
+    threshold=config.SEMANTIC_CACHE_THRESHOLD,
+    max_entries=config.SEMANTIC_CACHE_MAX_ENTRIES,
+    max_bytes=config.SEMANTIC_CACHE_MAX_BYTES,
+    ttl_seconds=config.SEMANTIC_CACHE_TTL_SECONDS,
+)
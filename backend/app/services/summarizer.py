@@ -1,28 +1,67 @@
-# File: backend/app/services/summarizer.py
-import ollama
-
-def generate_summary(chat_history: str):
-    """
-    Condenses a long chat into a medical summary for the doctor.
-    """
-    prompt = f"""
-    You are a medical assistant. Summarize the following patient-AI conversation for a doctor.
-    
-    FORMAT:
-    - **Symptoms:** [List main symptoms]
-    - **Duration:** [How long they have had it]
-    - **Potential Concerns:** [Key medical terms found]
-    - **Recommended Specialist:** [e.g. Cardiologist, Dermatologist]
-
-    CHAT HISTORY:
-    {chat_history}
-    """
-    
-    try:
-        response = ollama.chat(
-            model="llama3:8b-instruct-q4_K_M",
-            messages=[{'role': 'user', 'content': prompt}]
-        )
-        return response['message']['content']
-    except Exception as e:
-        return "Summary generation failed."
\ No newline at end of file
+# File: backend/app/services/summarizer.py
+from backend.app.core.metrics import span
+from backend.app.services.ollama_client import ollama_pool
+
+SUMMARY_MODEL = "llama3:8b-instruct-q4_K_M"
+SUMMARY_PROMPT_VERSION = 1  # Bump when SUMMARY_FORMAT / the prompts change
+# Stored with every summary; regenerate_summaries.py re-does rows with any other value
+SUMMARY_VERSION = f"{SUMMARY_MODEL}@{SUMMARY_PROMPT_VERSION}"
+
+SUMMARY_FORMAT = """
+    FORMAT:
+    - **Symptoms:** [List main symptoms]
+    - **Duration:** [How long they have had it]
+    - **Potential Concerns:** [Key medical terms found]
+    - **Recommended Specialist:** [e.g. Cardiologist, Dermatologist]
+"""
+
+SPEAKERS = {"user": "Patient", "assistant": "CuraCore"}
+
+def _complete(prompt: str, strict: bool):
+    try:
+        with span("summary_generate"):
+            response = ollama_pool.chat_sync(
+                SUMMARY_MODEL,
+                [{'role': 'user', 'content': prompt}]
+            )
+        return response['message']['content']
+    except Exception as e:
+        if strict:
+            raise
+        return "Summary generation failed."
+
+def generate_summary(chat_history: str, strict: bool = False):
+    """
+    Condenses a long chat into a medical summary for the doctor.
+    With strict=True errors are raised instead of returned as text (used by the job queue to retry).
+    """
+    prompt = f"""
+    You are a medical assistant. Summarize the following patient-AI conversation for a doctor.
+    {SUMMARY_FORMAT}
+    CHAT HISTORY:
+    {chat_history}
+    """
+    return _complete(prompt, strict)
+
+def update_summary(previous_summary: str, new_messages: list, strict: bool = False):
+    """
+    Rolling summary: folds only the messages since the last update into the
+    existing summary, so the cost of a turn doesn't grow with the conversation.
+    `new_messages` is a list of (role, content).
+    """
+    transcript = "\n".join(f"{SPEAKERS.get(role, role)}: {content}" for role, content in new_messages)
+    if not previous_summary:
+        return generate_summary(transcript, strict)
+
+    prompt = f"""
+    You are a medical assistant keeping a running summary of a patient-AI conversation for a doctor.
+    Update the CURRENT SUMMARY with the NEW MESSAGES. Keep every earlier finding unless the
+    patient corrected it, and answer in the same format.
+    {SUMMARY_FORMAT}
+    CURRENT SUMMARY:
+    {previous_summary}
+
+    NEW MESSAGES:
+    {transcript}
+    """
+    return _complete(prompt, strict)
@@ -0,0 +1,166 @@
+# File: backend/app/services/summary_backfill.py
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from sqlalchemy import or_
+from backend.app.core.database import SessionLocal
+from backend.app.models.appointments import Appointment
+from backend.app.services.chat_sessions import chat_sessions
+from backend.app.services.summarizer import generate_summary, SPEAKERS, SUMMARY_VERSION
+
+# CONFIG
+CHECKPOINT_PATH = "backend/data/summary_backfill.json"
+DEFAULT_BATCH_SIZE = 50  # Rows per page: summarised concurrently, then written in one bulk update
+DEFAULT_CONCURRENCY = 2  # Ollama's per-model limit (CURACORE_OLLAMA_MODEL_CONCURRENCY) still applies
+
+class BackfillCheckpoint:
+    """
+    Last appointment id whose whole page was written, per filter. A rerun with the
+    same filter and summary version continues after it; any other run starts over.
+    """
+    def __init__(self, path=CHECKPOINT_PATH):
+        self.path = path
+        self.runs = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.runs = json.load(f).get("runs", {})
+
+    def get(self, key: str):
+        return self.runs.get(key)
+
+    def record(self, key: str, last_id: int, stats: dict):
+        self.runs[key] = {"last_id": last_id, "stats": stats, "updated_at": time.time()}
+        self.save()
+
+    def clear(self, key: str):
+        if self.runs.pop(key, None) is not None:
+            self.save()
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"runs": self.runs}, f, indent=1)
+        os.replace(tmp_path, self.path)
+
+def _filter_key(filters: dict):
+    payload = json.dumps({**filters, "version": SUMMARY_VERSION}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+def _apply_filters(query, statuses=None, since: datetime = None, until: datetime = None,
+                   doctor_id: int = None, only_missing: bool = False, force: bool = False):
+    # Rows the live summary queue owns right now are left alone
+    query = query.filter(or_(Appointment.summary_status.is_(None),
+                             Appointment.summary_status.notin_(["pending", "running"])))
+    if statuses:
+        query = query.filter(Appointment.status.in_(statuses))
+    if since:
+        query = query.filter(Appointment.appointment_date >= since)
+    if until:
+        query = query.filter(Appointment.appointment_date < until)
+    if doctor_id:
+        query = query.filter(Appointment.doctor_id == doctor_id)
+    if only_missing:
+        query = query.filter(or_(Appointment.ai_summary.is_(None), Appointment.ai_summary == ""))
+    elif not force:
+        query = query.filter(or_(Appointment.summary_version.is_(None), Appointment.summary_version != SUMMARY_VERSION))
+    return query
+
+def _summarise(row):
+    """(appointment id, summary or None, error or None); chat-linked rows are re-summarised from the transcript"""
+    appt_id, symptoms, session_id = row
+    try:
+        source = symptoms or ""
+        if session_id:
+            messages = chat_sessions.messages(session_id)
+            if messages:
+                source = "\n".join(f"{SPEAKERS.get(m['role'], m['role'])}: {m['content']}" for m in messages)
+        return appt_id, generate_summary(source, strict=True), None
+    except Exception as e:
+        return appt_id, None, str(e)
+
+def run_backfill(statuses=None, since: datetime = None, until: datetime = None, doctor_id: int = None,
+                 only_missing: bool = False, force: bool = False, limit: int = None,
+                 batch_size: int = DEFAULT_BATCH_SIZE, concurrency: int = DEFAULT_CONCURRENCY,
+                 checkpoint_path: str = CHECKPOINT_PATH, restart: bool = False, dry_run: bool = False):
+    """
+    Regenerates appointments.ai_summary for every row matching the filters.
+    By default only rows written by another SUMMARY_VERSION (or never) are touched;
+    `only_missing` narrows to rows without a summary, `force` widens to all matches.
+    Rows are walked in id order one page at a time: the page is summarised with
+    `concurrency` parallel requests, written back in one bulk update, then checkpointed.
+    """
+    filters = dict(statuses=sorted(statuses or []), since=since, until=until, doctor_id=doctor_id,
+                   only_missing=only_missing, force=force)
+    key = _filter_key(filters)
+    checkpoint = BackfillCheckpoint(checkpoint_path)
+    if restart:
+        checkpoint.clear(key)
+    resumed = checkpoint.get(key)
+    last_id = resumed["last_id"] if resumed else 0
+    stats = dict(resumed["stats"]) if resumed else {"updated": 0, "failed": 0}
+
+    db = SessionLocal()
+    try:
+        total = _apply_filters(db.query(Appointment.id), **filters).filter(Appointment.id > last_id).count()
+    finally:
+        db.close()
+    if limit:
+        total = min(total, limit)
+    if resumed:
+        print(f"🔁 Resuming after appointment {last_id} ({stats['updated']} already updated)")
+    print(f"🗂️ {total} appointments to summarise with {SUMMARY_VERSION}")
+    if dry_run or total == 0:
+        return {**stats, "pending": total, "seconds": 0.0, "per_minute": 0.0}
+
+    started = time.perf_counter()
+    processed = 0
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="backfill") as pool:
+        while processed < total:
+            db = SessionLocal()
+            try:
+                page = _apply_filters(
+                    db.query(Appointment.id, Appointment.symptoms, Appointment.chat_session_id), **filters
+                ).filter(Appointment.id > last_id)\
+                    .order_by(Appointment.id)\
+                    .limit(min(batch_size, total - processed))\
+                    .all()
+                if not page:
+                    break
+
+                results = list(pool.map(_summarise, page))
+                written_at = datetime.utcnow()
+                updates = [
+                    {"id": appt_id, "ai_summary": summary, "summary_version": SUMMARY_VERSION,
+                     "summary_status": "done", "summary_error": None}
+                    for appt_id, summary, error in results if error is None
+                ]
+                failures = [
+                    {"id": appt_id, "summary_error": f"backfill {written_at:%Y-%m-%d %H:%M}: {error}"}
+                    for appt_id, summary, error in results if error is not None
+                ]
+                db.bulk_update_mappings(Appointment, updates + failures)
+                db.commit()
+            finally:
+                db.close()
+
+            processed += len(page)
+            last_id = page[-1].id
+            stats["updated"] += len(updates)
+            stats["failed"] += len(failures)
+            checkpoint.record(key, last_id, stats)
+
+            elapsed = time.perf_counter() - started
+            rate = processed / elapsed if elapsed else 0.0
+            eta = (total - processed) / rate if rate else 0.0
+            print(f"   ↳ {processed}/{total} | {rate * 60:.1f} summaries/min | "
+                  f"{len(failures)} failed in batch | ETA {eta:.0f}s")
+
+    # Finished: the next run with this filter starts fresh (and finds nothing stale)
+    checkpoint.clear(key)
+    elapsed = time.perf_counter() - started
+    return {**stats, "pending": 0, "seconds": round(elapsed, 2),
+            "per_minute": round(processed / elapsed * 60, 1) if elapsed else 0.0}
@@ -0,0 +1,162 @@
+# File: backend/app/services/summary_queue.py
+import queue
+import threading
+from backend.app.core import config
+from backend.app.core.database import SessionLocal
+from backend.app.models.appointments import Appointment
+from backend.app.services.summarizer import generate_summary, SUMMARY_VERSION
+from backend.app.services.chat_sessions import chat_sessions
+
+class SummaryQueue:
+    """
+    Generates appointment summaries in the background.
+    The appointments table IS the durable queue: rows are created with
+    summary_status="pending", and on start-up every pending/interrupted row is
+    re-queued, so jobs survive restarts. `workers` threads bound how many
+    generations hit Ollama at once; failures are retried with exponential backoff.
+    """
+    def __init__(self, workers=1, max_attempts=3, retry_backoff_seconds=5):
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self._queue = queue.Queue()
+        self._threads = []
+        self._timers = set()
+        self._stop = threading.Event()
+
+    def start(self):
+        if self._threads:
+            return
+        self._stop.clear()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f"summary-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        self.resume()
+
+    def stop(self):
+        self._stop.set()
+        for timer in list(self._timers):
+            timer.cancel()
+        for thread in self._threads:
+            thread.join(timeout=5)
+        self._threads = []
+
+    @staticmethod
+    def reset_interrupted():
+        """Jobs left "running" by the last shutdown go back to pending"""
+        db = SessionLocal()
+        try:
+            reset = db.query(Appointment)\
+                .filter(Appointment.summary_status == "running")\
+                .update({"summary_status": "pending"}, synchronize_session=False)
+            db.commit()
+            return reset
+        finally:
+            db.close()
+
+    def resume(self):
+        """
+        Re-queues jobs left pending or interrupted mid-run by the last shutdown.
+        With several API workers run.py resets interrupted jobs once before they
+        start (SUMMARY_RESET_RUNNING off), so no worker resets a job another one is
+        running; the atomic claim keeps each pending job to one worker.
+        """
+        if config.SUMMARY_RESET_RUNNING:
+            self.reset_interrupted()
+        db = SessionLocal()
+        try:
+            pending = db.query(Appointment.id)\
+                .filter(Appointment.summary_status == "pending")\
+                .order_by(Appointment.id)\
+                .all()
+        finally:
+            db.close()
+
+        for (appt_id,) in pending:
+            self.enqueue(appt_id)
+        if pending:
+            print(f"🔁 Resumed {len(pending)} pending summary jobs")
+
+    def enqueue(self, appt_id: int):
+        self._queue.put(appt_id)
+
+    def depth(self):
+        return self._queue.qsize()
+
+    def _worker(self):
+        while not self._stop.is_set():
+            try:
+                appt_id = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            try:
+                self._process(appt_id)
+            except Exception as e:
+                print(f"❌ Summary job {appt_id} crashed: {e}")
+
+    def _claim(self, db, appt_id: int):
+        """Atomically moves pending -> running, so a job is never run twice"""
+        claimed = db.query(Appointment)\
+            .filter(Appointment.id == appt_id)\
+            .filter(Appointment.summary_status == "pending")\
+            .update({
+                "summary_status": "running",
+                "summary_attempts": Appointment.summary_attempts + 1,
+            }, synchronize_session=False)
+        db.commit()
+        return claimed == 1
+
+    def _process(self, appt_id: int):
+        db = SessionLocal()
+        try:
+            if not self._claim(db, appt_id):
+                return
+            appt = db.query(Appointment).filter(Appointment.id == appt_id).first()
+
+            print(f"🧠 Generating medical summary for appointment {appt_id}...")
+            try:
+                if appt.chat_session_id:
+                    # Only the chat messages not yet in its rolling summary are summarised
+                    summary = chat_sessions.refresh_summary(appt.chat_session_id, strict=True) or \
+                        generate_summary(appt.symptoms, strict=True)
+                else:
+                    summary = generate_summary(appt.symptoms, strict=True)
+            except Exception as e:
+                appt.summary_error = str(e)
+                if (appt.summary_attempts or 0) < self.max_attempts:
+                    appt.summary_status = "pending"
+                    db.commit()
+                    self._retry_later(appt_id, appt.summary_attempts)
+                else:
+                    appt.summary_status = "failed"
+                    db.commit()
+                    print(f"❌ Summary for appointment {appt_id} failed after {appt.summary_attempts} attempts")
+                return
+
+            appt.ai_summary = summary
+            appt.summary_version = SUMMARY_VERSION
+            appt.summary_status = "done"
+            appt.summary_error = None
+            db.commit()
+        finally:
+            db.close()
+
+    def _retry_later(self, appt_id: int, attempts: int):
+        delay = self.retry_backoff_seconds * (2 ** max(attempts - 1, 0))
+
+        def fire():
+            self._timers.discard(timer)
+            self.enqueue(appt_id)
+
+        timer = threading.Timer(delay, fire)
+        timer.daemon = True
+        self._timers.add(timer)
+        timer.start()
+
+# Singleton
+summary_queue = SummaryQueue(
+    workers=config.SUMMARY_WORKERS,
+    max_attempts=config.SUMMARY_MAX_ATTEMPTS,
+    retry_backoff_seconds=config.SUMMARY_RETRY_BACKOFF_SECONDS,
+)
@@ -0,0 +1,50 @@
+# File: backend/app/services/transcription_pool.py
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from backend.app.core import config
+from backend.app.core.errors import PoolFullError
+
+class TranscriptionPool:
+    """
+    Dedicated worker threads for Whisper, so transcription never runs on the
+    event loop. At most `workers` jobs run at once and `queue_depth` more may
+    wait; anything beyond that is rejected immediately instead of piling up.
+    """
+    def __init__(self, workers=1, queue_depth=4):
+        self.workers = workers
+        self.queue_depth = queue_depth
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="whisper")
+        self._slots = threading.BoundedSemaphore(workers + queue_depth)
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise PoolFullError()
+        with self._lock:
+            self._in_flight += 1
+        try:
+            future = self._executor.submit(fn, *args)
+        except Exception:
+            self._release()
+            raise
+        future.add_done_callback(lambda _: self._release())
+        return future
+
+    def _release(self):
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+    def in_flight(self):
+        """Running + waiting jobs"""
+        return self._in_flight
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+# Singleton
+transcription_pool = TranscriptionPool(
+    workers=config.TRANSCRIBE_WORKERS,
+    queue_depth=config.TRANSCRIBE_QUEUE_DEPTH,
+)
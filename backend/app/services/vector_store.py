@@ -0,0 +1,526 @@
+# File: backend/app/services/vector_store.py
+import os
+import sqlite3
+import threading
+import numpy as np
+from backend.app.core import config
+from backend.app.services.domain_router import GENERAL
+
+class VectorStore:
+    """
+    What RAGService needs from a vector backend. Scores returned by `query`
+    are cosine similarities (higher is better) whatever the backend's metric.
+    """
+    name = None
+
+    def add(self, ids: list, documents: list, embeddings: list, metadatas: list):
+        raise NotImplementedError
+
+    def delete_source(self, source: str, keep_ids=None):
+        """Removes one file's chunks, except `keep_ids` (its newly written version)"""
+        raise NotImplementedError
+
+    def delete(self, ids: list):
+        raise NotImplementedError
+
+    def query(self, embedding: list, k: int):
+        """Returns (ids, documents, scores), best first"""
+        raise NotImplementedError
+
+    def get(self, ids: list):
+        """Returns (ids, documents) for the ids that exist"""
+        raise NotImplementedError
+
+    def iter_all(self, page_size: int = 5000):
+        """Yields (ids, documents, metadatas) pages over every stored chunk"""
+        raise NotImplementedError
+
+    def count(self):
+        raise NotImplementedError
+
+    def refresh(self):
+        """Picks up writes made by another process (ingest_pdfs.py)"""
+
+    def flush(self):
+        """Persists pending writes; called from RAGService.commit()"""
+
+class ChromaVectorStore(VectorStore):
+    """The original backend: Chroma PersistentClient, float32 vectors in an HNSW index"""
+    name = "chroma"
+
+    def __init__(self, path, collection_name="medical_docs", client=None):
+        if client is None:
+            import chromadb
+            client = chromadb.PersistentClient(path=path)
+        self.client = client
+        self.collection = self.client.get_or_create_collection(name=collection_name)
+
+    def add(self, ids, documents, embeddings, metadatas):
+        self.collection.add(ids=ids, documents=documents, embeddings=embeddings, metadatas=metadatas)
+
+    def delete_source(self, source, keep_ids=None):
+        if not keep_ids:
+            self.collection.delete(where={"source": source})
+            return
+        existing = self.collection.get(where={"source": source}, include=[])["ids"]
+        self.delete([i for i in existing if i not in keep_ids])
+
+    def delete(self, ids):
+        if ids:
+            self.collection.delete(ids=list(ids))
+
+    def query(self, embedding, k):
+        results = self.collection.query(
+            query_embeddings=[embedding],
+            n_results=k,
+            include=["documents", "distances"],
+        )
+        if not results['documents'] or len(results['documents'][0]) == 0:
+            return [], [], []
+        # Default space is squared L2; MiniLM vectors are unit length, so cos = 1 - d / 2
+        scores = [1.0 - distance / 2 for distance in results['distances'][0]]
+        return results['ids'][0], results['documents'][0], scores
+
+    def get(self, ids):
+        fetched = self.collection.get(ids=ids)
+        return fetched['ids'], fetched['documents']
+
+    def iter_all(self, page_size=5000):
+        offset = 0
+        while True:
+            page = self.collection.get(include=["documents", "metadatas"], limit=page_size, offset=offset)
+            if not page['ids']:
+                return
+            yield page['ids'], page['documents'], page['metadatas']
+            offset += len(page['ids'])
+
+    def count(self):
+        return self.collection.count()
+
+class QuantizedVectorStore(VectorStore):
+    """
+    Compact store for small servers. Unit-normalised vectors are kept twice,
+    append-only and memory-mapped:
+    - quantized (int8 with a per-row scale, or float16), scanned for every
+      query with blocked NumPy matrix-vector products,
+    - float32, of which only the top `k * rescore_factor` candidate rows are
+      read (with pread, not mmap: fault-around would map 64 KB per row and
+      eventually the whole file) to rescore them exactly.
+    Chunk text, ids and metadata live in a small SQLite file, so nothing but
+    the mmap'd pages a query touches has to be resident, and cold start is
+    just opening three files. Deleted rows are tombstoned and dropped by compact(),
+    which writes the surviving rows to files of the next generation and switches
+    the generation in the same SQLite commit that renumbers the rows. Readers check
+    the generation on every query, so a store open in another process (the API
+    server while ingest runs) never reads compacted files with old row numbers.
+    """
+    name = "quantized"
+    SCAN_BLOCK_ROWS = 8192  # Bounds the float32 scratch copy of a block to ~12 MB at 384 dims
+
+    def __init__(self, path, dtype="int8", rescore_factor=8):
+        if dtype not in ("int8", "float16"):
+            raise ValueError(f"Unsupported quantized dtype: {dtype}")
+        self.path = path
+        self.dtype = dtype
+        self.rescore_factor = rescore_factor
+        self._generation = 0
+        self._full = None  # Unbuffered handle on this generation's float32 file, for pread
+        os.makedirs(path, exist_ok=True)
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(os.path.join(path, "chunks.sqlite"), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS chunks (
+                row INTEGER PRIMARY KEY,
+                id TEXT UNIQUE,
+                source TEXT,
+                page INTEGER,
+                document TEXT,
+                deleted INTEGER DEFAULT 0
+            );
+            CREATE INDEX IF NOT EXISTS ix_chunks_source ON chunks (source);
+            CREATE TABLE IF NOT EXISTS settings (key TEXT PRIMARY KEY, value TEXT);
+        """)
+        self.dim = self._setting("dim", int)
+        stored_dtype = self._setting("dtype")
+        if stored_dtype and stored_dtype != dtype:
+            raise ValueError(f"{path} holds {stored_dtype} vectors, not {dtype}; re-ingest or change CURACORE_QUANTIZED_DTYPE")
+        self.refresh()
+
+    # --- Files ---
+    def _file(self, name, generation=None):
+        """Vector file of a compaction generation (the current one by default); generation 0 keeps the plain name"""
+        generation = self._generation if generation is None else generation
+        if generation:
+            stem, ext = os.path.splitext(name)
+            name = f"{stem}.g{generation}{ext}"
+        return os.path.join(self.path, name)
+
+    @property
+    def _vector_files(self):
+        return ["vectors.f32", "vectors.i8" if self.dtype == "int8" else "vectors.f16"] + \
+            (["scales.f32"] if self.dtype == "int8" else [])
+
+    @property
+    def _quant_file(self):
+        return self._file(self._vector_files[1])
+
+    def _setting(self, key, cast=str):
+        row = self._db.execute("SELECT value FROM settings WHERE key = ?", (key,)).fetchone()
+        return cast(row[0]) if row else None
+
+    def _memmap(self, filename, dtype, columns):
+        rows = self._rows
+        if rows == 0:
+            return None
+        shape = (rows, columns) if columns > 1 else (rows,)
+        return np.memmap(filename, dtype=dtype, mode="r", shape=shape)
+
+    def _stored_generation(self):
+        return self._setting("generation", int) or 0
+
+    def refresh(self):
+        with self._lock:
+            self.dim = self.dim or self._setting("dim", int)
+            self._generation = self._stored_generation()
+            row = self._db.execute("SELECT COALESCE(MAX(row) + 1, 0) FROM chunks").fetchone()
+            self._rows = row[0]
+            if self._full is not None:
+                self._full.close()
+            if self._rows and self.dim:
+                self._quantized = self._memmap(self._quant_file, np.int8 if self.dtype == "int8" else np.float16, self.dim)
+                self._scales = self._memmap(self._file("scales.f32"), np.float32, 1) if self.dtype == "int8" else None
+                self._full = open(self._file("vectors.f32"), "rb", buffering=0)
+            else:
+                self._quantized = self._scales = self._full = None
+            deleted = [r for (r,) in self._db.execute("SELECT row FROM chunks WHERE deleted = 1")]
+            self._deleted = np.array(deleted, dtype=np.int64)
+
+    # --- Writes ---
+    def _quantize(self, vectors):
+        if self.dtype == "float16":
+            return vectors.astype(np.float16), None
+        scales = np.abs(vectors).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        quantized = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+        return quantized, scales.astype(np.float32)
+
+    @staticmethod
+    def _append(filename, array, offset_bytes):
+        # Truncate first: bytes past the committed row count are leftovers of a crashed write
+        with open(filename, "ab") as f:
+            f.truncate(offset_bytes)
+            f.write(np.ascontiguousarray(array).tobytes())
+
+    def add(self, ids, documents, embeddings, metadatas):
+        if not ids:
+            return
+        vectors = np.array(embeddings, dtype=np.float32)  # A copy, so normalising below leaves the caller's array alone
+        vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        with self._lock:
+            if self.dim is None:
+                self.dim = vectors.shape[1]
+                self._db.executemany("INSERT OR REPLACE INTO settings VALUES (?, ?)",
+                                     [("dim", str(self.dim)), ("dtype", self.dtype)])
+            start = self._rows
+            quantized, scales = self._quantize(vectors)
+
+            # Vectors first, rows second: a reader never sees a row whose vector isn't on disk
+            self._append(self._file("vectors.f32"), vectors, start * self.dim * 4)
+            self._append(self._quant_file, quantized, start * self.dim * quantized.itemsize)
+            if scales is not None:
+                self._append(self._file("scales.f32"), scales, start * 4)
+
+            # Re-adding an id replaces it: the old row becomes a tombstone
+            self._db.executemany("UPDATE chunks SET deleted = 1, id = NULL WHERE id = ?", [(i,) for i in ids])
+            self._db.executemany(
+                "INSERT INTO chunks (row, id, source, page, document) VALUES (?, ?, ?, ?, ?)",
+                [(start + n, ids[n], meta.get("source"), meta.get("page"), documents[n]) for n, meta in enumerate(metadatas)],
+            )
+            self._db.commit()
+            self.refresh()
+
+    def delete_source(self, source, keep_ids=None):
+        with self._lock:
+            if keep_ids:
+                rows = [(row,) for row, chunk_id in self._db.execute(
+                    "SELECT row, id FROM chunks WHERE source = ? AND deleted = 0", (source,)) if chunk_id not in keep_ids]
+                self._db.executemany("UPDATE chunks SET deleted = 1, id = NULL WHERE row = ?", rows)
+            else:
+                self._db.execute("UPDATE chunks SET deleted = 1, id = NULL WHERE source = ? AND deleted = 0", (source,))
+            self._db.commit()
+            self.refresh()
+
+    def delete(self, ids):
+        if not ids:
+            return
+        with self._lock:
+            self._db.executemany("UPDATE chunks SET deleted = 1, id = NULL WHERE id = ?", [(i,) for i in ids])
+            self._db.commit()
+            self.refresh()
+
+    def flush(self):
+        with self._lock:
+            dead = len(self._deleted)
+            if self._rows and dead / self._rows > 0.25:
+                self.compact()
+
+    def compact(self):
+        """Rewrites the files without tombstoned rows, as the next generation"""
+        with self._lock:
+            live = [r for (r,) in self._db.execute("SELECT row FROM chunks WHERE deleted = 0 ORDER BY row")]
+            keep = np.array(live, dtype=np.int64)
+            old, new = self._generation, self._generation + 1
+            sources = [self._memmap(self._file("vectors.f32"), np.float32, self.dim), self._quantized, self._scales]
+
+            # New files under new names: readers of the current generation are untouched
+            for name, source in zip(self._vector_files, sources):
+                with open(self._file(name, new), "wb") as f:
+                    if len(keep):
+                        f.write(np.ascontiguousarray(source[keep]).tobytes())
+            sources = None
+
+            # The swap: renumbered rows and the new generation become visible in one commit
+            self._db.execute("DELETE FROM chunks WHERE deleted = 1")
+            self._db.execute("CREATE TEMP TABLE renumber AS SELECT row AS old, ROW_NUMBER() OVER (ORDER BY row) - 1 AS new FROM chunks")
+            # Two passes so the primary key never collides mid-update
+            self._db.execute("UPDATE chunks SET row = -1 - (SELECT new FROM renumber WHERE old = chunks.row)")
+            self._db.execute("UPDATE chunks SET row = -1 - row")
+            self._db.execute("DROP TABLE renumber")
+            self._db.execute("INSERT OR REPLACE INTO settings VALUES ('generation', ?)", (str(new),))
+            self._db.commit()
+            self.refresh()
+
+            # Readers elsewhere keep their open handles until they refresh. Where an open
+            # file cannot be removed (Windows) it is retried after the next compaction.
+            for generation in range(old + 1):
+                for name in self._vector_files:
+                    try:
+                        os.remove(self._file(name, generation))
+                    except OSError:
+                        pass
+            print(f"🗜️ Compacted vector store to {len(keep)} rows (generation {new})")
+
+    # --- Reads ---
+    def _scan(self, query):
+        """Approximate scores for every row from the quantized copy, block by block"""
+        scores = np.empty(self._rows, dtype=np.float32)
+        if self.dtype == "int8":
+            q_scale = max(float(np.abs(query).max()) / 127.0, 1e-12)
+            q = np.rint(query / q_scale).astype(np.float32)
+        else:
+            q_scale, q = 1.0, query
+        for start in range(0, self._rows, self.SCAN_BLOCK_ROWS):
+            end = min(start + self.SCAN_BLOCK_ROWS, self._rows)
+            block = self._quantized[start:end].astype(np.float32)
+            scores[start:end] = block @ q
+        if self.dtype == "int8":
+            scores *= self._scales[:self._rows] * q_scale
+        if len(self._deleted):
+            scores[self._deleted] = -np.inf
+        return scores
+
+    def _read_full_rows(self, rows):
+        """Exact vectors of `rows`, or None when the file is shorter than this snapshot expects"""
+        row_bytes = self.dim * 4
+        data = b"".join(os.pread(self._full.fileno(), row_bytes, int(row) * row_bytes) for row in rows)
+        if len(data) != len(rows) * row_bytes:
+            return None
+        return np.frombuffer(data, dtype=np.float32).reshape(len(rows), self.dim)
+
+    def query(self, embedding, k):
+        with self._lock:
+            query = np.array(embedding, dtype=np.float32)  # Copy, as in add()
+            query /= max(float(np.linalg.norm(query)), 1e-12)
+
+            # One read transaction: the generation, row numbers and chunk rows all come from
+            # the same snapshot, so a compaction committed meanwhile cannot mix them up
+            self._db.execute("BEGIN")
+            try:
+                if self._stored_generation() != self._generation:
+                    self.refresh()  # Compacted elsewhere: these row numbers are gone
+                for attempt in range(2):
+                    if not self._rows:
+                        return [], [], []
+                    scores = self._scan(query)
+                    n_candidates = min(self._rows, max(k, k * self.rescore_factor))
+                    candidates = np.argpartition(-scores, n_candidates - 1)[:n_candidates]
+                    candidates = candidates[np.isfinite(scores[candidates])]
+
+                    # Exact rescoring against the float32 copy
+                    candidates.sort()  # Sequential reads
+                    full = self._read_full_rows(candidates)
+                    if full is not None:
+                        break
+                    self.refresh()  # Short read: the files changed under this snapshot
+                else:
+                    print(f"⚠️ Vector files in {self.path} are shorter than the index, skipping vector search")
+                    return [], [], []
+                exact = full @ query
+                order = np.argsort(-exact)[:k]
+                rows = [int(candidates[i]) for i in order]
+                best = {row: float(exact[i]) for row, i in zip(rows, order)}
+
+                placeholders = ",".join("?" * len(rows))
+                found = {row: (chunk_id, document) for row, chunk_id, document in self._db.execute(
+                    f"SELECT row, id, document FROM chunks WHERE row IN ({placeholders}) AND deleted = 0", rows)}
+            finally:
+                self._db.execute("COMMIT")
+        rows = [row for row in rows if row in found]
+        return [found[r][0] for r in rows], [found[r][1] for r in rows], [best[r] for r in rows]
+
+    def get(self, ids):
+        if not ids:
+            return [], []
+        placeholders = ",".join("?" * len(ids))
+        with self._lock:
+            found = dict(self._db.execute(f"SELECT id, document FROM chunks WHERE id IN ({placeholders})", list(ids)))
+        ordered = [i for i in ids if i in found]
+        return ordered, [found[i] for i in ordered]
+
+    def iter_all(self, page_size=5000):
+        last_row = -1
+        while True:
+            with self._lock:
+                page = self._db.execute(
+                    "SELECT row, id, document, source, page FROM chunks WHERE deleted = 0 AND row > ? ORDER BY row LIMIT ?",
+                    (last_row, page_size),
+                ).fetchall()
+            if not page:
+                return
+            last_row = page[-1][0]
+            yield ([r[1] for r in page], [r[2] for r in page],
+                   [{"source": r[3], "page": r[4]} for r in page])
+
+    def count(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM chunks WHERE deleted = 0").fetchone()[0]
+
+class PartitionedVectorStore(VectorStore):
+    """
+    One store per domain (see domain_router.py). Chunks are routed on their
+    "domain" metadata; a query can be limited to some partitions, otherwise it
+    fans out to all of them and the per-partition top k are merged by score.
+    """
+    def __init__(self, name, open_partition, list_partitions):
+        self.name = name
+        self._open_partition = open_partition
+        self._list_partitions = list_partitions
+        self._lock = threading.Lock()
+        self.partitions = {}
+        self.refresh()
+
+    def _partition(self, domain, create=False):
+        with self._lock:
+            store = self.partitions.get(domain)
+            if store is None and create:
+                store = self.partitions[domain] = self._open_partition(domain)
+            return store
+
+    def _selected(self, domains=None):
+        if domains is None:
+            return list(self.partitions.values())
+        return [self.partitions[d] for d in domains if d in self.partitions]
+
+    def add(self, ids, documents, embeddings, metadatas):
+        groups = {}
+        for n, meta in enumerate(metadatas):
+            groups.setdefault(meta.get("domain") or GENERAL, []).append(n)
+        for domain, rows in groups.items():
+            self._partition(domain, create=True).add(
+                [ids[n] for n in rows], [documents[n] for n in rows],
+                [embeddings[n] for n in rows], [metadatas[n] for n in rows],
+            )
+
+    def delete_source(self, source, keep_ids=None):
+        for store in self._selected():
+            store.delete_source(source, keep_ids)
+
+    def delete(self, ids):
+        for store in self._selected():
+            store.delete(ids)
+
+    def query(self, embedding, k, domains=None):
+        hits = []
+        for store in self._selected(domains):
+            hits.extend(zip(*store.query(embedding, k)))
+        hits.sort(key=lambda hit: hit[2], reverse=True)
+        hits = hits[:k]
+        return [h[0] for h in hits], [h[1] for h in hits], [h[2] for h in hits]
+
+    def get(self, ids, domains=None):
+        found = {}
+        for store in self._selected(domains):
+            missing = [i for i in ids if i not in found]
+            if not missing:
+                break
+            found.update(zip(*store.get(missing)))
+        ordered = [i for i in ids if i in found]
+        return ordered, [found[i] for i in ordered]
+
+    def iter_all(self, page_size=5000):
+        for store in self._selected():
+            yield from store.iter_all(page_size)
+
+    def count(self):
+        return sum(store.count() for store in self._selected())
+
+    def counts(self):
+        """Chunks per partition"""
+        return {domain: store.count() for domain, store in self.partitions.items()}
+
+    def refresh(self):
+        # Partitions created by ingest_pdfs.py in another process show up here
+        for domain in self._list_partitions():
+            self._partition(domain, create=True)
+        for store in self._selected():
+            store.refresh()
+
+    def flush(self):
+        for store in self._selected():
+            store.flush()
+
+def _chroma_collection(domain):
+    # The general partition keeps the original collection name
+    return "medical_docs" if domain == GENERAL else f"medical_docs__{domain}"
+
+def make_vector_store(backend: str = None, chroma_path: str = None):
+    """The configured backend, partitioned by domain"""
+    backend = backend or config.VECTOR_BACKEND
+    if backend == "chroma":
+        import chromadb
+        client = chromadb.PersistentClient(path=chroma_path)
+
+        def list_partitions():
+            names = [getattr(c, "name", c) for c in client.list_collections()]  # Objects before Chroma 0.6
+            return [GENERAL if n == "medical_docs" else n[len("medical_docs__"):]
+                    for n in names if n == "medical_docs" or n.startswith("medical_docs__")]
+
+        return PartitionedVectorStore(
+            backend,
+            lambda domain: ChromaVectorStore(chroma_path, _chroma_collection(domain), client=client),
+            list_partitions,
+        )
+    if backend == "quantized":
+        root = config.QUANTIZED_STORE_PATH
+
+        def partition_path(domain):
+            # The general partition lives in the root, so a store built before partitioning stays readable
+            return root if domain == GENERAL else os.path.join(root, domain)
+
+        def list_partitions():
+            if not os.path.isdir(root):
+                return []
+            return [d for d in [GENERAL] + sorted(os.listdir(root))
+                    if os.path.exists(os.path.join(partition_path(d), "chunks.sqlite"))]
+
+        return PartitionedVectorStore(
+            backend,
+            lambda domain: QuantizedVectorStore(
+                partition_path(domain),
+                dtype=config.QUANTIZED_DTYPE,
+                rescore_factor=config.QUANTIZED_RESCORE_FACTOR,
+            ),
+            list_partitions,
+        )
+    raise ValueError(f"Unknown CURACORE_VECTOR_BACKEND: {backend}")
@@ -1,29 +1,110 @@
-# File: backend/app/services/whisper_service.py
-import whisper
-import os
-
-class WhisperService:
-    def __init__(self):
-        print("👂 Loading Whisper Model (this may take a moment)...")
-        # 'base' is a good balance. Use 'tiny' for speed if needed.
-        try:
-            self.model = whisper.load_model("base")
-        except Exception as e:
-            print(f"⚠️ Whisper load failed: {e}")
-            self.model = None
-
-    def transcribe(self, file_path: str):
-        if not self.model:
-            return "Error: Whisper model not loaded."
-            
-        if not os.path.exists(file_path):
-            return "Error: File not found."
-            
-        try:
-            result = self.model.transcribe(file_path)
-            return result["text"]
-        except Exception as e:
-            return f"Error processing audio: {str(e)}"
-
-# Singleton
-whisper_service = WhisperService()
\ No newline at end of file
+# File: backend/app/services/whisper_service.py
+import numpy as np
+import os
+import subprocess
+import tempfile
+import threading
+from backend.app.core import config
+from backend.app.core.lazy import LazyService
+from backend.app.core.metrics import span
+from backend.app.services.audio_segmenter import SegmentedTranscriber
+from backend.app.services.model_client import model_client, RemoteWhisperService
+
+SAMPLE_RATE = 16000  # What Whisper expects
+
+def decode_audio(data: bytes, suffix: str = ""):
+    """
+    Decodes an in-memory upload to 16 kHz mono float32 by piping it through ffmpeg.
+    Containers that need seeking (e.g. some mp4/m4a) can't be read from a pipe;
+    those fall back to a temp file that is always deleted.
+    """
+    cmd = ["ffmpeg", "-nostdin", "-threads", "0", "-i", "pipe:0",
+           "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(SAMPLE_RATE), "-"]
+    proc = subprocess.run(cmd, input=data, capture_output=True)
+    if proc.returncode == 0 and proc.stdout:
+        return np.frombuffer(proc.stdout, np.int16).flatten().astype(np.float32) / 32768.0
+
+    tmp = tempfile.NamedTemporaryFile(suffix=suffix, delete=False)
+    try:
+        with tmp:
+            tmp.write(data)
+        import whisper
+        return whisper.load_audio(tmp.name, sr=SAMPLE_RATE)
+    finally:
+        os.remove(tmp.name)
+
+class WhisperService:
+    def __init__(self):
+        import whisper  # torch import is slow, only pay for it when the model is needed
+        print(f"👂 Loading Whisper Model '{config.WHISPER_MODEL_SIZE}' (this may take a moment)...")
+        # 'base' is a good balance. Use 'tiny' for speed if needed (CURACORE_WHISPER_MODEL).
+        try:
+            self.model = whisper.load_model(config.WHISPER_MODEL_SIZE)
+        except Exception as e:
+            print(f"⚠️ Whisper load failed: {e}")
+            self.model = None
+
+        # Whisper's decoder hooks live on the model, so one decode at a time per model
+        self._lock = threading.Lock()
+
+        # Long recordings: VAD segments decoded in parallel worker processes
+        self.segmenter = SegmentedTranscriber(
+            model_size=config.WHISPER_MODEL_SIZE,
+            workers=config.SEGMENT_WORKERS,
+            max_seconds=config.SEGMENT_MAX_SECONDS,
+            min_silence_ms=config.SEGMENT_MIN_SILENCE_MS,
+            vad_aggressiveness=config.VAD_AGGRESSIVENESS,
+            energy_margin_db=config.VAD_ENERGY_MARGIN_DB,
+        )
+
+    def transcribe(self, file_path: str):
+        if not self.model:
+            return "Error: Whisper model not loaded."
+            
+        if not os.path.exists(file_path):
+            return "Error: File not found."
+            
+        try:
+            with span("whisper_transcribe"), self._lock:
+                result = self.model.transcribe(file_path)
+            return result["text"]
+        except Exception as e:
+            return f"Error processing audio: {str(e)}"
+
+    def transcribe_bytes(self, data: bytes, suffix: str = "", on_partial=None):
+        """
+        Transcribes an upload straight from memory, no copy kept on disk.
+        Audio longer than one segment is split on silence and decoded in parallel;
+        `on_partial` receives each segment's text as soon as it is ready.
+        """
+        if not self.model:
+            return "Error: Whisper model not loaded."
+
+        try:
+            with span("whisper_decode"):
+                audio = decode_audio(data, suffix)
+            duration = len(audio) / SAMPLE_RATE
+
+            if duration > config.SEGMENT_MAX_SECONDS:
+                with span("whisper_transcribe_segmented"):
+                    return self.segmenter.transcribe(audio, on_partial)
+
+            with span("whisper_transcribe"), self._lock:
+                text = self.model.transcribe(audio)["text"]
+            if on_partial:
+                on_partial({"index": 0, "start": 0.0, "end": round(duration, 2), "text": text.strip(), "total": 1})
+            return text
+        except Exception as e:
+            return f"Error processing audio: {str(e)}"
+
+    def shutdown(self):
+        self.segmenter.shutdown()
+
+def _make_whisper_service():
+    # With a model server (run.py --workers) Whisper is loaded once, there
+    if model_client is not None:
+        return RemoteWhisperService()
+    return WhisperService()
+
+# Singleton (built on first use, see core/lazy.py)
+whisper_service = LazyService("whisper", _make_whisper_service)
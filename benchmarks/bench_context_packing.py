@@ -0,0 +1,90 @@
+# File: benchmarks/bench_context_packing.py
+"""
+Prompt size and Ollama prefill latency: top-k chunks joined verbatim (old
+prompt) vs the token-budgeted, overlap-deduplicated context packer.
+Needs an ingested store and a running Ollama; each call generates a single
+token so the measurement is dominated by prefill.
+
+    python benchmarks/bench_context_packing.py -k 8 --model gemma:2b
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import uuid
+
+# Ensure Python can find the backend module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.app.services.rag_service import rag_service
+from backend.app.services.llm_service import llm_service
+from backend.app.services.ollama_client import ollama_pool
+
+def naive_messages(query, chunks):
+    """The prompt as it was built before packing: every chunk, verbatim"""
+    return [
+        {'role': 'system', 'content': llm_service._system_prompt("\n\n".join(chunks))},
+        {'role': 'user', 'content': query},
+    ]
+
+def prefill(messages, model):
+    # Unique first line: Ollama must not reuse a cached prefix from the previous run
+    messages = [dict(messages[0], content=f"[{uuid.uuid4()}]\n" + messages[0]['content'])] + messages[1:]
+    response = ollama_pool.chat_sync(model, messages, num_predict=1)
+    return response['prompt_eval_count'], response['prompt_eval_duration'] / 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", default="benchmarks/data/heldout_queries.jsonl")
+    parser.add_argument("-k", type=int, default=8, help="Chunks retrieved per query")
+    parser.add_argument("--model", default=llm_service.model)
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    llm_service.model = args.model
+    with open(args.queries) as f:
+        queries = [json.loads(line)["query"] for line in f if line.strip()]
+
+    rows = []
+    for query in queries:
+        chunks = rag_service.search(query, k=args.k)
+        packed = llm_service.build_prompt(query, chunks)
+        naive = naive_messages(query, chunks)
+
+        naive_tokens, naive_ms = prefill(naive, args.model)
+        packed_tokens, packed_ms = prefill(packed["messages"], args.model)
+        rows.append({
+            "query": query,
+            "naive_tokens": naive_tokens,
+            "packed_tokens": packed_tokens,
+            "packed_tokens_estimated": packed["prompt_tokens"],
+            "naive_prefill_ms": round(naive_ms, 1),
+            "packed_prefill_ms": round(packed_ms, 1),
+            "context": packed["context"],
+        })
+        print(f"📝 {query[:40]:<40} tokens {naive_tokens:>5} -> {packed_tokens:<5} "
+              f"prefill {naive_ms:>7.0f}ms -> {packed_ms:.0f}ms")
+
+    summary = {
+        "benchmark": "context_packing",
+        "model": args.model,
+        "k": args.k,
+        "budget": llm_service.context_budget(),
+        "mean_naive_tokens": round(statistics.mean(r["naive_tokens"] for r in rows), 1),
+        "mean_packed_tokens": round(statistics.mean(r["packed_tokens"] for r in rows), 1),
+        "mean_naive_prefill_ms": round(statistics.mean(r["naive_prefill_ms"] for r in rows), 1),
+        "mean_packed_prefill_ms": round(statistics.mean(r["packed_prefill_ms"] for r in rows), 1),
+        "estimate_error_pct": round(100 * statistics.mean(
+            (r["packed_tokens_estimated"] - r["packed_tokens"]) / r["packed_tokens"] for r in rows), 1),
+    }
+    saved = summary["mean_naive_prefill_ms"] - summary["mean_packed_prefill_ms"]
+    print(f"📊 tokens {summary['mean_naive_tokens']} -> {summary['mean_packed_tokens']} | "
+          f"prefill saved {saved:.0f}ms per request | token estimate error {summary['estimate_error_pct']}%")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({**summary, "queries": rows}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
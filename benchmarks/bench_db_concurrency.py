@@ -0,0 +1,147 @@
+# File: benchmarks/bench_db_concurrency.py
+"""
+Concurrent appointment writes + doctor-queue reads against SQLite:
+the old bare engine (rollback journal, default locking) vs. the tuned
+profile from backend/app/core/database.py (WAL, busy_timeout, synchronous,
+sized QueuePool). Reports throughput, p50/p95 latency and "database is locked"
+errors per side.
+
+    python benchmarks/bench_db_concurrency.py --writers 4 --readers 8 --seconds 10
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+# Ensure Python can find the backend module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+from backend.app.core.database import Base, make_engine
+from backend.app.models.users import User
+from backend.app.models.doctors import Doctor
+from backend.app.models.appointments import Appointment
+from backend.app.api.appointments import get_doctor_queue
+
+def seed(engine, doctors, rows):
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Doctor), [{"id": i, "full_name": f"Dr {i}", "specialization": "General"} for i in range(1, doctors + 1)])
+        conn.execute(insert(User), [{"id": 1, "full_name": "Patient", "email": "p@example.com"}])
+        conn.execute(insert(Appointment), [{
+            "patient_id": 1,
+            "doctor_id": 1 + i % doctors,
+            "appointment_date": datetime.utcnow(),
+            "status": "pending",
+            "symptoms": "cough and fever " * 10,
+            "summary_status": "done",
+        } for i in range(rows)])
+
+def percentile(values, pct):
+    if not values:
+        return None
+    values = sorted(values)
+    return round(values[min(len(values) - 1, int(len(values) * pct / 100))], 2)
+
+def run_profile(name, tuned, args):
+    path = os.path.join(args.workdir, f"concurrency_{name}.db")
+    for suffix in ("", "-wal", "-shm", "-journal"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+    engine = make_engine(f"sqlite:///{path}", tuned=tuned)
+    seed(engine, args.doctors, args.rows)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    lock = threading.Lock()
+    stats = {"write": [], "read": [], "locked": 0, "other_errors": 0}
+    deadline = time.perf_counter() + args.seconds
+
+    def record(kind, started):
+        with lock:
+            stats[kind].append((time.perf_counter() - started) * 1000)
+
+    def writer(n):
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            db = Session()
+            try:
+                # Same shape as create_appointment
+                db.add(Appointment(
+                    patient_id=1,
+                    doctor_id=1 + n % args.doctors,
+                    symptoms="headache since morning",
+                    status="pending",
+                    summary_status="pending",
+                    appointment_date=datetime.utcnow(),
+                ))
+                db.commit()
+                record("write", started)
+            except OperationalError as e:
+                db.rollback()
+                with lock:
+                    stats["locked" if "locked" in str(e) else "other_errors"] += 1
+            finally:
+                db.close()
+
+    def reader(n):
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            db = Session()
+            try:
+                get_doctor_queue(doctor_id=1 + n % args.doctors, status="pending", limit=50, cursor=None, db=db)
+                record("read", started)
+            except OperationalError as e:
+                with lock:
+                    stats["locked" if "locked" in str(e) else "other_errors"] += 1
+            finally:
+                db.close()
+
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(args.writers)]
+    threads += [threading.Thread(target=reader, args=(i,)) for i in range(args.readers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+
+    result = {
+        "profile": name,
+        "writes_per_s": round(len(stats["write"]) / args.seconds, 1),
+        "reads_per_s": round(len(stats["read"]) / args.seconds, 1),
+        "write_p50_ms": percentile(stats["write"], 50),
+        "write_p95_ms": percentile(stats["write"], 95),
+        "read_p50_ms": percentile(stats["read"], 50),
+        "read_p95_ms": percentile(stats["read"], 95),
+        "locked_errors": stats["locked"],
+        "other_errors": stats["other_errors"],
+    }
+    print(f"📊 {name:>6}: {result['writes_per_s']} writes/s (p95 {result['write_p95_ms']}ms) | "
+          f"{result['reads_per_s']} reads/s (p95 {result['read_p95_ms']}ms) | locked errors: {stats['locked']}")
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--doctors", type=int, default=20)
+    parser.add_argument("--rows", type=int, default=20_000, help="Appointments seeded before the run")
+    parser.add_argument("--workdir", default=tempfile.gettempdir())
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    results = [run_profile("before", False, args), run_profile("after", True, args)]
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"benchmark": "db_concurrency", "results": results}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
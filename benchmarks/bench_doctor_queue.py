@@ -0,0 +1,145 @@
+# File: benchmarks/bench_doctor_queue.py
+"""
+Doctor-queue latency on a seeded SQLite database (default 1M appointments):
+the old unbounded ORM `.all()` without the composite index vs. one keyset page
+of lean columns over (doctor_id, status, appointment_date).
+
+    python benchmarks/bench_doctor_queue.py --rows 1000000 --db /tmp/queue_bench.db
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+# Ensure Python can find the backend module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert, text
+from sqlalchemy.orm import sessionmaker
+from backend.app.core.database import Base
+from backend.app.models.users import User
+from backend.app.models.doctors import Doctor
+from backend.app.models.appointments import Appointment
+from backend.app.api.appointments import get_doctor_queue
+
+INDEX_NAME = "ix_appointments_doctor_status_date"
+
+def seed(engine, rows, doctors, text_bytes, seed_value):
+    rng = random.Random(seed_value)
+    start = datetime(2024, 1, 1)
+    filler = "x" * text_bytes
+    with engine.begin() as conn:
+        conn.execute(insert(Doctor), [{"id": i, "full_name": f"Dr {i}", "specialization": "General"} for i in range(1, doctors + 1)])
+        conn.execute(insert(User), [{"id": 1, "full_name": "Patient", "email": "p@example.com"}])
+    batch = []
+    with engine.begin() as conn:
+        for i in range(rows):
+            # Doctor 1 is the busy one: ~10% of all appointments
+            doctor_id = 1 if rng.random() < 0.1 else rng.randint(2, doctors)
+            batch.append({
+                "patient_id": 1,
+                "doctor_id": doctor_id,
+                "appointment_date": start + timedelta(minutes=i),
+                "status": "pending" if rng.random() < 0.3 else "completed",
+                "symptoms": filler,
+                "ai_summary": filler,
+                "summary_status": "done",
+            })
+            if len(batch) == 50_000:
+                conn.execute(insert(Appointment), batch)
+                batch = []
+        if batch:
+            conn.execute(insert(Appointment), batch)
+
+def timed(fn, repeats):
+    times = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        result = fn()
+        times.append((time.perf_counter() - started) * 1000)
+    return statistics.median(times), result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--doctors", type=int, default=200)
+    parser.add_argument("--text-bytes", type=int, default=400, help="Size of symptoms / ai_summary per row")
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--db", default="queue_bench.db")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    engine = create_engine(f"sqlite:///{args.db}")
+    if not os.path.exists(args.db) or os.path.getsize(args.db) == 0:
+        Base.metadata.create_all(bind=engine)
+        print(f"🌱 Seeding {args.rows:,} appointments...")
+        started = time.perf_counter()
+        seed(engine, args.rows, args.doctors, args.text_bytes, args.seed)
+        print(f"   done in {time.perf_counter() - started:.1f}s")
+    Session = sessionmaker(bind=engine)
+
+    def old_queue():
+        db = Session()
+        try:
+            return db.query(Appointment)\
+                .filter(Appointment.doctor_id == 1)\
+                .filter(Appointment.status == "pending")\
+                .all()
+        finally:
+            db.close()
+
+    def new_queue():
+        db = Session()
+        try:
+            return get_doctor_queue(doctor_id=1, status="pending", limit=args.page_size, cursor=None, db=db)
+        finally:
+            db.close()
+
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP INDEX IF EXISTS {INDEX_NAME}"))
+    old_ms, old_rows = timed(old_queue, args.repeats)
+
+    with engine.begin() as conn:
+        conn.execute(text(f"CREATE INDEX IF NOT EXISTS {INDEX_NAME} ON appointments (doctor_id, status, appointment_date)"))
+        conn.execute(text("ANALYZE"))
+    new_ms, page = timed(new_queue, args.repeats)
+
+    # Deep page: follow the cursor halfway through the busy doctor's queue
+    def deep_page():
+        db = Session()
+        try:
+            cursor, result = None, None
+            for _ in range(10):
+                result = get_doctor_queue(doctor_id=1, status="pending", limit=args.page_size, cursor=cursor, db=db)
+                cursor = result["next_cursor"]
+            return result
+        finally:
+            db.close()
+    deep_ms, _ = timed(deep_page, args.repeats)
+
+    result = {
+        "benchmark": "doctor_queue",
+        "rows": args.rows,
+        "busy_doctor_pending": len(old_rows),
+        "old_all_ms": round(old_ms, 2),
+        "new_first_page_ms": round(new_ms, 2),
+        "new_10_pages_ms": round(deep_ms, 2),
+        "page_size": args.page_size,
+        "old_payload_rows": len(old_rows),
+        "new_payload_rows": len(page["items"]),
+    }
+    print(f"📊 old .all(): {old_ms:.1f}ms for {len(old_rows):,} full rows | "
+          f"keyset page: {new_ms:.2f}ms for {len(page['items'])} lean rows | 10 pages: {deep_ms:.1f}ms")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,332 @@
+# File: benchmarks/bench_e2e.py
+"""
+End-to-end load test of the API server against a local Ollama stand-in.
+
+Builds a throwaway work directory with a seeded SQLite DB, a small fixture
+PDF corpus (ingested with ingest_pdfs.py) and a WAV clip. It then starts
+benchmarks/fake_ollama.py and uvicorn with their state pointed there and
+drives each scenario at --concurrency. It reports per-scenario throughput
+and p50/p95/p99 latency (plus time-to-first-token for streaming chat) as
+JSON. With --baseline it also prints the p95 change against an earlier run.
+
+    python benchmarks/bench_e2e.py --concurrency 8 --requests 200 --json e2e.json
+    python benchmarks/bench_e2e.py --scenarios doctors,appointments --baseline e2e.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import secrets
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+from jose import jwt
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Ensure Python can find the backend module
+sys.path.append(ROOT)
+
+from backend.app.core import config
+from e2e_fixtures import LOCATIONS, SPECIALIZATIONS, queries, seed_database, write_corpus, write_wav
+
+SCENARIOS = ("doctors", "appointments", "doctor_queue", "chat", "chat_stream", "voice")
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def percentile(values, pct):
+    if not values:
+        return None
+    values = sorted(values)
+    return round(values[min(len(values) - 1, int(len(values) * pct / 100))], 2)
+
+def wait_for(url, timeout, proc=None):
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        if proc is not None and proc.poll() is not None:
+            raise RuntimeError(f"process serving {url} exited during startup")
+        try:
+            httpx.get(url, timeout=1)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.05)
+    raise TimeoutError(f"{url} did not answer within {timeout}s")
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+class Scenario:
+    """One endpoint flow; `request` returns (ok, extra) where extra may carry ttft_ms"""
+    def __init__(self, name, args, fixtures):
+        self.name = name
+        self.args = args
+        self.fixtures = fixtures
+        self.rng = random.Random(args.seed)
+        self.queries = queries()
+        self._tokens = {}
+
+    def _patient_headers(self, patient_id):
+        """Booking needs a bearer token; minted with the server's secret instead of logging in (bcrypt)"""
+        if patient_id not in self._tokens:
+            claims = {"sub": str(patient_id), "role": "patient", "exp": int(time.time()) + 24 * 3600}
+            self._tokens[patient_id] = jwt.encode(claims, self.fixtures["jwt_secret"], algorithm=config.JWT_ALGORITHM)
+        return {"Authorization": f"Bearer {self._tokens[patient_id]}"}
+
+    def _query(self, i):
+        question = self.queries[i % len(self.queries)]
+        # Unique suffixes defeat the semantic cache so every request reaches the LLM
+        return f"{question} (case {i})" if self.args.unique_queries else question
+
+    async def request(self, client, i):
+        if self.name == "doctors":
+            params = {"limit": 20, "offset": self.rng.randint(0, 2) * 20}
+            if i % 2:
+                params["specialization"] = self.rng.choice(SPECIALIZATIONS)
+            if i % 3 == 0:
+                params["location"] = self.rng.choice(LOCATIONS)
+            resp = await client.get("/api/doctors/search", params=params)
+            return resp.status_code == 200, {}
+
+        if self.name == "appointments":
+            patient_id = self.rng.randint(1, self.args.patients)
+            resp = await client.post("/api/appointments/", headers=self._patient_headers(patient_id), json={
+                "doctor_id": self.rng.randint(1, self.args.doctors),
+                "symptoms": self._query(i),
+            })
+            return resp.status_code == 200, {}
+
+        if self.name == "doctor_queue":
+            resp = await client.get(f"/api/appointments/doctor/{self.rng.randint(1, self.args.doctors)}", params={"limit": 50})
+            return resp.status_code == 200, {}
+
+        if self.name == "chat":
+            resp = await client.post("/api/chat/", json={"message": self._query(i)})
+            return resp.status_code == 200, {}
+
+        if self.name == "chat_stream":
+            started = time.perf_counter()
+            ttft = None
+            async with client.stream("POST", "/api/chat/stream", json={"message": self._query(i)}) as resp:
+                if resp.status_code != 200:
+                    return False, {}
+                async for line in resp.aiter_lines():
+                    if ttft is None and line and json.loads(line).get("type") == "token":
+                        ttft = (time.perf_counter() - started) * 1000
+            return True, {"ttft_ms": ttft}
+
+        if self.name == "voice":
+            with open(self.fixtures["wav"], "rb") as f:
+                audio = f.read()
+            resp = await client.post("/api/voice/transcribe", files={"file": ("voice.wav", audio, "audio/wav")})
+            return resp.status_code == 200, {}
+
+        raise ValueError(f"unknown scenario {self.name}")
+
+async def run_scenario(base_url, scenario, args):
+    latencies, ttfts, statuses = [], [], {"ok": 0, "failed": 0}
+    counter = iter(range(args.requests))
+    limits = httpx.Limits(max_connections=args.concurrency + 4)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=args.request_timeout, limits=limits) as client:
+        # Warm-up requests (first model loads, caches) are not measured
+        for i in range(args.warmup):
+            try:
+                await scenario.request(client, -1 - i)
+            except httpx.HTTPError:
+                pass
+
+        async def worker():
+            for i in counter:
+                started = time.perf_counter()
+                try:
+                    ok, extra = await scenario.request(client, i)
+                except httpx.HTTPError:
+                    ok, extra = False, {}
+                if ok:
+                    latencies.append((time.perf_counter() - started) * 1000)
+                    if extra.get("ttft_ms") is not None:
+                        ttfts.append(extra["ttft_ms"])
+                    statuses["ok"] += 1
+                else:
+                    statuses["failed"] += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+
+    result = {
+        "requests": args.requests,
+        "ok": statuses["ok"],
+        "failed": statuses["failed"],
+        "seconds": round(elapsed, 2),
+        "throughput_rps": round(statuses["ok"] / elapsed, 2) if elapsed else None,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+    }
+    if ttfts:
+        result.update({"ttft_p50_ms": percentile(ttfts, 50), "ttft_p95_ms": percentile(ttfts, 95)})
+    return result
+
+def build_workdir(args):
+    workdir = args.workdir or tempfile.mkdtemp(prefix="curacore_e2e_")
+    os.makedirs(workdir, exist_ok=True)
+    db_path = os.path.join(workdir, "e2e.db")
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    seed_database(f"sqlite:///{db_path}", args.doctors, args.patients, args.appointments, args.seed)
+    pdf_folder = os.path.join(workdir, "pdfs")
+    write_corpus(pdf_folder, seed=args.seed)
+    wav = write_wav(os.path.join(workdir, "voice.wav"), seconds=args.audio_seconds, seed=args.seed)
+    jwt_secret = os.environ.get("CURACORE_JWT_SECRET") or secrets.token_urlsafe(48)
+    return workdir, {"db": db_path, "pdfs": pdf_folder, "wav": wav, "jwt_secret": jwt_secret}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help=f"Comma separated, from: {', '.join(SCENARIOS)}")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=100, help="Measured requests per scenario")
+    parser.add_argument("--warmup", type=int, default=2, help="Unmeasured requests per scenario")
+    parser.add_argument("--request-timeout", type=float, default=300)
+    parser.add_argument("--unique-queries", action="store_true", help="Make every chat query unique (bypass semantic cache)")
+    parser.add_argument("--workers", type=int, default=1, help="API workers; above 1 run.py adds a shared model server")
+    # Fake Ollama
+    parser.add_argument("--prefill-ms", type=float, default=300)
+    parser.add_argument("--prefill-ms-per-token", type=float, default=0.0)
+    parser.add_argument("--tokens-per-second", type=float, default=40)
+    parser.add_argument("--tokens", type=int, default=120)
+    parser.add_argument("--ollama-parallel", type=int, default=1)
+    # Fixtures
+    parser.add_argument("--doctors", type=int, default=50)
+    parser.add_argument("--patients", type=int, default=200)
+    parser.add_argument("--appointments", type=int, default=5000)
+    parser.add_argument("--audio-seconds", type=float, default=8.0)
+    parser.add_argument("--skip-ingest", action="store_true", help="Don't ingest the fixture PDFs (chat then runs on an empty store)")
+    parser.add_argument("--workdir", help="Keep fixtures and server state here (default: a temp dir, removed afterwards)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--ready-timeout", type=float, default=300, help="Seconds to wait for models to warm up")
+    parser.add_argument("--json", help="Write results to this file")
+    parser.add_argument("--baseline", help="Earlier --json output to compare p95 latencies against")
+    args = parser.parse_args()
+
+    scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    keep_workdir = bool(args.workdir)
+    print("🌱 Building fixtures...")
+    workdir, fixtures = build_workdir(args)
+
+    ollama_port, api_port = free_port(), free_port()
+    env = dict(
+        os.environ,
+        PYTHONPATH=ROOT,
+        OLLAMA_HOST=f"http://127.0.0.1:{ollama_port}",
+        CURACORE_DATABASE_URL=f"sqlite:///{fixtures['db']}",
+        CURACORE_WARM_MODELS="0",
+        CURACORE_JWT_SECRET=fixtures["jwt_secret"],
+    )
+    procs = []
+    try:
+        procs.append(subprocess.Popen(
+            [sys.executable, os.path.join(HERE, "fake_ollama.py"), "--port", str(ollama_port),
+             "--prefill-ms", str(args.prefill_ms), "--prefill-ms-per-token", str(args.prefill_ms_per_token),
+             "--tokens-per-second", str(args.tokens_per_second), "--tokens", str(args.tokens),
+             "--parallel", str(args.ollama_parallel)],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        ))
+        wait_for(f"http://127.0.0.1:{ollama_port}/api/tags", 30, procs[-1])
+
+        # Server state (Chroma, BM25, manifest) lives under <workdir>/backend/data
+        if not args.skip_ingest and {"chat", "chat_stream"} & set(scenarios):
+            print("📚 Ingesting fixture PDFs...")
+            subprocess.run([sys.executable, os.path.join(ROOT, "ingest_pdfs.py"), "--folder", fixtures["pdfs"]],
+                           cwd=workdir, env=env, check=False)
+
+        if args.workers > 1:
+            server_cmd = [sys.executable, os.path.join(ROOT, "run.py"), "--port", str(api_port), "--workers", str(args.workers)]
+        else:
+            server_cmd = [sys.executable, "-m", "uvicorn", "backend.app.main:app", "--host", "127.0.0.1", "--port", str(api_port)]
+        procs.append(subprocess.Popen(server_cmd, cwd=workdir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL))
+        base_url = f"http://127.0.0.1:{api_port}"
+        wait_for(f"{base_url}/api/health/live", 120, procs[-1])
+
+        # Load models up front so the first measured requests don't pay for it
+        if {"chat", "chat_stream", "voice"} & set(scenarios):
+            print("🔥 Warming models...")
+            started = time.perf_counter()
+            while time.perf_counter() - started < args.ready_timeout:
+                resp = httpx.get(f"{base_url}/api/health/ready", params={"warm": True}, timeout=10)
+                states = [model["state"] for model in resp.json()["models"].values()]
+                if resp.status_code == 200 or "failed" in states:
+                    if "failed" in states:
+                        print(f"⚠️ Some models failed to load: {resp.json()['models']}")
+                    break
+                time.sleep(0.5)
+
+        results = {}
+        for name in scenarios:
+            print(f"🚀 {name}: {args.requests} requests at concurrency {args.concurrency}")
+            results[name] = asyncio.run(run_scenario(base_url, Scenario(name, args, fixtures), args))
+            r = results[name]
+            print(f"📊 {name:>13}: {r['throughput_rps']} req/s | p50 {r['p50_ms']}ms p95 {r['p95_ms']}ms "
+                  f"p99 {r['p99_ms']}ms | failed {r['failed']}")
+    finally:
+        for proc in reversed(procs):
+            proc.terminate()
+            try:
+                proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+        if not keep_workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "benchmark": "e2e",
+        "revision": git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "settings": {
+            "concurrency": args.concurrency,
+            "workers": args.workers,
+            "requests": args.requests,
+            "unique_queries": args.unique_queries,
+            "prefill_ms": args.prefill_ms,
+            "prefill_ms_per_token": args.prefill_ms_per_token,
+            "tokens_per_second": args.tokens_per_second,
+            "tokens": args.tokens,
+            "ollama_parallel": args.ollama_parallel,
+        },
+        "results": results,
+    }
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        for name, r in results.items():
+            before = baseline.get(name, {}).get("p95_ms")
+            if before and r["p95_ms"]:
+                change = (r["p95_ms"] - before) / before * 100
+                print(f"↕️ {name:>13}: p95 {before}ms -> {r['p95_ms']}ms ({change:+.1f}%)")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# File: benchmarks/bench_embedding_batching.py
+"""
+Query-embedding throughput: one encode() per request (old path) vs EmbeddingBatcher.
+
+    python benchmarks/bench_embedding_batching.py --requests 512 --clients 1 8 32
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Ensure Python can find the backend module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sentence_transformers import SentenceTransformer
+from backend.app.services.embedding_batcher import EmbeddingBatcher
+
+MODEL_NAME = "all-MiniLM-L6-v2"
+TOPICS = ["dengue", "malaria", "asthma", "diabetes", "migraine", "hypertension", "anemia", "eczema"]
+TEMPLATES = [
+    "what are the symptoms of {}",
+    "how is {} treated",
+    "is {} contagious",
+    "what causes {} in children",
+]
+
+def make_queries(n):
+    # Unique strings so the LRU cache does not flatter the batched path
+    return [f"{TEMPLATES[i % len(TEMPLATES)].format(TOPICS[i % len(TOPICS)])} #{i}" for i in range(n)]
+
+def run(fn, queries, clients):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        list(pool.map(fn, queries))
+    elapsed = time.perf_counter() - start
+    return {"seconds": elapsed, "qps": len(queries) / elapsed}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=512)
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--max-batch-size", type=int, default=32)
+    parser.add_argument("--max-wait-ms", type=float, default=5)
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    print(f"📦 Loading {MODEL_NAME}...")
+    model = SentenceTransformer(MODEL_NAME)
+    model.encode(["warm up"])
+
+    results = []
+    for clients in args.clients:
+        queries = make_queries(args.requests)
+
+        per_call = run(lambda q: model.encode([q])[0].tolist(), queries, clients)
+
+        batcher = EmbeddingBatcher(model.encode, args.max_batch_size, args.max_wait_ms, cache_size=0)
+        batched = run(batcher.embed, queries, clients)
+
+        row = {
+            "clients": clients,
+            "per_call_qps": round(per_call["qps"], 1),
+            "batched_qps": round(batched["qps"], 1),
+            "speedup": round(batched["qps"] / per_call["qps"], 2),
+            "avg_batch_size": round(batcher.stats()["avg_batch_size"], 1),
+        }
+        results.append(row)
+        print(f"👥 {clients:>3} clients | per-call {row['per_call_qps']:>8} q/s | "
+              f"batched {row['batched_qps']:>8} q/s | x{row['speedup']} | avg batch {row['avg_batch_size']}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"benchmark": "embedding_batching", "requests": args.requests, "results": results}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
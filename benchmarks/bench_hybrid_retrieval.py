@@ -0,0 +1,81 @@
+# File: benchmarks/bench_hybrid_retrieval.py
+"""
+Recall / latency of vector-only vs hybrid (BM25 + vector, RRF) retrieval on a
+held-out query set. Each line of the query file is:
+
+    {"query": "...", "expected": ["substring that a relevant chunk contains", ...]}
+
+A query counts as recalled at k if any of the top-k chunks contains any expected
+substring (case-insensitive). Run against an already-ingested store:
+
+    python benchmarks/bench_hybrid_retrieval.py --queries benchmarks/data/heldout_queries.jsonl -k 3 5
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+# Ensure Python can find the backend module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.app.services.rag_service import rag_service
+
+def load_queries(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def is_hit(docs, expected):
+    expected = [e.lower() for e in expected]
+    return any(e in doc.lower() for doc in docs for e in expected)
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+def evaluate(queries, k, hybrid):
+    hits, reciprocal_ranks, latencies = 0, [], []
+    for item in queries:
+        embedding = rag_service.embed_query(item["query"])  # Same cost for both modes, keep it out
+        start = time.perf_counter()
+        docs = rag_service.search_by_embedding(embedding, k, query_text=item["query"] if hybrid else None)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+        hits += is_hit(docs, item["expected"])
+        rank = next((i + 1 for i, doc in enumerate(docs) if is_hit([doc], item["expected"])), None)
+        reciprocal_ranks.append(1 / rank if rank else 0.0)
+
+    return {
+        "mode": "hybrid" if hybrid else "vector",
+        "k": k,
+        f"recall@{k}": round(hits / len(queries), 3),
+        "mrr": round(statistics.mean(reciprocal_ranks), 3),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", default="benchmarks/data/heldout_queries.jsonl")
+    parser.add_argument("-k", type=int, nargs="+", default=[3, 5, 10])
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    queries = load_queries(args.queries)
+    print(f"🧪 {len(queries)} held-out queries, {rag_service.store.count()} chunks, BM25 over {len(rag_service.bm25)}")
+
+    results = []
+    for k in args.k:
+        for hybrid in (False, True):
+            row = evaluate(queries, k, hybrid)
+            results.append(row)
+            print(f"   {row['mode']:>6} k={k:<3} recall {row[f'recall@{k}']:<6} MRR {row['mrr']:<6} "
+                  f"p50 {row['p50_ms']}ms p95 {row['p95_ms']}ms")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"benchmark": "hybrid_retrieval", "queries": len(queries), "results": results}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+# File: benchmarks/bench_login.py
+"""
+Login load test. Starts the API server twice, once with bcrypt inline on the
+request threadpool (CURACORE_BCRYPT_WORKERS=0, the old behaviour) and once on
+the hasher process pool. Each run fires --concurrency parallel logins for
+--seconds while a probe keeps calling a cheap sync endpoint. The probe shows
+whether a login burst starves the other requests. Also measures
+token-authenticated GET /api/auth/me, which never touches the database.
+
+    python benchmarks/bench_login.py --concurrency 64 --seconds 10 --workers 2
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PASSWORD = "correct horse battery staple"
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def percentile(values, pct):
+    if not values:
+        return None
+    values = sorted(values)
+    return round(values[min(len(values) - 1, int(len(values) * pct / 100))], 2)
+
+def start_server(port, workdir, bcrypt_workers):
+    env = dict(
+        os.environ,
+        CURACORE_DATABASE_URL=f"sqlite:///{os.path.join(workdir, 'login_bench.db')}",
+        CURACORE_JWT_SECRET_FILE=os.path.join(workdir, "jwt_secret"),
+        CURACORE_BCRYPT_WORKERS=str(bcrypt_workers),
+        CURACORE_WARM_MODELS=os.environ.get("CURACORE_WARM_MODELS", "0"),
+        PYTHONPATH=ROOT,
+    )
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.app.main:app", "--host", "127.0.0.1", "--port", str(port)],
+        cwd=workdir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    started = time.perf_counter()
+    while time.perf_counter() - started < 120:
+        if proc.poll() is not None:
+            raise RuntimeError("server exited during startup")
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/", timeout=1)
+            return proc
+        except httpx.HTTPError:
+            time.sleep(0.05)
+    proc.terminate()
+    raise TimeoutError("server did not start")
+
+async def run_load(base_url, args):
+    limits = httpx.Limits(max_connections=args.concurrency + 8)
+    async with httpx.AsyncClient(base_url=base_url, timeout=120, limits=limits) as client:
+        emails = [f"bench{i}@example.com" for i in range(args.users)]
+        for i, email in enumerate(emails):
+            await client.post("/api/auth/signup", json={"full_name": f"Bench {i}", "email": email, "password": PASSWORD})
+
+        login_ms, probe_ms = [], []
+        errors = {"busy": 0, "other": 0}
+        deadline = time.perf_counter() + args.seconds
+
+        async def login_loop(n):
+            i = n
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                resp = await client.post("/api/auth/login", json={"email": emails[i % len(emails)], "password": PASSWORD})
+                if resp.status_code == 200:
+                    login_ms.append((time.perf_counter() - started) * 1000)
+                elif resp.status_code == 503:
+                    errors["busy"] += 1
+                    await asyncio.sleep(0.05)
+                else:
+                    errors["other"] += 1
+                i += args.concurrency
+
+        async def probe_loop():
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                await client.get("/api/doctors/search", params={"limit": 5, "offset": len(probe_ms) % 7})
+                probe_ms.append((time.perf_counter() - started) * 1000)
+                await asyncio.sleep(0.05)
+
+        await asyncio.gather(probe_loop(), *(login_loop(n) for n in range(args.concurrency)))
+
+        # Token-authenticated requests: served from the verified-token cache
+        token = (await client.post("/api/auth/login", json={"email": emails[0], "password": PASSWORD})).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        me_started = time.perf_counter()
+        for _ in range(args.me_requests):
+            (await client.get("/api/auth/me", headers=headers)).raise_for_status()
+        me_ms = (time.perf_counter() - me_started) * 1000 / args.me_requests
+
+    return {
+        "logins_per_s": round(len(login_ms) / args.seconds, 1),
+        "login_p50_ms": percentile(login_ms, 50),
+        "login_p95_ms": percentile(login_ms, 95),
+        "login_p99_ms": percentile(login_ms, 99),
+        "probe_p50_ms": percentile(probe_ms, 50),
+        "probe_p95_ms": percentile(probe_ms, 95),
+        "rejected_busy": errors["busy"],
+        "errors": errors["other"],
+        "me_avg_ms": round(me_ms, 2),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--users", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=2, help="bcrypt process pool size for the 'pool' run")
+    parser.add_argument("--me-requests", type=int, default=200)
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    results = {}
+    for name, bcrypt_workers in (("inline", 0), ("pool", args.workers)):
+        with tempfile.TemporaryDirectory() as workdir:
+            port = free_port()
+            proc = start_server(port, workdir, bcrypt_workers)
+            try:
+                results[name] = asyncio.run(run_load(f"http://127.0.0.1:{port}", args))
+            finally:
+                proc.terminate()
+                proc.wait(timeout=10)
+        r = results[name]
+        print(f"📊 {name:>6}: {r['logins_per_s']} logins/s (p95 {r['login_p95_ms']}ms, {r['rejected_busy']} rejected) | "
+              f"probe p95 {r['probe_p95_ms']}ms | /me {r['me_avg_ms']}ms")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"benchmark": "login", "concurrency": args.concurrency, "results": results}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
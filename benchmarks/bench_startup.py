@@ -0,0 +1,83 @@
+# File: benchmarks/bench_startup.py
+"""
+Import-to-first-response time of the API server. Starts uvicorn in a fresh
+process, polls GET / until it answers, and reports the elapsed time. With
+--budget the script exits non-zero when the median exceeds it, so it can be
+used as a regression gate:
+
+    python benchmarks/bench_startup.py --runs 5 --budget 3.0
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def time_to_first_response(timeout: float, path: str):
+    port = free_port()
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.app.main:app", "--host", "127.0.0.1", "--port", str(port)],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            if proc.poll() is not None:
+                raise RuntimeError("server exited during startup")
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}{path}", timeout=1) as resp:
+                    if resp.status == 200:
+                        return time.perf_counter() - started
+            except OSError:
+                time.sleep(0.02)
+        raise TimeoutError(f"no response within {timeout}s")
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--path", default="/")
+    parser.add_argument("--timeout", type=float, default=120)
+    parser.add_argument("--budget", type=float, help="Fail if the median startup time (s) is above this")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    times = []
+    for run in range(args.runs):
+        elapsed = time_to_first_response(args.timeout, args.path)
+        times.append(elapsed)
+        print(f"🚀 run {run + 1}: {elapsed:.2f}s")
+
+    result = {
+        "benchmark": "startup",
+        "runs": args.runs,
+        "median_s": round(statistics.median(times), 3),
+        "min_s": round(min(times), 3),
+        "max_s": round(max(times), 3),
+        "budget_s": args.budget,
+    }
+    print(f"📊 median {result['median_s']}s (min {result['min_s']}s, max {result['max_s']}s)")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2)
+
+    if args.budget is not None and result["median_s"] > args.budget:
+        print(f"❌ Over budget ({args.budget}s)")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
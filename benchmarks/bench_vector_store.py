@@ -0,0 +1,158 @@
+# File: benchmarks/bench_vector_store.py
+"""
+Vector backends on the same corpus: Chroma (float32 HNSW) vs the quantized
+memory-mapped store (int8 / float16 scan + float32 rescoring).
+
+    python benchmarks/bench_vector_store.py --chunks 100000 --queries 200 --k 5
+
+The corpus is synthetic: unit vectors clustered around a few hundred topic
+centres, the same shape MiniLM produces for chunks of related books. Ground
+truth is an exact float32 scan. Each backend is built in one process and then
+queried from a fresh process, so cold start and RSS are what a server would see.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+# Ensure Python can find the backend module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DIM = 384  # all-MiniLM-L6-v2
+
+def make_corpus(n, n_queries, topics, seed):
+    rng = np.random.default_rng(seed)
+    centres = rng.standard_normal((topics, DIM)).astype(np.float32)
+    vectors = centres[rng.integers(0, topics, n)] + 0.9 * rng.standard_normal((n, DIM)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    queries = centres[rng.integers(0, topics, n_queries)] + 0.9 * rng.standard_normal((n_queries, DIM)).astype(np.float32)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+    return vectors, queries
+
+def ground_truth(vectors, queries, k):
+    return [list(np.argsort(-(vectors @ q))[:k]) for q in queries]
+
+def rss_mb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+def open_store(backend, path, dtype):
+    from backend.app.services.vector_store import ChromaVectorStore, QuantizedVectorStore
+    if backend == "chroma":
+        return ChromaVectorStore(path)
+    return QuantizedVectorStore(path, dtype=dtype)
+
+def build(backend, path, dtype, corpus_file, batch_size=4096):
+    vectors = np.load(corpus_file, mmap_mode="r")
+    store = open_store(backend, path, dtype)
+    start = time.perf_counter()
+    for offset in range(0, len(vectors), batch_size):
+        batch = np.asarray(vectors[offset:offset + batch_size])
+        ids = [str(offset + i) for i in range(len(batch))]
+        store.add(ids, [f"chunk {i}" for i in ids], batch.tolist(),
+                  [{"source": "synthetic.pdf", "page": 1}] * len(batch))
+    store.flush()
+    return {"build_seconds": round(time.perf_counter() - start, 2)}
+
+def serve(backend, path, dtype, queries_file, truth_file, k):
+    rss_before = rss_mb()
+    start = time.perf_counter()
+    store = open_store(backend, path, dtype)
+    first_ids, _, _ = store.query(np.load(queries_file)[0].tolist(), k)
+    cold_start = time.perf_counter() - start
+
+    queries = np.load(queries_file)
+    truth = np.load(truth_file)
+    latencies, hits = [], 0
+    for query, expected in zip(queries, truth):
+        t0 = time.perf_counter()
+        ids, _, _ = store.query(query.tolist(), k)
+        latencies.append((time.perf_counter() - t0) * 1000)
+        hits += len(set(int(i) for i in ids) & set(int(i) for i in expected))
+
+    latencies.sort()
+    return {
+        "cold_start_seconds": round(cold_start, 3),
+        "p50_ms": round(latencies[len(latencies) // 2], 2),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 2),
+        f"recall_at_{k}": round(hits / (len(queries) * k), 4),
+        "rss_mb": round(rss_mb(), 1),
+        "rss_growth_mb": round(rss_mb() - rss_before, 1),
+    }
+
+def dir_size_mb(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        total += sum(os.path.getsize(os.path.join(root, f)) for f in files)
+    return round(total / 1024 / 1024, 1)
+
+def run_child(*args):
+    out = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", *args],
+                         capture_output=True, text=True)
+    if out.returncode != 0:
+        raise RuntimeError(out.stderr.strip().splitlines()[-1] if out.stderr else "child failed")
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--topics", type=int, default=300)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--backends", nargs="+", default=["chroma", "quantized:int8", "quantized:float16"])
+    parser.add_argument("--json", help="Write results to this file")
+    parser.add_argument("--child", nargs="+", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        mode, backend, path, dtype, *files = args.child
+        if mode == "build":
+            result = build(backend, path, dtype, files[0])
+        else:
+            result = serve(backend, path, dtype, files[0], files[1], args.k)
+        print(json.dumps(result))
+        return
+
+    workdir = tempfile.mkdtemp(prefix="curacore_vec_")
+    print(f"🧪 {args.chunks} x {DIM}d vectors, {args.queries} queries, k={args.k} (workdir {workdir})")
+    vectors, queries = make_corpus(args.chunks, args.queries, args.topics, args.seed)
+    corpus_file, queries_file, truth_file = (os.path.join(workdir, f) for f in ("corpus.npy", "queries.npy", "truth.npy"))
+    np.save(corpus_file, vectors)
+    np.save(queries_file, queries)
+    np.save(truth_file, np.array(ground_truth(vectors, queries, args.k)))
+    print(f"📐 Raw float32 vectors: {round(vectors.nbytes / 1024 / 1024, 1)} MB")
+    del vectors
+
+    results = []
+    for spec in args.backends:
+        backend, _, dtype = spec.partition(":")
+        path = os.path.join(workdir, spec.replace(":", "_"))
+        try:
+            row = {"backend": spec}
+            row.update(run_child("build", backend, path, dtype or "int8", corpus_file))
+            row.update(run_child("serve", backend, path, dtype or "int8", queries_file, truth_file))
+            row["disk_mb"] = dir_size_mb(path)
+        except RuntimeError as e:
+            print(f"⚠️ Skipping {spec}: {e}")
+            continue
+        results.append(row)
+        print(f"🗄️ {spec:<18} | recall@{args.k} {row[f'recall_at_{args.k}']:<6} | p50 {row['p50_ms']:>7} ms | "
+              f"p95 {row['p95_ms']:>7} ms | RSS {row['rss_mb']:>7} MB | cold {row['cold_start_seconds']}s | "
+              f"disk {row['disk_mb']} MB | build {row['build_seconds']}s")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"benchmark": "vector_store", "chunks": args.chunks, "queries": args.queries,
+                       "k": args.k, "results": results}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
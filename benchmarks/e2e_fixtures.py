@@ -0,0 +1,156 @@
+# File: benchmarks/e2e_fixtures.py
+"""
+Fixtures for benchmarks/bench_e2e.py: a small medical PDF corpus (written by
+hand, no PDF library needed), a speech-like WAV clip, and a seeded SQLite
+database of doctors, patients and appointments.
+"""
+import math
+import os
+import random
+import struct
+import wave
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, insert
+
+from backend.app.core.database import Base
+from backend.app.models.users import User
+from backend.app.models.doctors import Doctor
+from backend.app.models.appointments import Appointment
+
+SPECIALIZATIONS = ["General Physician", "Cardiologist", "Dermatologist", "Pediatrician", "Neurologist", "Orthopedic"]
+LOCATIONS = ["Chennai", "Madurai", "Coimbatore", "Trichy", "Salem"]
+
+TOPICS = {
+    "cardiology": [
+        "Hypertension is a persistent elevation of arterial blood pressure above 140/90 mmHg.",
+        "Chest pain radiating to the left arm with sweating may indicate acute myocardial infarction.",
+        "Beta blockers reduce heart rate and myocardial oxygen demand in stable angina.",
+        "Atrial fibrillation increases stroke risk; anticoagulation is guided by the CHA2DS2-VASc score.",
+    ],
+    "respiratory": [
+        "Asthma presents with episodic wheeze, breathlessness and nocturnal cough.",
+        "Community acquired pneumonia causes fever, productive cough and focal crackles.",
+        "Salbutamol is a short acting beta-2 agonist used for acute bronchospasm.",
+        "Chronic obstructive pulmonary disease is strongly associated with long term smoking.",
+    ],
+    "infectious": [
+        "Dengue fever causes high fever, retro-orbital pain, myalgia and a falling platelet count.",
+        "Typhoid presents with step-ladder fever and abdominal discomfort; blood culture confirms it.",
+        "Oral rehydration solution is first line for dehydration from acute diarrhoea.",
+        "Malaria should be excluded in any febrile patient from an endemic area.",
+    ],
+}
+
+def _pdf_escape(text):
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+def write_pdf(path, pages):
+    """Minimal valid PDF: one Helvetica text stream per page, each page a list of lines"""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for lines in pages:
+        ops = ["BT", "/F1 11 Tf", "14 TL", "50 790 Td"]
+        ops += [f"({_pdf_escape(line)}) Tj T*" for line in lines]
+        ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1")
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n" + stream.decode("latin-1") + "\nendstream")
+        content_id = len(objects)
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>")
+        page_ids.append(len(objects))
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(f'{i} 0 R' for i in page_ids)}] /Count {len(page_ids)} >>"
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{obj}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    with open(path, "wb") as f:
+        f.write(out)
+
+def write_corpus(folder, pages_per_doc=4, lines_per_page=40, seed=7):
+    rng = random.Random(seed)
+    os.makedirs(folder, exist_ok=True)
+    paths = []
+    for topic, sentences in TOPICS.items():
+        pages = [[rng.choice(sentences) for _ in range(lines_per_page)] for _ in range(pages_per_doc)]
+        path = os.path.join(folder, f"{topic}.pdf")
+        write_pdf(path, pages)
+        paths.append(path)
+    return paths
+
+def queries():
+    """Questions answerable from the corpus, for the chat scenarios"""
+    return [
+        "What blood pressure counts as hypertension?",
+        "My chest hurts and the pain goes to my left arm, what could it be?",
+        "How is stable angina treated?",
+        "What causes wheezing at night?",
+        "I have fever with a productive cough",
+        "What is salbutamol used for?",
+        "High fever and pain behind the eyes, is it dengue?",
+        "How is typhoid confirmed?",
+        "What should I take for dehydration from diarrhoea?",
+        "Should malaria be tested for a fever?",
+    ]
+
+def write_wav(path, seconds=8.0, sample_rate=16000, seed=7):
+    """Speech-like bursts (voiced harmonics + noise, amplitude modulated) separated by short silences"""
+    rng = random.Random(seed)
+    frames = bytearray()
+    total = int(seconds * sample_rate)
+    burst, gap = int(1.6 * sample_rate), int(0.4 * sample_rate)
+    for i in range(total):
+        position = i % (burst + gap)
+        sample = 0.0
+        if position < burst:
+            t = i / sample_rate
+            pitch = 120 + 30 * math.sin(2 * math.pi * 0.7 * t)
+            envelope = 0.5 * (1 - math.cos(2 * math.pi * position / burst)) * (0.6 + 0.4 * math.sin(2 * math.pi * 4 * t))
+            sample = envelope * sum(math.sin(2 * math.pi * pitch * h * t) / h for h in range(1, 6)) * 0.3
+            sample += rng.uniform(-0.02, 0.02)
+        frames += struct.pack("<h", int(max(-1.0, min(1.0, sample)) * 32767))
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(bytes(frames))
+    return path
+
+def seed_database(url, doctors=50, patients=200, appointments=5000, seed=7):
+    rng = random.Random(seed)
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    start = datetime(2024, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(Doctor), [{
+            "id": i,
+            "full_name": f"Dr. Bench {i}",
+            "specialization": SPECIALIZATIONS[i % len(SPECIALIZATIONS)],
+            "qualification": "MBBS",
+            "experience_years": rng.randint(1, 30),
+            "location": rng.choice(LOCATIONS),
+            "consultation_fee": rng.choice([300, 500, 800, 1200]),
+        } for i in range(1, doctors + 1)])
+        conn.execute(insert(User), [{
+            "id": i,
+            "full_name": f"Patient {i}",
+            "email": f"patient{i}@example.com",
+            "role": "patient",
+        } for i in range(1, patients + 1)])
+        if appointments:
+            conn.execute(insert(Appointment), [{
+                "patient_id": rng.randint(1, patients),
+                "doctor_id": rng.randint(1, doctors),
+                "appointment_date": start + timedelta(minutes=i),
+                "status": "pending" if rng.random() < 0.4 else "completed",
+                "symptoms": "fever and cough for three days",
+                "ai_summary": "Chief complaint: fever and cough.",
+                "summary_status": "done",
+            } for i in range(appointments)])
+    engine.dispose()
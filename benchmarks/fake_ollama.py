@@ -0,0 +1,131 @@
+# File: benchmarks/fake_ollama.py
+"""
+Local stand-in for the Ollama HTTP API, for load tests without a GPU or real
+models. Answers /api/chat and /api/generate (streaming and not) after a
+configurable prefill delay, then emits tokens at a fixed rate. It also answers
+/api/tags. Prefill is charged per request, like a real single-slot server.
+With --parallel it serialises requests beyond that many.
+
+    python benchmarks/fake_ollama.py --port 11435 --prefill-ms 300 --tokens-per-second 40 --tokens 120
+"""
+import argparse
+import json
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+WORDS = ("Based on the provided context, the symptoms are consistent with a mild viral infection. "
+         "Rest, fluids and monitoring temperature are advised; see a doctor if it persists.").split()
+
+class FakeOllamaHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    settings = None  # Set by make_server
+    slots = None
+    counters = None
+
+    def log_message(self, *args):
+        pass
+
+    def _send_json(self, payload, status=200):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/api/tags":
+            models = [{"name": name, "model": name} for name in ("gemma:2b", "llama3:8b-instruct-q4_K_M")]
+            self._send_json({"models": models})
+        elif self.path == "/stats":
+            self._send_json(dict(self.counters))
+        else:
+            self._send_json({"error": "not found"}, status=404)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"{}")
+        if self.path not in ("/api/chat", "/api/generate"):
+            self._send_json({"error": "not found"}, status=404)
+            return
+
+        chat = self.path == "/api/chat"
+        model = body.get("model", "unknown")
+        prompt_chars = sum(len(m.get("content", "")) for m in body.get("messages", [])) if chat else len(body.get("prompt", ""))
+        settings = self.settings
+
+        with self.slots:
+            self.counters["requests"] += 1
+            time.sleep(settings.prefill_ms / 1000 + prompt_chars / 4 * settings.prefill_ms_per_token / 1000)
+            tokens = [WORDS[i % len(WORDS)] + " " for i in range(settings.tokens)]
+            interval = 1 / settings.tokens_per_second if settings.tokens_per_second > 0 else 0
+
+            def frame(content, done):
+                base = {"model": model, "created_at": datetime.now(timezone.utc).isoformat(), "done": done}
+                if chat:
+                    base["message"] = {"role": "assistant", "content": content}
+                else:
+                    base["response"] = content
+                if done:
+                    base.update({"done_reason": "stop", "prompt_eval_count": prompt_chars // 4, "eval_count": len(tokens)})
+                return base
+
+            if body.get("stream", True):
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for token in tokens:
+                    time.sleep(interval)
+                    self._write_chunk(json.dumps(frame(token, False)) + "\n")
+                self._write_chunk(json.dumps(frame("", True)) + "\n")
+                self._write_chunk("")
+            else:
+                time.sleep(interval * len(tokens))
+                self._send_json(frame("".join(tokens).strip(), True))
+
+    def _write_chunk(self, text):
+        data = text.encode("utf-8")
+        self.wfile.write(f"{len(data):X}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+def make_server(port, prefill_ms=300, prefill_ms_per_token=0.0, tokens_per_second=40, tokens=120, parallel=1, host="127.0.0.1"):
+    settings = argparse.Namespace(
+        prefill_ms=prefill_ms,
+        prefill_ms_per_token=prefill_ms_per_token,
+        tokens_per_second=tokens_per_second,
+        tokens=tokens,
+    )
+    handler = type("Handler", (FakeOllamaHandler,), {
+        "settings": settings,
+        "slots": threading.BoundedSemaphore(max(1, parallel)),
+        "counters": {"requests": 0},
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--prefill-ms", type=float, default=300, help="Fixed delay before the first token")
+    parser.add_argument("--prefill-ms-per-token", type=float, default=0.0, help="Extra prefill per prompt token (~4 chars)")
+    parser.add_argument("--tokens-per-second", type=float, default=40)
+    parser.add_argument("--tokens", type=int, default=120, help="Tokens per response")
+    parser.add_argument("--parallel", type=int, default=1, help="Requests served at once (like OLLAMA_NUM_PARALLEL)")
+    args = parser.parse_args()
+
+    server = make_server(args.port, args.prefill_ms, args.prefill_ms_per_token, args.tokens_per_second,
+                         args.tokens, args.parallel, args.host)
+    print(f"🦙 Fake Ollama on http://{args.host}:{args.port} "
+          f"(prefill {args.prefill_ms}ms, {args.tokens_per_second} tok/s, {args.tokens} tokens)", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
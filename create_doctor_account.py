@@ -0,0 +1,41 @@
+# File: create_doctor_account.py
+import argparse
+import asyncio
+import getpass
+import os
+import sys
+
+# Ensure Python can find the backend module
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from backend.app.core.database import SessionLocal, engine, Base
+from backend.app.models import users, doctors, appointments, chat_sessions  # Registers every mapper
+from backend.app.models.doctors import Doctor
+from backend.app.models.users import User
+from backend.app.services.password_hasher import password_hasher
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Create the login of an existing doctor (self-signup only ever creates patients)")
+    parser.add_argument("email", help="Email of the doctor's record in the doctors table")
+    parser.add_argument("--password", help="Prompted for when omitted")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        doctor = db.query(Doctor).filter(Doctor.email == args.email).first()
+        if doctor is None:
+            sys.exit(f"❌ No doctor with email {args.email}")
+        if db.query(User).filter(User.email == args.email).first():
+            sys.exit(f"❌ An account for {args.email} already exists")
+
+        password = args.password or getpass.getpass("Password: ")
+        hashed = asyncio.run(password_hasher.hash(password))
+        password_hasher.shutdown()
+        user = User(full_name=doctor.full_name, email=doctor.email, hashed_password=hashed, role="doctor")
+        db.add(user)
+        db.commit()
+        print(f"✅ Doctor account {user.id} created for {doctor.full_name}")
+
+if __name__ == "__main__":
+    main()
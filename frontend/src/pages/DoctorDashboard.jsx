@@ -1,20 +1,24 @@
 import { useEffect, useState } from "react";
 import { CheckCircle, Clock, User, FileText, RefreshCw } from "lucide-react";
-import { getDoctorQueue, completeAppointment } from "../services/api";
+import { getDoctorQueue, getAppointment, completeAppointment } from "../services/api";
 
 export default function DoctorDashboard() {
   const [appointments, setAppointments] = useState([]);
+  const [details, setDetails] = useState({});
+  const [nextCursor, setNextCursor] = useState(null);
   const [loading, setLoading] = useState(true);
   
   // Hardcoded: Simulate logging in as "Dr. Sarah" (ID: 1)
   // In a real app, you would get this from a login context
   const DOCTOR_ID = 1; 
 
-  const fetchQueue = async () => {
+  const fetchQueue = async (cursor = null) => {
     setLoading(true);
     try {
-      const data = await getDoctorQueue(DOCTOR_ID);
-      setAppointments(data);
+      const data = await getDoctorQueue(DOCTOR_ID, cursor);
+      setAppointments((prev) => (cursor ? [...prev, ...data.items] : data.items));
+      if (!cursor) setDetails({});
+      setNextCursor(data.next_cursor);
     } catch (error) {
       console.error("Failed to fetch queue", error);
     } finally {
@@ -26,6 +30,16 @@ export default function DoctorDashboard() {
     fetchQueue();
   }, []);
 
+  // Symptoms + summary are not in the queue list, load them per card on demand
+  const loadDetail = async (id) => {
+    try {
+      const detail = await getAppointment(id);
+      setDetails((prev) => ({ ...prev, [id]: detail }));
+    } catch (error) {
+      console.error("Failed to load appointment", error);
+    }
+  };
+
   const handleComplete = async (id) => {
     try {
       await completeAppointment(id);
@@ -46,7 +60,7 @@ export default function DoctorDashboard() {
         </div>
         <div className="flex items-center gap-4">
           <button 
-            onClick={fetchQueue}
+            onClick={() => fetchQueue()}
             className="p-2 text-gray-500 hover:text-primary hover:bg-gray-100 rounded-lg transition-all"
             title="Refresh List"
           >
@@ -98,16 +112,22 @@ export default function DoctorDashboard() {
                   <FileText size={16} /> AI Pre-Screening Summary
                 </div>
                 <div className="bg-gradient-to-br from-blue-50 to-indigo-50/50 p-5 rounded-2xl border border-blue-100 text-sm text-gray-700 leading-relaxed shadow-sm">
-                  {appt.ai_summary ? (
-                    appt.ai_summary
+                  {!details[appt.id] ? (
+                    <button onClick={() => loadDetail(appt.id)} className="text-primary font-medium hover:underline">
+                      {appt.summary_status === "done" ? "Show summary" : "Processing medical summary... (check again)"}
+                    </button>
+                  ) : details[appt.id].ai_summary ? (
+                    details[appt.id].ai_summary
                   ) : (
                     <span className="text-gray-400 italic">Processing medical summary...</span>
                   )}
                 </div>
-                <div className="text-xs text-gray-400 flex gap-2">
-                  <span className="font-semibold">Original Complaint:</span> 
-                  <span className="italic">"{appt.symptoms}"</span>
-                </div>
+                {details[appt.id] && (
+                  <div className="text-xs text-gray-400 flex gap-2">
+                    <span className="font-semibold">Original Complaint:</span> 
+                    <span className="italic">"{details[appt.id].symptoms}"</span>
+                  </div>
+                )}
               </div>
 
               {/* Right: Actions */}
@@ -124,6 +144,14 @@ export default function DoctorDashboard() {
             </div>
           ))
         )}
+        {nextCursor && (
+          <button
+            onClick={() => fetchQueue(nextCursor)}
+            className="mx-auto px-6 py-2 text-sm font-medium text-primary hover:bg-gray-100 rounded-xl"
+          >
+            Load more
+          </button>
+        )}
       </div>
     </div>
   );
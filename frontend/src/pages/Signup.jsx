@@ -4,7 +4,7 @@ import { signupUser } from "../services/api";
 import { User, Mail, Lock } from "lucide-react";
 
 export default function Signup() {
-  const [formData, setFormData] = useState({ full_name: "", email: "", password: "", role: "patient" });
+  const [formData, setFormData] = useState({ full_name: "", email: "", password: "" });
   const navigate = useNavigate();
 
   const handleSubmit = async (e) => {
@@ -24,21 +24,6 @@ export default function Signup() {
         <h2 className="text-3xl font-bold text-gray-800 mb-6 text-center">Create Account</h2>
         
         <form onSubmit={handleSubmit} className="space-y-4">
-          <div className="flex gap-4 justify-center mb-4">
-            {["patient", "doctor"].map((r) => (
-              <button
-                key={r}
-                type="button"
-                onClick={() => setFormData({...formData, role: r})}
-                className={`px-4 py-2 rounded-full text-sm font-semibold capitalize ${
-                  formData.role === r ? "bg-primary text-white" : "bg-gray-100 text-gray-500"
-                }`}
-              >
-                {r}
-              </button>
-            ))}
-          </div>
-
           <div className="relative">
             <User className="absolute left-3 top-3 text-gray-400 w-5 h-5" />
             <input
@@ -11,6 +11,16 @@ const api = axios.create({
   },
 });
 
+// Send the login token with every request
+api.interceptors.request.use((config) => {
+  const storedUser = localStorage.getItem('curacore_user');
+  const token = storedUser ? JSON.parse(storedUser).access_token : null;
+  if (token) {
+    config.headers.Authorization = `Bearer ${token}`;
+  }
+  return config;
+});
+
 // --- API ENDPOINTS ---
 
 // 1. DOCTORS: Get list of all doctors
@@ -20,9 +30,40 @@ export const getDoctors = async () => {
 };
 
 // 2. CHAT: Send message to Llama 3 / Gemma
-export const sendChatMessage = async (message) => {
-  const response = await api.post('/chat/', { message });
-  return response.data;
+// The conversation lives on the server; its id is kept so follow-ups and bookings share it.
+// Sessions belong to a signed-in patient, so the id is stored per user; visitors ask one-off questions.
+const CHAT_SESSION_KEY = 'curacore_chat_session';
+
+const chatSessionKey = () => {
+  const storedUser = localStorage.getItem('curacore_user');
+  return storedUser ? `${CHAT_SESSION_KEY}_${JSON.parse(storedUser).user_id}` : null;
+};
+
+const getChatSessionId = async () => {
+  const key = chatSessionKey();
+  if (!key) return undefined;
+  let sessionId = localStorage.getItem(key);
+  if (!sessionId) {
+    const response = await api.post('/chat/sessions');
+    sessionId = response.data.session_id;
+    localStorage.setItem(key, sessionId);
+  }
+  return sessionId;
+};
+
+// `specialty` (a doctor's specialization) narrows retrieval to that field's documents
+export const sendChatMessage = async (message, specialty) => {
+  const session_id = await getChatSessionId();
+  try {
+    const response = await api.post('/chat/', { message, session_id, specialty });
+    return response.data;
+  } catch (error) {
+    // Session gone (e.g. database reset): start a new one and retry once
+    if (error.response?.status !== 404 || !session_id) throw error;
+    localStorage.removeItem(chatSessionKey());
+    const response = await api.post('/chat/', { message, session_id: await getChatSessionId(), specialty });
+    return response.data;
+  }
 };
 
 // 3. VOICE: Transcribe audio using Whisper
@@ -39,18 +80,27 @@ export const transcribeAudio = async (audioBlob) => {
 
 // 4. APPOINTMENTS: Book a new appointment
 export const createAppointment = async (doctorId, symptoms) => {
-  // Hardcoded patient_id=1 for this demo (Pugazh Mani)
+  // The patient is whoever is signed in: the backend reads it from the bearer token
   const response = await api.post('/appointments/', {
     doctor_id: doctorId,
-    patient_id: 1, 
-    symptoms: symptoms
+    symptoms: symptoms,
+    session_id: localStorage.getItem(chatSessionKey()) || undefined
+  });
+  return response.data;
+};
+
+// 5. APPOINTMENTS: Get one page of the queue for a specific doctor
+// Returns { items, next_cursor }; pass next_cursor back to get the next page
+export const getDoctorQueue = async (doctorId, cursor = null) => {
+  const response = await api.get(`/appointments/doctor/${doctorId}`, {
+    params: cursor ? { cursor } : {},
   });
   return response.data;
 };
 
-// 5. APPOINTMENTS: Get queue for a specific doctor
-export const getDoctorQueue = async (doctorId) => {
-  const response = await api.get(`/appointments/doctor/${doctorId}`);
+// 5b. APPOINTMENTS: Full appointment (symptoms + AI summary)
+export const getAppointment = async (apptId) => {
+  const response = await api.get(`/appointments/${apptId}`);
   return response.data;
 };
 
@@ -0,0 +1,355 @@
+# File: generate_synthetic_data.py
+"""
+Fills a database with production-sized synthetic data for benchmarks and
+query-plan work, and optionally writes a large medical PDF corpus for the RAG
+store. Everything is drawn from seeded generators: the same seed and
+arguments always produce the same rows and files.
+
+    python generate_synthetic_data.py --reset --users 1000000 --doctors 5000 --appointments 3000000
+    python generate_synthetic_data.py --users 0 --doctors 0 --appointments 0 --corpus backend/data/medical_pdfs --corpus-docs 200
+
+Rows go in through bulk Core INSERTs, --batch-size rows per transaction.
+Secondary indexes are dropped for the load and rebuilt at the end, then the
+tables are ANALYZEd so the planner sees the new distributions.
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+from sqlalchemy import delete, func, insert, select, text
+from sqlalchemy.schema import DropIndex
+
+# Ensure Python can find the backend module
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from backend.app.core import config
+from backend.app.core.database import Base, make_engine, add_missing_columns, add_missing_indexes
+from backend.app.models.users import User
+from backend.app.models.doctors import Doctor
+from backend.app.models.appointments import Appointment
+from backend.app.models import chat_sessions  # noqa: F401  (registers every mapper)
+from backend.app.services.summarizer import SUMMARY_VERSION
+from benchmarks.e2e_fixtures import write_pdf
+
+# Every synthetic account logs in with this password (bcrypt hash precomputed, cost 12)
+SYNTHETIC_PASSWORD = "curacore-synthetic"
+SYNTHETIC_PASSWORD_HASH = "$2b$12$lfo71a/Eu4eMapwxYIuZQOfARgvBSmmzZOR8RQ3mSp0Bxbn.9q/7a"
+
+# --- Distributions ---
+SPECIALIZATIONS = {  # share of doctors, consultation fee range, domain (services/domain_router.py)
+    "General Physician": (0.34, (300, 700), "general"),
+    "Pediatrician": (0.14, (400, 900), "pediatrics"),
+    "Orthopedic": (0.12, (600, 1500), "orthopedics"),
+    "Dermatologist": (0.12, (500, 1200), "dermatology"),
+    "Cardiologist": (0.10, (800, 2000), "cardiology"),
+    "Neurologist": (0.08, (800, 2000), "neurology"),
+    "Gynecologist": (0.10, (500, 1200), "general"),
+}
+LOCATIONS = {"Chennai": 0.34, "Coimbatore": 0.17, "Madurai": 0.14, "Trichy": 0.10, "Salem": 0.09,
+             "Tirunelveli": 0.07, "Vellore": 0.05, "Erode": 0.04}
+QUALIFICATIONS = {"general": ["MBBS", "MBBS, MD (General Medicine)"], "pediatrics": ["MBBS, DCH", "MBBS, MD (Paediatrics)"],
+                  "orthopedics": ["MBBS, MS (Ortho)", "MBBS, D.Ortho"], "dermatology": ["MBBS, DDVL", "MBBS, MD (Dermatology)"],
+                  "cardiology": ["MBBS, MD, DM (Cardiology)"], "neurology": ["MBBS, MD, DM (Neurology)"]}
+FIRST_NAMES = ["Arun", "Priya", "Karthik", "Divya", "Suresh", "Lakshmi", "Vijay", "Meena", "Rahul", "Anitha",
+               "Ganesh", "Kavya", "Mohan", "Revathi", "Sanjay", "Deepa", "Ravi", "Nithya", "Ajay", "Sowmya",
+               "Prakash", "Janani", "Hari", "Keerthi", "Manoj", "Swathi", "Dinesh", "Pooja", "Senthil", "Asha"]
+LAST_NAMES = ["Kumar", "Raj", "Krishnan", "Subramanian", "Natarajan", "Iyer", "Pillai", "Murugan", "Rao", "Reddy",
+              "Sundaram", "Venkatesh", "Balaji", "Shankar", "Rajendran", "Srinivasan", "Pandian", "Selvam"]
+BLOOD_GROUPS = {"O+": 0.37, "B+": 0.31, "A+": 0.21, "AB+": 0.06, "O-": 0.02, "B-": 0.015, "A-": 0.01, "AB-": 0.005}
+GENDERS = {"Female": 0.50, "Male": 0.49, "Other": 0.01}
+AGE_BANDS = {(0, 12): 0.16, (13, 17): 0.06, (18, 35): 0.30, (36, 55): 0.28, (56, 70): 0.14, (71, 92): 0.06}
+SYMPTOMS = {
+    "general": ["fever and body ache for {d} days", "dry cough and sore throat for {d} days",
+                "fatigue and loss of appetite for {d} weeks", "burning sensation while urinating for {d} days"],
+    "pediatrics": ["my child has had a high fever for {d} days", "my baby is vomiting after feeds since {d} days",
+                   "ear pain and crying at night for {d} days"],
+    "orthopedics": ["lower back pain for {d} weeks", "knee pain while climbing stairs for {d} months",
+                    "swollen ankle after a fall {d} days ago"],
+    "dermatology": ["itchy red rash on my arm for {d} days", "acne on face and back for {d} months",
+                    "dry scaly patches on elbows for {d} weeks"],
+    "cardiology": ["chest tightness when climbing stairs for {d} weeks", "palpitations at rest for {d} days",
+                   "breathlessness and swollen feet for {d} weeks"],
+    "neurology": ["severe one-sided headache for {d} days", "numbness in my left hand for {d} weeks",
+                  "dizziness when standing up for {d} days"],
+}
+PAST_STATUSES = {"completed": 0.84, "cancelled": 0.16}
+FUTURE_STATUSES = {"pending": 0.92, "cancelled": 0.08}
+
+# --- RAG corpus ---
+# File names start with a domain keyword, so domain_router.tag_chunks files untagged chunks correctly
+CORPUS_FILE_STEMS = {"cardiology": "heart", "dermatology": "skin", "pediatrics": "child",
+                     "neurology": "brain", "orthopedics": "bone", "general": "general"}
+CORPUS_TERMS = {
+    "cardiology": (["hypertension", "stable angina", "atrial fibrillation", "heart failure"],
+                   ["chest pain", "palpitations", "breathlessness on exertion", "ankle swelling"],
+                   ["amlodipine 5 mg", "metoprolol 25 mg", "atorvastatin 20 mg", "aspirin 75 mg"]),
+    "dermatology": (["atopic eczema", "psoriasis", "acne vulgaris", "tinea corporis"],
+                    ["itching", "scaly plaques", "red papules", "ring shaped rash"],
+                    ["topical hydrocortisone 1%", "clotrimazole cream", "adapalene gel", "cetirizine 10 mg"]),
+    "pediatrics": (["bronchiolitis", "acute otitis media", "measles", "infant colic"],
+                   ["fever in children", "poor feeding", "ear pulling", "persistent crying"],
+                   ["paracetamol 15 mg/kg", "amoxicillin 40 mg/kg", "oral rehydration solution", "vitamin A"]),
+    "neurology": (["migraine", "epilepsy", "peripheral neuropathy", "vertigo"],
+                  ["throbbing headache", "seizures", "numbness of the feet", "dizziness"],
+                  ["sumatriptan 50 mg", "levetiracetam 500 mg", "pregabalin 75 mg", "betahistine 16 mg"]),
+    "orthopedics": (["osteoarthritis of the knee", "lumbar disc prolapse", "osteoporosis", "ankle sprain"],
+                    ["joint pain", "back pain radiating to the leg", "fracture after minor fall", "joint swelling"],
+                    ["ibuprofen 400 mg", "calcium with vitamin D", "diclofenac gel", "physiotherapy"]),
+    "general": (["dengue fever", "typhoid", "type 2 diabetes", "urinary tract infection"],
+                ["high fever", "abdominal discomfort", "increased thirst", "burning micturition"],
+                ["paracetamol 500 mg", "azithromycin 500 mg", "metformin 500 mg", "nitrofurantoin 100 mg"]),
+}
+CORPUS_TEMPLATES = [
+    "{condition} commonly presents with {symptom}.",
+    "Patients with {condition} may report {symptom} for several days before seeking care.",
+    "First line treatment of {condition} includes {drug}.",
+    "{drug} should be reviewed if {symptom} persists after two weeks.",
+    "Red flags in {condition} include worsening {symptom} and should prompt referral.",
+    "Follow up for {condition} is advised every three months.",
+]
+
+def _pick(rng, table: dict, size):
+    keys = list(table)
+    p = np.array(list(table.values()), dtype=np.float64)
+    return [keys[i] for i in rng.choice(len(keys), size=size, p=p / p.sum())]
+
+def _zipf_weights(n, s, rng):
+    """Skewed load: weight 1/rank^s over a seeded shuffle of ids, so popular ids are spread out"""
+    weights = 1.0 / np.arange(1, n + 1) ** s
+    rng.shuffle(weights)
+    return weights / weights.sum()
+
+class Loader:
+    """Bulk Core inserts, one transaction per batch, with progress output"""
+    def __init__(self, engine, batch_size):
+        self.engine = engine
+        self.batch_size = batch_size
+
+    def load(self, table, total, make_rows):
+        started = time.perf_counter()
+        done = 0
+        while done < total:
+            n = min(self.batch_size, total - done)
+            rows = make_rows(done, n)
+            with self.engine.begin() as conn:
+                conn.execute(insert(table), rows)
+            done += n
+            rate = done / max(time.perf_counter() - started, 1e-9)
+            print(f"   ↳ {table.name}: {done:,}/{total:,} ({rate:,.0f} rows/s)", end="\r", flush=True)
+        if total:
+            print(f"✅ {table.name}: {total:,} rows in {time.perf_counter() - started:.1f}s" + " " * 20)
+
+def _next_id(engine, table):
+    with engine.connect() as conn:
+        return (conn.execute(select(func.max(table.c.id))).scalar() or 0) + 1
+
+def generate_doctors(loader, first_id, count, rng):
+    specialties = list(SPECIALIZATIONS)
+    shares = np.array([SPECIALIZATIONS[s][0] for s in specialties])
+    domains = {}
+
+    def rows(offset, n):
+        chosen = rng.choice(len(specialties), size=n, p=shares / shares.sum())
+        locations = _pick(rng, LOCATIONS, n)
+        experience = np.clip(rng.gamma(2.2, 5.5, size=n), 1, 40).astype(int)
+        first, last = rng.integers(0, len(FIRST_NAMES), n), rng.integers(0, len(LAST_NAMES), n)
+        out = []
+        for i in range(n):
+            doctor_id = first_id + offset + i
+            specialty = specialties[chosen[i]]
+            _, (low, high), domain = SPECIALIZATIONS[specialty]
+            domains[doctor_id] = domain
+            # Fees rise with experience, rounded to 50 like real price lists
+            fee = low + (high - low) * min(experience[i], 30) / 30 * rng.uniform(0.7, 1.0)
+            name = f"{FIRST_NAMES[first[i]]} {LAST_NAMES[last[i]]}"
+            out.append({
+                "id": doctor_id,
+                "full_name": f"Dr. {name}",
+                "specialization": specialty,
+                "qualification": QUALIFICATIONS[domain][i % len(QUALIFICATIONS[domain])],
+                "experience_years": int(experience[i]),
+                "location": locations[i],
+                "consultation_fee": int(round(fee / 50) * 50),
+                "email": f"doctor{doctor_id}@synthetic.curacore",
+                "image_url": f"https://ui-avatars.com/api/?name={name.replace(' ', '+')}&background=random",
+            })
+        return out
+
+    loader.load(Doctor.__table__, count, rows)
+    return domains
+
+def generate_users(loader, first_id, count, rng):
+    bands = list(AGE_BANDS)
+    band_p = np.array(list(AGE_BANDS.values()))
+
+    def rows(offset, n):
+        chosen = rng.choice(len(bands), size=n, p=band_p / band_p.sum())
+        genders, blood = _pick(rng, GENDERS, n), _pick(rng, BLOOD_GROUPS, n)
+        first, last = rng.integers(0, len(FIRST_NAMES), n), rng.integers(0, len(LAST_NAMES), n)
+        out = []
+        for i in range(n):
+            user_id = first_id + offset + i
+            low, high = bands[chosen[i]]
+            out.append({
+                "id": user_id,
+                "full_name": f"{FIRST_NAMES[first[i]]} {LAST_NAMES[last[i]]}",
+                "email": f"patient{user_id}@synthetic.curacore",
+                "hashed_password": SYNTHETIC_PASSWORD_HASH,
+                "role": "patient",
+                "age": int(rng.integers(low, high + 1)),
+                "gender": genders[i],
+                "blood_group": blood[i],
+            })
+        return out
+
+    loader.load(User.__table__, count, rows)
+
+def generate_appointments(loader, count, patient_ids, doctor_domains, rng, args):
+    doctor_ids = np.array(sorted(doctor_domains))
+    doctor_p = _zipf_weights(len(doctor_ids), args.doctor_skew, rng)
+    patient_p = _zipf_weights(len(patient_ids), args.patient_skew, rng)
+    end = datetime.fromisoformat(args.end_date)
+    start = end - timedelta(days=args.days)
+    horizon = args.future_days
+    stale_version = f"{SUMMARY_VERSION}-synthetic-old"
+
+    # Clinic hours 09:00-18:00 in 15 minute slots, weekdays busier than weekends
+    day_weights = np.array([1.0 if (start + timedelta(days=d)).weekday() < 5 else 0.45 for d in range(args.days + horizon)])
+    day_p = day_weights / day_weights.sum()
+
+    def rows(offset, n):
+        doctors = doctor_ids[rng.choice(len(doctor_ids), size=n, p=doctor_p)]
+        patients = patient_ids[rng.choice(len(patient_ids), size=n, p=patient_p)]
+        days = rng.choice(len(day_p), size=n, p=day_p)
+        slots = rng.integers(0, 36, size=n)
+        durations = rng.integers(1, 15, size=n)
+        stale = rng.random(n) < args.stale_summaries
+        pending_summary = rng.random(n) < args.pending_summaries
+        past_status, future_status = _pick(rng, PAST_STATUSES, n), _pick(rng, FUTURE_STATUSES, n)
+        out = []
+        for i in range(n):
+            when = start + timedelta(days=int(days[i]), hours=9, minutes=15 * int(slots[i]))
+            status = past_status[i] if when < end else future_status[i]
+            domain = doctor_domains[int(doctors[i])]
+            options = SYMPTOMS[domain]
+            symptom = options[(offset + i) % len(options)].format(d=int(durations[i]))
+            summarised = not pending_summary[i]
+            out.append({
+                "patient_id": int(patients[i]),
+                "doctor_id": int(doctors[i]),
+                "appointment_date": when,
+                "status": status,
+                "symptoms": symptom,
+                "ai_summary": f"Chief complaint: {symptom}. Severity: mild to moderate." if summarised else None,
+                "summary_status": "done" if summarised else "pending",
+                "summary_attempts": 1 if summarised else 0,
+                "summary_version": (stale_version if stale[i] else SUMMARY_VERSION) if summarised else None,
+            })
+        return out
+
+    loader.load(Appointment.__table__, count, rows)
+
+def generate_corpus(folder, docs, pages, lines_per_page, rng):
+    """Multi-page PDFs, cycling through the domains"""
+    os.makedirs(folder, exist_ok=True)
+    domains = list(CORPUS_TERMS)
+    started = time.perf_counter()
+    for n in range(docs):
+        domain = domains[n % len(domains)]
+        conditions, symptoms, drugs = CORPUS_TERMS[domain]
+        doc_pages = []
+        for _ in range(pages):
+            picks = rng.integers(0, 4, size=(lines_per_page, 3))
+            templates = rng.integers(0, len(CORPUS_TEMPLATES), size=lines_per_page)
+            doc_pages.append([
+                CORPUS_TEMPLATES[t].format(condition=conditions[c], symptom=symptoms[s], drug=drugs[d])
+                for t, (c, s, d) in zip(templates, picks)
+            ])
+        write_pdf(os.path.join(folder, f"{CORPUS_FILE_STEMS[domain]}_synthetic_{n:05d}.pdf"), doc_pages)
+    print(f"✅ Corpus: {docs} PDFs x {pages} pages in {folder} ({time.perf_counter() - started:.1f}s)")
+
+def _drop_indexes(engine):
+    """Secondary indexes slow bulk inserts down by an order of magnitude; rebuilt by add_missing_indexes"""
+    tables = [User.__table__, Doctor.__table__, Appointment.__table__]
+    with engine.begin() as conn:
+        for table in tables:
+            for index in table.indexes:
+                conn.execute(DropIndex(index, if_exists=True))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=config.DATABASE_URL)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument("--doctors", type=int, default=2000)
+    parser.add_argument("--appointments", type=int, default=500000)
+    parser.add_argument("--batch-size", type=int, default=20000, help="Rows per INSERT transaction")
+    parser.add_argument("--reset", action="store_true", help="Delete existing users, doctors and appointments first")
+    parser.add_argument("--keep-indexes", action="store_true", help="Insert with secondary indexes in place")
+    # Appointment distributions
+    parser.add_argument("--end-date", default="2025-06-30", help="'Today' for the data set: earlier is history, later is booked")
+    parser.add_argument("--days", type=int, default=730, help="Days of appointment history")
+    parser.add_argument("--future-days", type=int, default=30, help="Days of upcoming bookings")
+    parser.add_argument("--doctor-skew", type=float, default=0.8, help="Zipf exponent of doctor load (0 = uniform)")
+    parser.add_argument("--patient-skew", type=float, default=0.6, help="Zipf exponent of visits per patient")
+    parser.add_argument("--stale-summaries", type=float, default=0.1, help="Share of summaries on an old version")
+    parser.add_argument("--pending-summaries", type=float, default=0.0,
+                        help="Share left for the summary queue (each one is an Ollama call when the API starts)")
+    # RAG corpus
+    parser.add_argument("--corpus", help="Also write a synthetic PDF corpus to this folder")
+    parser.add_argument("--corpus-docs", type=int, default=60)
+    parser.add_argument("--corpus-pages", type=int, default=40)
+    parser.add_argument("--corpus-lines", type=int, default=45, help="Sentences per page")
+    args = parser.parse_args()
+
+    # Independent streams, so e.g. --appointments 0 doesn't change the doctors drawn
+    doctor_rng, user_rng, appt_rng, corpus_rng = (np.random.default_rng([args.seed, n]) for n in range(4))
+
+    engine = make_engine(args.database_url)
+    Base.metadata.create_all(bind=engine)
+    add_missing_columns(engine)
+
+    if args.reset:
+        with engine.begin() as conn:
+            for table in (Appointment.__table__, User.__table__, Doctor.__table__):
+                conn.execute(delete(table))
+        print("🧹 Cleared users, doctors and appointments")
+    if not args.keep_indexes and (args.users or args.doctors or args.appointments):
+        _drop_indexes(engine)
+
+    loader = Loader(engine, args.batch_size)
+    print(f"🌱 Generating {args.doctors:,} doctors, {args.users:,} patients, {args.appointments:,} appointments (seed {args.seed})")
+    try:
+        first_doctor = _next_id(engine, Doctor.__table__)
+        doctor_domains = generate_doctors(loader, first_doctor, args.doctors, doctor_rng)
+        first_user = _next_id(engine, User.__table__)
+        generate_users(loader, first_user, args.users, user_rng)
+
+        if args.appointments:
+            if not doctor_domains:
+                # Appending appointments only: book them with the doctors already there
+                with engine.connect() as conn:
+                    existing = conn.execute(select(Doctor.__table__.c.id, Doctor.__table__.c.specialization)).all()
+                doctor_domains = {doctor_id: SPECIALIZATIONS.get(spec, (0, 0, "general"))[2] for doctor_id, spec in existing}
+            with engine.connect() as conn:
+                patient_ids = np.array(conn.execute(
+                    select(User.__table__.c.id).where(User.__table__.c.role == "patient")).scalars().all())
+            if not doctor_domains or not len(patient_ids):
+                raise SystemExit("❌ Appointments need at least one doctor and one patient")
+            generate_appointments(loader, args.appointments, patient_ids, doctor_domains, appt_rng, args)
+    finally:
+        print("🔧 Rebuilding indexes...")
+        add_missing_indexes(engine)
+        with engine.begin() as conn:
+            conn.execute(text("ANALYZE"))
+
+    if args.corpus:
+        generate_corpus(args.corpus, args.corpus_docs, args.corpus_pages, args.corpus_lines, corpus_rng)
+        print(f"📚 Ingest it with: python ingest_pdfs.py --folder {args.corpus}")
+    print(f"🎉 Done. Synthetic accounts log in with password '{SYNTHETIC_PASSWORD}'.")
+
+if __name__ == "__main__":
+    main()
@@ -1,38 +1,63 @@
-# File: D:\CuraCore\ingest_pdfs.py
-import os
-import sys
-
-# Ensure Python can find the backend module
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-
-from backend.app.services.rag_service import rag_service
-
-PDF_FOLDER = "backend/data/medical_pdfs"
-
-def main():
-    print(f"📂 Scanning '{PDF_FOLDER}' for medical documents...")
-    
-    if not os.path.exists(PDF_FOLDER):
-        print(f"❌ Error: Folder '{PDF_FOLDER}' not found!")
-        return
-
-    files = [f for f in os.listdir(PDF_FOLDER) if f.endswith(".pdf")]
-    
-    if not files:
-        print("⚠️ No PDFs found. Please add some files first.")
-        return
-
-    print(f"found {len(files)} PDFs. Starting ingestion...")
-
-    for file in files:
-        path = os.path.join(PDF_FOLDER, file)
-        try:
-            rag_service.ingest_file(path)
-            print(f"✅ Successfully ingested: {file}")
-        except Exception as e:
-            print(f"❌ Failed to ingest {file}: {str(e)}")
-
-    print("\n🎉 Brain Upgrade Complete! The AI now knows your documents.")
-
-if __name__ == "__main__":
-    main()
\ No newline at end of file
+# File: D:\CuraCore\ingest_pdfs.py
+import argparse
+import os
+import sys
+
+# Ensure Python can find the backend module
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# NOTE: rag_service is NOT imported here. Worker processes re-import this
+# module on spawn-based platforms (Windows), and must not load the model.
+from backend.app.services.ingest_pipeline import run_ingest, DEFAULT_EMBED_BATCH_SIZE, DEFAULT_STREAM_ABOVE_MB
+
+PDF_FOLDER = "backend/data/medical_pdfs"
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingest medical PDFs into the RAG store")
+    parser.add_argument("--folder", default=PDF_FOLDER)
+    parser.add_argument("--workers", type=int, default=None, help="Extraction processes (default: cores - 1)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_EMBED_BATCH_SIZE, help="Chunks per embedding batch")
+    parser.add_argument("--force", action="store_true", help="Re-ingest every file, ignoring the manifest")
+    parser.add_argument("--no-prune", action="store_true", help="Keep chunks of PDFs deleted from the folder")
+    parser.add_argument("--stream", action="store_true", help="Stream every file page by page (bounded memory, no pool)")
+    parser.add_argument("--stream-above-mb", type=float, default=DEFAULT_STREAM_ABOVE_MB,
+                        help="Stream files larger than this (bounded memory); smaller files are chunked "
+                             "whole in a worker, so their memory use grows with the file")
+    parser.add_argument("--rebuild-bm25", action="store_true", help="Rebuild the BM25 index from the vector store and exit")
+    args = parser.parse_args()
+
+    if args.rebuild_bm25:
+        from backend.app.services.rag_service import rag_service
+        print(f"🔤 Rebuilt BM25 index over {rag_service.rebuild_lexical_index()} chunks.")
+        return
+
+    print(f"📂 Scanning '{args.folder}' for medical documents...")
+    
+    if not os.path.exists(args.folder):
+        print(f"❌ Error: Folder '{args.folder}' not found!")
+        return
+
+    files = [f for f in os.listdir(args.folder) if f.endswith(".pdf")]
+    
+    if not files:
+        print("⚠️ No PDFs found. Please add some files first.")
+        return
+
+    print(f"found {len(files)} PDFs. Starting ingestion...")
+
+    stats = run_ingest(
+        args.folder,
+        workers=args.workers,
+        embed_batch_size=args.batch_size,
+        force=args.force,
+        prune=not args.no_prune,
+        stream=args.stream,
+        stream_above_mb=args.stream_above_mb,
+    )
+
+    print(f"\n📊 Ingested {stats['ingested']} | Skipped {stats['skipped']} | Failed {stats['failed']} | "
+          f"Removed {stats['removed']} | {stats['chunks']} chunks in {stats['seconds']}s")
+    print("\n🎉 Brain Upgrade Complete! The AI now knows your documents.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# File: regenerate_summaries.py
+import argparse
+import os
+import sys
+from datetime import datetime
+
+# Ensure Python can find the backend module
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from backend.app.core.database import engine, Base, add_missing_columns, add_missing_indexes
+from backend.app.models import users, doctors, appointments, chat_sessions  # Registers every mapper
+from backend.app.services.summary_backfill import run_backfill, DEFAULT_BATCH_SIZE, DEFAULT_CONCURRENCY
+from backend.app.services.summarizer import SUMMARY_VERSION
+
+def _date(value):
+    return datetime.fromisoformat(value)
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=f"Regenerate appointment AI summaries (current version: {SUMMARY_VERSION})")
+    parser.add_argument("--status", action="append", help="Appointment status to include (repeatable), e.g. pending")
+    parser.add_argument("--since", type=_date, help="Appointments on/after this date (YYYY-MM-DD)")
+    parser.add_argument("--until", type=_date, help="Appointments before this date (YYYY-MM-DD)")
+    parser.add_argument("--doctor-id", type=int)
+    parser.add_argument("--missing", action="store_true", help="Only rows without any summary")
+    parser.add_argument("--force", action="store_true", help="Regenerate even rows already on the current version")
+    parser.add_argument("--limit", type=int, help="Stop after this many rows")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Rows per bulk update + checkpoint")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Parallel Ollama requests")
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint of an interrupted run")
+    parser.add_argument("--dry-run", action="store_true", help="Only count matching rows")
+    args = parser.parse_args()
+
+    # The database may predate summary_version / chat sessions
+    Base.metadata.create_all(bind=engine)
+    add_missing_columns(engine)
+    add_missing_indexes(engine)
+
+    stats = run_backfill(
+        statuses=args.status,
+        since=args.since,
+        until=args.until,
+        doctor_id=args.doctor_id,
+        only_missing=args.missing,
+        force=args.force,
+        limit=args.limit,
+        batch_size=args.batch_size,
+        concurrency=args.concurrency,
+        restart=args.restart,
+        dry_run=args.dry_run,
+    )
+
+    print(f"\n📊 Updated {stats['updated']} | Failed {stats['failed']} | Pending {stats['pending']} | "
+          f"{stats['seconds']}s ({stats['per_minute']} summaries/min)")
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,69 @@
-import uvicorn
-
-if __name__ == "__main__":
-    uvicorn.run("backend.app.main:app", host="127.0.0.1", port=8001, reload=True)
\ No newline at end of file
+import argparse
+import os
+import subprocess
+import sys
+import time
+import uvicorn
+
+DEFAULT_MODEL_SERVER = r"\\.\pipe\curacore-models" if sys.platform == "win32" else "backend/data/model_server.sock"
+
+def start_model_server(address, timeout=60):
+    """Spawns services/model_server.py and waits until it accepts connections"""
+    from backend.app.services.model_client import ModelClient, ModelServerError
+    proc = subprocess.Popen([sys.executable, "-m", "backend.app.services.model_server", "--address", address])
+    client = ModelClient(address)
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            client.status()
+            client.close()
+            return proc
+        except ModelServerError:
+            if proc.poll() is not None or time.monotonic() > deadline:
+                proc.kill()
+                raise SystemExit(f"❌ Model server did not start on {address}")
+            time.sleep(0.2)
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the CuraCore API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--workers", type=int, default=int(os.getenv("CURACORE_WORKERS", 1)),
+                        help="API worker processes; above 1 they share one model server and reload is off. "
+                             "Ollama and summary limits are totals split between the workers (at least 1 each)")
+    parser.add_argument("--model-server", default=None,
+                        help="Address of an already running model server (default: spawn one when --workers > 1)")
+    args = parser.parse_args()
+
+    if args.workers <= 1 and not args.model_server:
+        # Development: one process, models loaded in-process, auto-reload
+        uvicorn.run("backend.app.main:app", host=args.host, port=args.port, reload=True)
+        return
+
+    # Production: N workers, the embedding model and Whisper loaded once in a shared process
+    address = args.model_server or DEFAULT_MODEL_SERVER
+    model_server = None if args.model_server else start_model_server(address)
+
+    # Tables / migrations and interrupted summary jobs are handled once here,
+    # not raced by every worker on start-up
+    import backend.app.main  # noqa: F401  (create_all + add_missing_columns)
+    from backend.app.services.summary_queue import SummaryQueue
+    SummaryQueue.reset_interrupted()
+
+    # Each worker has its own Ollama pool: it takes its share of the configured limits
+    from backend.app.core import config
+    if args.workers > config.OLLAMA_MAX_IN_FLIGHT:
+        print(f"⚠️ {args.workers} workers but CURACORE_OLLAMA_MAX_IN_FLIGHT={config.OLLAMA_MAX_IN_FLIGHT}: "
+              f"every worker still gets one slot, so up to {args.workers} generations can run at once")
+    os.environ["CURACORE_API_WORKERS"] = str(args.workers)
+    os.environ["CURACORE_MODEL_SERVER"] = address
+    os.environ["CURACORE_SUMMARY_RESET_RUNNING"] = "0"
+    try:
+        uvicorn.run("backend.app.main:app", host=args.host, port=args.port, workers=args.workers)
+    finally:
+        if model_server is not None:
+            model_server.terminate()
+            model_server.wait(timeout=10)
+
+if __name__ == "__main__":
+    main()
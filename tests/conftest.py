@@ -0,0 +1,15 @@
+# File: tests/conftest.py
+import os
+import sys
+import tempfile
+
+# Ensure Python can find the backend module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Server state (SQLite DB, JWT secret) goes to a throwaway directory, set before
+# any backend module reads its config
+_STATE_DIR = tempfile.mkdtemp(prefix="curacore_tests_")
+os.environ.setdefault("CURACORE_DATABASE_URL", f"sqlite:///{os.path.join(_STATE_DIR, 'test.db')}")
+os.environ.setdefault("CURACORE_JWT_SECRET", "curacore-test-secret")
+os.environ.setdefault("CURACORE_BCRYPT_WORKERS", "0")
+os.environ.setdefault("CURACORE_BCRYPT_ROUNDS", "4")
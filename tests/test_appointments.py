@@ -0,0 +1,108 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, insert
+from backend.app.main import app
+from backend.app.core.database import SessionLocal, engine
+from backend.app.core.security import create_access_token
+from backend.app.models.appointments import Appointment
+from backend.app.models.doctors import Doctor
+from backend.app.api import appointments
+from backend.app.api.appointments import _decode_cursor, _encode_cursor
+
+client = TestClient(app)
+
+@pytest.fixture
+def queue():
+    """Doctor 7's pending queue: 25 appointments, several sharing a timestamp"""
+    start = datetime(2025, 1, 6, 9, 0)
+    rows = [{
+        "id": 1000 + n,
+        "patient_id": 1,
+        "doctor_id": 7,
+        "appointment_date": start + timedelta(minutes=15 * (n // 3)),
+        "status": "pending" if n % 5 else "completed",
+        "symptoms": "fever",
+        "summary_status": "done",
+    } for n in range(30)]
+    with engine.begin() as conn:
+        conn.execute(delete(Appointment).where(Appointment.doctor_id == 7))
+        conn.execute(insert(Appointment), rows)
+    yield [row for row in rows if row["status"] == "pending"]
+    with engine.begin() as conn:
+        conn.execute(delete(Appointment).where(Appointment.doctor_id == 7))
+
+def test_cursor_round_trip():
+    when = datetime(2025, 3, 1, 10, 30, 15, 123456)
+    assert _decode_cursor(_encode_cursor(when, 42)) == (when, 42)
+
+@pytest.mark.parametrize("cursor", ["not-base64!", "Zm9v", _encode_cursor(datetime(2025, 1, 1), 1)[:-4]])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as error:
+        _decode_cursor(cursor)
+    assert error.value.status_code == 400
+
+def test_bad_cursor_returns_400():
+    resp = client.get("/api/appointments/doctor/7", params={"cursor": "garbage"})
+    assert resp.status_code == 400
+
+def test_keyset_pages_walk_the_queue_once_in_order(queue):
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 4, **({"cursor": cursor} if cursor else {})}
+        page = client.get("/api/appointments/doctor/7", params=params).json()
+        assert len(page["items"]) <= 4
+        seen.extend(item["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    expected = [row["id"] for row in sorted(queue, key=lambda row: (row["appointment_date"], row["id"]))]
+    assert seen == expected
+
+def _bearer(user_id, role="patient", email=None):
+    user = SimpleNamespace(id=user_id, email=email or f"user{user_id}@example.com", full_name="Test User", role=role)
+    return {"Authorization": f"Bearer {create_access_token(user)}"}
+
+def test_booking_requires_a_token():
+    resp = client.post("/api/appointments/", json={"doctor_id": 7, "symptoms": "fever"})
+    assert resp.status_code == 401
+
+def test_booking_is_for_the_signed_in_patient(monkeypatch):
+    queued = []
+    monkeypatch.setattr(appointments.summary_queue, "enqueue", queued.append)
+    # A patient_id in the body is ignored: nobody can book in someone else's name
+    resp = client.post("/api/appointments/", headers=_bearer(42),
+                       json={"doctor_id": 8, "patient_id": 1, "symptoms": "fever and rash"})
+    assert resp.status_code == 200
+
+    appointment_id = resp.json()["id"]
+    assert queued == [appointment_id]
+    with SessionLocal() as db:
+        assert db.get(Appointment, appointment_id).patient_id == 42
+        db.execute(delete(Appointment).where(Appointment.id == appointment_id))
+        db.commit()
+
+def test_detail_is_only_for_the_patient_and_their_doctor():
+    with SessionLocal() as db:
+        db.add(Doctor(id=710, full_name="Dr. Kavya Nair", email="kavya@clinic.example"))
+        db.add(Doctor(id=711, full_name="Dr. Other", email="other@clinic.example"))
+        db.add(Appointment(id=7100, patient_id=42, doctor_id=710, symptoms="chest pain", summary_status="done"))
+        db.commit()
+    doctor = _bearer(9710, role="doctor", email="kavya@clinic.example")
+    other_doctor = _bearer(9711, role="doctor", email="other@clinic.example")
+    try:
+        assert client.get("/api/appointments/7100").status_code == 401
+        assert client.get("/api/appointments/7100", headers=_bearer(42)).json()["symptoms"] == "chest pain"
+        assert client.get("/api/appointments/7100", headers=doctor).status_code == 200
+        assert client.get("/api/appointments/7100", headers=_bearer(43)).status_code == 404
+        assert client.get("/api/appointments/7100", headers=other_doctor).status_code == 404
+        # A doctor role without a matching doctors row is just another user
+        assert client.get("/api/appointments/7100", headers=_bearer(44, role="doctor")).status_code == 404
+    finally:
+        with SessionLocal() as db:
+            db.execute(delete(Appointment).where(Appointment.id == 7100))
+            db.execute(delete(Doctor).where(Doctor.id.in_([710, 711])))
+            db.commit()
@@ -0,0 +1,81 @@
+import asyncio
+import uuid
+from types import SimpleNamespace
+import pytest
+from fastapi.testclient import TestClient
+from backend.app.main import app
+from backend.app.core import database
+from backend.app.core.security import create_access_token
+from backend.app.services.chat_sessions import chat_sessions
+
+client = TestClient(app)
+
+def _bearer(user_id):
+    user = SimpleNamespace(id=user_id, email=f"user{user_id}@example.com", full_name="Test User", role="patient")
+    return {"Authorization": f"Bearer {create_access_token(user)}"}
+
+@pytest.fixture(params=["aiosqlite", "threadpool"])
+def session_kind(request, monkeypatch):
+    if request.param == "aiosqlite":
+        if not database.async_db_available():
+            pytest.skip("aiosqlite not installed")
+    else:
+        monkeypatch.setattr(database, "AsyncSessionLocal", None)
+    return request.param
+
+def test_async_session_matches_the_configured_path(session_kind):
+    session = database.async_session()
+    expected = database.ThreadpoolSession if session_kind == "threadpool" else database.AsyncSessionLocal.class_
+    assert isinstance(session, expected)
+    asyncio.run(session.close())
+
+def test_signup_and_login(session_kind):
+    email = f"{uuid.uuid4().hex}@example.com"
+    signup = client.post("/api/auth/signup", json={"full_name": "Asha Rao", "email": email, "password": "pw-123456"})
+    assert signup.status_code == 200 and signup.json()["user_id"] > 0
+    assert client.post("/api/auth/signup", json={"full_name": "Asha Rao", "email": email, "password": "x"}).status_code == 400
+
+    login = client.post("/api/auth/login", json={"email": email, "password": "pw-123456"})
+    assert login.status_code == 200
+    assert login.json()["user_id"] == signup.json()["user_id"]
+    assert client.post("/api/auth/login", json={"email": email, "password": "wrong"}).status_code == 400
+    assert client.post("/api/auth/login", json={"email": "nobody@example.com", "password": "x"}).status_code == 404
+
+def test_chat_session_round_trip(session_kind, monkeypatch):
+    scheduled = []
+    monkeypatch.setattr(chat_sessions, "schedule_summary", scheduled.append)
+    # The owner comes from the token; a patient_id in the body is ignored
+    session_id = client.post("/api/chat/sessions", headers=_bearer(3), json={"patient_id": 4}).json()["session_id"]
+
+    async def two_turns():
+        async with database.async_session() as db:
+            await chat_sessions.append_turn(db, session_id, "I have a fever", "How long has it lasted?")
+        async with database.async_session() as db:
+            await chat_sessions.append_turn(db, session_id, "Two days", "Please rest and drink fluids.")
+            return await chat_sessions.history_async(db, session_id)
+
+    history = asyncio.run(two_turns())
+    assert history["message_count"] == 4
+    assert history["recent"][-1] == ("assistant", "Please rest and drink fluids.")
+    assert scheduled == [session_id, session_id]
+    assert chat_sessions.history(session_id) == history  # Sync path sees the same rows
+
+    body = client.get(f"/api/chat/sessions/{session_id}", headers=_bearer(3)).json()
+    assert [message["content"] for message in body["messages"]] == [
+        "I have a fever", "How long has it lasted?", "Two days", "Please rest and drink fluids.",
+    ]
+    assert body["summary_up_to_date"] is False
+    assert client.get("/api/chat/sessions/missing", headers=_bearer(3)).status_code == 404
+
+def test_chat_sessions_belong_to_the_signed_in_patient(session_kind):
+    assert client.post("/api/chat/sessions").status_code == 401
+    session_id = client.post("/api/chat/sessions", headers=_bearer(5)).json()["session_id"]
+
+    assert client.get(f"/api/chat/sessions/{session_id}").status_code == 401
+    assert client.get(f"/api/chat/sessions/{session_id}", headers=_bearer(5)).status_code == 200
+    # Someone else's session looks exactly like a missing one, for reading, chatting and booking
+    assert client.get(f"/api/chat/sessions/{session_id}", headers=_bearer(6)).status_code == 404
+    assert client.post("/api/chat/", headers=_bearer(6), json={"message": "hi", "session_id": session_id}).status_code == 404
+    assert client.post("/api/chat/", json={"message": "hi", "session_id": session_id}).status_code == 404
+    booking = client.post("/api/appointments/", headers=_bearer(6), json={"doctor_id": 1, "symptoms": "x", "session_id": session_id})
+    assert booking.status_code == 404
@@ -0,0 +1,59 @@
+import uuid
+from types import SimpleNamespace
+from fastapi.testclient import TestClient
+from sqlalchemy import delete
+from backend.app.main import app
+from backend.app.core.database import SessionLocal
+from backend.app.core.security import create_access_token
+from backend.app.models.appointments import Appointment
+from backend.app.models.doctors import Doctor
+
+client = TestClient(app)
+
+def _signup(role=None):
+    email = f"{uuid.uuid4().hex}@example.com"
+    body = {"full_name": "Ravi Kumar", "email": email, "password": "pw-123456", **({"role": role} if role else {})}
+    assert client.post("/api/auth/signup", json=body).json()["role"] == "patient"
+    login = client.post("/api/auth/login", json={"email": email, "password": "pw-123456"}).json()
+    return login["user_id"], {"Authorization": f"Bearer {login['access_token']}"}
+
+def test_me_reads_the_token():
+    user_id, headers = _signup()
+    assert client.get("/api/auth/me", headers=headers).json()["user_id"] == user_id
+    assert client.get("/api/auth/me").status_code == 401
+    assert client.get("/api/auth/me", headers={"Authorization": "Bearer not-a-token"}).status_code == 401
+
+def test_profile_is_private_and_never_exposes_the_password_hash():
+    user_id, headers = _signup()
+    other_id, other_headers = _signup()
+
+    assert client.get(f"/api/auth/profile/{user_id}").status_code == 401
+    assert client.get(f"/api/auth/profile/{user_id}", headers=other_headers).status_code == 403
+
+    own = client.get(f"/api/auth/profile/{user_id}", headers=headers)
+    assert own.status_code == 200
+    assert own.json()["id"] == user_id and "hashed_password" not in own.json()
+
+def test_self_signup_cannot_become_a_doctor():
+    user_id, _ = _signup()
+    other_id, other_headers = _signup(role="doctor")
+    assert client.get("/api/auth/me", headers=other_headers).json()["role"] == "patient"
+    assert client.get(f"/api/auth/profile/{user_id}", headers=other_headers).status_code == 403
+
+def test_doctors_only_see_patients_who_booked_with_them():
+    patient_id, _ = _signup()
+    stranger_id, _ = _signup()
+    with SessionLocal() as db:
+        db.add(Doctor(id=700, full_name="Dr. Asha Menon", email="asha@clinic.example"))
+        db.add(Appointment(id=7000, patient_id=patient_id, doctor_id=700, symptoms="cough"))
+        db.commit()
+    doctor = SimpleNamespace(id=9700, email="asha@clinic.example", full_name="Dr. Asha Menon", role="doctor")
+    headers = {"Authorization": f"Bearer {create_access_token(doctor)}"}
+    try:
+        assert client.get(f"/api/auth/profile/{patient_id}", headers=headers).status_code == 200
+        assert client.get(f"/api/auth/profile/{stranger_id}", headers=headers).status_code == 403
+    finally:
+        with SessionLocal() as db:
+            db.execute(delete(Appointment).where(Appointment.id == 7000))
+            db.execute(delete(Doctor).where(Doctor.id == 700))
+            db.commit()
@@ -0,0 +1,50 @@
+from backend.app.services.bm25_index import BM25Index, reciprocal_rank_fusion, tokenize
+
+def _index(tmp_path):
+    index = BM25Index(str(tmp_path / "bm25.pkl"))
+    index.add(
+        ["dm_0", "dm_1", "htn_0"],
+        [
+            "Type 2 diabetes mellitus without complications is coded E11.9.",
+            "Metformin 500mg twice daily is first line for type 2 diabetes.",
+            "Essential hypertension is coded I10 and treated with amlodipine.",
+        ],
+        ["diabetes.pdf", "diabetes.pdf", "hypertension.pdf"],
+    )
+    return index
+
+def test_tokenizer_keeps_codes_and_doses_whole():
+    assert tokenize("Code E11.9, dose 500mg / 0.5 ml") == ["code", "e11.9", "dose", "500mg", "0.5", "ml"]
+
+def test_exact_code_ranks_its_chunk_first(tmp_path):
+    index = _index(tmp_path)
+    assert index.search("what is E11.9", k=3)[0][0] == "dm_0"
+    assert index.search("I10", k=3)[0][0] == "htn_0"
+    assert index.search("zika", k=3) == []
+
+def test_remove_source_and_persistence(tmp_path):
+    index = _index(tmp_path)
+    index.remove_source("diabetes.pdf")
+    assert len(index) == 1
+    assert index.search("metformin") == []
+    index.save()
+
+    reloaded = BM25Index(index.path)
+    reloaded.load()
+    assert [doc_id for doc_id, _ in reloaded.search("amlodipine")] == ["htn_0"]
+    assert reloaded.total_len == index.total_len
+
+def test_re_adding_an_id_replaces_it(tmp_path):
+    index = _index(tmp_path)
+    index.add(["dm_1"], ["Insulin glargine once nightly."], ["diabetes.pdf"])
+    assert index.search("metformin") == []
+    assert index.search("glargine")[0][0] == "dm_1"
+
+def test_rrf_rewards_agreement_between_rankings():
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["d", "b", "e"]], k=60)
+    assert fused[0] == "b"  # Second in both beats first in one
+    assert set(fused) == {"a", "b", "c", "d", "e"}
+    assert fused.index("a") < fused.index("c")
+
+def test_rrf_single_ranking_keeps_order():
+    assert reciprocal_rank_fusion([["x", "y", "z"]]) == ["x", "y", "z"]
@@ -0,0 +1,61 @@
+import json
+import pytest
+from fastapi.testclient import TestClient
+from backend.app.main import app
+from backend.app.api import chat
+from backend.app.services.llm_service import NO_CONTEXT_REPLY
+from backend.app.services.ollama_client import ollama_pool
+
+client = TestClient(app)
+
+CONTEXT = ["Dengue presents with high fever, headache and joint pain.", "Rest and oral fluids are advised."]
+
+@pytest.fixture
+def retrieval(monkeypatch):
+    """Stubs retrieval and Ollama; returns the knobs a test can turn"""
+    state = {"scores": [0.8, 0.6], "lexical": [0.9, 0.4], "cached": None, "prompts": []}
+    monkeypatch.setattr(chat.config, "SEMANTIC_CACHE_ENABLED", False)
+    monkeypatch.setattr(chat, "_retrieve", lambda query, use_cache=True, specialty=None: (
+        [0.0], state["cached"]["sources"] if state["cached"] else CONTEXT, state["scores"], state["lexical"], state["cached"]))
+
+    async def stream_chat(model, messages):
+        state["prompts"].append((model, messages))
+        for token in ["Dengue ", "", "causes ", "fever."]:  # Empty chunks are skipped
+            yield {"message": {"content": token}}
+    monkeypatch.setattr(ollama_pool, "stream_chat", stream_chat)
+    return state
+
+def _events(resp):
+    assert resp.status_code == 200
+    return [json.loads(line) for line in resp.text.splitlines() if line]
+
+def test_stream_is_sources_then_tokens_then_done(retrieval):
+    events = _events(client.post("/api/chat/stream", json={"message": "What are the symptoms of dengue?"}))
+
+    assert [event["type"] for event in events] == ["sources", "token", "token", "token", "done"]
+    assert events[0]["sources"] == CONTEXT and events[0]["cached"] is False
+    assert events[0]["tier"] in ("small", "large") and events[0]["prompt_tokens"] > 0
+    assert "".join(event["content"] for event in events[1:-1]) == "Dengue causes fever."
+    assert events[-1] == {"type": "done", "session_id": None}
+
+    model, messages = retrieval["prompts"][0]
+    assert model == events[0]["model"]
+    assert CONTEXT[0] in messages[0]["content"]
+
+def test_cached_answer_streams_as_one_token(retrieval):
+    retrieval["cached"] = {"reply": "Cached dengue answer.", "sources": ["cached source"], "similarity": 0.99}
+    events = _events(client.post("/api/chat/stream", json={"message": "dengue symptoms?"}))
+
+    assert [event["type"] for event in events] == ["sources", "token", "done"]
+    assert events[0] == {"type": "sources", "sources": ["cached source"], "cached": True}
+    assert events[1]["content"] == "Cached dengue answer."
+    assert retrieval["prompts"] == []
+
+def test_gated_question_streams_the_canned_reply_without_the_llm(retrieval):
+    retrieval["scores"], retrieval["lexical"] = [0.05], [0.0]
+    events = _events(client.post("/api/chat/stream", json={"message": "What is the airspeed of a swallow?"}))
+
+    assert [event["type"] for event in events] == ["sources", "token", "done"]
+    assert events[0]["tier"] == "gated" and events[0]["sources"] == []
+    assert events[1]["content"] == NO_CONTEXT_REPLY
+    assert retrieval["prompts"] == []
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+from backend.app.core import config
+from backend.app.services.bm25_index import BM25Index
+from backend.app.services.llm_service import llm_service
+from backend.app.services.rag_service import RAGService
+from backend.app.services.vector_store import QuantizedVectorStore
+
+DIM = 8
+CHUNKS = [
+    "ICD code E11.9 is type 2 diabetes mellitus without complications.",
+    "ICD code I10 is essential (primary) hypertension.",
+    "Paracetamol 500 mg every six hours relieves fever and mild pain.",
+    "Salbutamol inhalers relieve wheezing in asthma attacks.",
+    "Amoxicillin is a first line antibiotic for otitis media in children.",
+    "Oral rehydration solution treats dehydration from diarrhoea.",
+]
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    """A RAGService over a tiny corpus whose embeddings know nothing of the test queries"""
+    monkeypatch.setattr(config, "HYBRID_SEARCH_ENABLED", True)
+    service = object.__new__(RAGService)
+    service.store = QuantizedVectorStore(str(tmp_path / "vectors"))
+    service.bm25 = BM25Index(str(tmp_path / "bm25.pkl"))
+    service._bm25_version = service.data_version()
+
+    embeddings = np.zeros((len(CHUNKS), DIM), dtype=np.float32)
+    embeddings[np.arange(len(CHUNKS)), np.arange(len(CHUNKS)) % 4] = 1.0
+    ids = [f"formulary.pdf_{n}" for n in range(len(CHUNKS))]
+    metas = [{"source": "formulary.pdf", "page": 1, "domain": "general"} for _ in CHUNKS]
+    service.add_chunks(ids, CHUNKS, metas, embeddings=embeddings.tolist())
+    return service
+
+def _orthogonal_query():
+    embedding = [0.0] * DIM
+    embedding[DIM - 1] = 1.0  # No chunk points this way: every cosine is 0
+    return embedding
+
+def test_exact_code_match_is_not_gated(service):
+    query = "What does ICD code E11.9 mean?"
+    documents, scores, lexical = service.search_by_embedding(_orthogonal_query(), k=3, query_text=query, with_scores=True)
+
+    assert documents[0] == CHUNKS[0]
+    assert max(score for score in scores if score is not None) < config.CONFIDENCE_MIN_SCORE
+    assert lexical[0] >= config.CONFIDENCE_MIN_LEXICAL
+
+    plan = llm_service.plan(query, scores, lexical)
+    assert plan["tier"] != "gated"
+    assert plan["lexical"] == round(lexical[0], 4)
+
+def test_nothing_relevant_is_still_gated(service):
+    query = "What is the treatment for xerophthalmia?"
+    _, scores, lexical = service.search_by_embedding(_orthogonal_query(), k=3, query_text=query, with_scores=True)
+    assert llm_service.plan(query, scores, lexical)["tier"] == "gated"
+
+def test_coverage_weights_rare_terms():
+    index = BM25Index("unused.pkl")
+    index.add(["a", "b"], CHUNKS[:2], ["formulary.pdf"] * 2)
+    assert index.coverage("ICD code E11.9", "a") == 1.0
+    assert index.coverage("ICD code E11.9", "b") < 0.5  # Shares only the common words
+    assert index.coverage("What does E11.9 mean?", "a") == 1.0  # Question words are not evidence either way
+    assert index.coverage("E11.9", "missing") == 0.0
+    assert index.coverage("", "a") == 0.0
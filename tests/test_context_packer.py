@@ -0,0 +1,43 @@
+from backend.app.services.context_packer import estimate_tokens, pack_context
+
+SENTENCES = [
+    f"Sentence {n} describes how dengue fever presents with fever, headache and joint pain." for n in range(40)
+]
+TEXT = " ".join(SENTENCES)
+
+def test_overlapping_neighbours_are_stitched_once():
+    # Two splitter-style chunks sharing a 200 character overlap
+    first, second = TEXT[:1000], TEXT[800:1800]
+    packed = pack_context([first, second], budget_tokens=10_000)
+
+    assert packed["chunks"] == [TEXT[:1800]]
+    assert packed["stats"]["merged"] == 1
+
+def test_duplicates_and_contained_chunks_are_dropped():
+    chunk = TEXT[:600]
+    packed = pack_context([chunk, chunk, TEXT[100:300]], budget_tokens=10_000)
+
+    assert packed["chunks"] == [chunk]
+    assert packed["stats"]["deduplicated"] == 2
+
+def test_unrelated_chunks_keep_rank_order():
+    a = "Typhoid is confirmed with a blood culture in the first week of fever."
+    b = "Salbutamol relieves wheezing by relaxing the airway muscles."
+    assert pack_context([b, a], budget_tokens=10_000)["chunks"] == [b, a]
+
+def test_budget_is_respected_and_last_passage_truncated_at_a_sentence():
+    chunks = [" ".join(SENTENCES[i:i + 10]) for i in range(0, 40, 10)]
+    budget = estimate_tokens(chunks[0]) + 100
+    packed = pack_context(chunks, budget_tokens=budget)
+
+    assert packed["tokens"] <= budget
+    assert packed["chunks"][0] == chunks[0]
+    assert packed["stats"]["truncated"] == 1
+    assert packed["chunks"][1].endswith(".")
+    assert packed["stats"]["dropped"] == 2
+
+def test_tiny_remaining_budget_drops_instead_of_truncating():
+    chunks = [" ".join(SENTENCES[:10]), " ".join(SENTENCES[10:20])]
+    packed = pack_context(chunks, budget_tokens=estimate_tokens(chunks[0]) + 10)
+    assert packed["chunks"] == [chunks[0]]
+    assert packed["stats"]["truncated"] == 0
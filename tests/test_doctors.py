@@ -0,0 +1,91 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, event, text
+from backend.app.main import app
+from backend.app.core.database import SessionLocal, engine
+from backend.app.models.doctors import Doctor
+from backend.app.api.doctors import doctor_cache
+
+client = TestClient(app)
+
+DOCTORS = [
+    ("Dr. Priya Sharma", "Cardiologist", "Mumbai"),
+    ("Dr. Pranav Rao", "Dermatologist", "Pune"),
+    ("Dr. Arjun Priyadarshi", "Cardiologist", "Navi Mumbai"),
+    ("Meera Iyer", "Pediatrician", "mumbai"),
+]
+
+@pytest.fixture
+def doctors():
+    with SessionLocal() as db:
+        db.execute(delete(Doctor))
+        db.add_all([
+            Doctor(id=500 + n, full_name=name, specialization=specialization, location=location,
+                   consultation_fee=500, experience_years=10)
+            for n, (name, specialization, location) in enumerate(DOCTORS)
+        ])
+        db.commit()
+    yield
+    with SessionLocal() as db:
+        db.execute(delete(Doctor))
+        db.commit()
+
+def _names(**params):
+    return [item["full_name"] for item in client.get("/api/doctors/search", params=params).json()["items"]]
+
+def test_location_is_a_case_insensitive_exact_match(doctors):
+    assert _names(location="MUMBAI") == ["Dr. Priya Sharma", "Meera Iyer"]
+    assert _names(location="Navi Mumbai") == ["Dr. Arjun Priyadarshi"]
+
+def test_name_matches_a_prefix_with_or_without_the_title(doctors):
+    assert _names(name="pr") == ["Dr. Priya Sharma", "Dr. Pranav Rao"]
+    assert _names(name="Dr. Priya") == ["Dr. Priya Sharma"]
+    assert _names(name="meera") == ["Meera Iyer"]
+    assert _names(name="sharma") == []
+
+def test_search_filters_use_their_indexes(doctors):
+    statements = []
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().startswith("SELECT") and "FROM doctors" in statement:
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        client.get("/api/doctors/search", params={"location": "Pune", "offset": 1})
+        client.get("/api/doctors/search", params={"name": "pra", "offset": 1})
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    with engine.connect() as conn:
+        plans = [" ".join(row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", params))
+                 for sql, params in statements]
+    assert any("ix_doctors_location_lower" in plan for plan in plans)
+    assert any("ix_doctors_full_name_lower" in plan for plan in plans)
+
+def test_cache_is_invalidated_on_commit_not_flush(doctors):
+    client.get("/api/doctors/")
+    assert doctor_cache.stats()["entries"] == 1
+
+    with SessionLocal() as db:
+        db.add(Doctor(id=600, full_name="Dr. New Joiner", specialization="Neurologist", location="Delhi"))
+        db.flush()
+        # Flushed but uncommitted: the cached page is still the committed state
+        assert doctor_cache.stats()["entries"] == 1
+        db.commit()
+    assert doctor_cache.stats()["entries"] == 0
+    assert "Dr. New Joiner" in [doc["full_name"] for doc in client.get("/api/doctors/").json()]
+
+def test_rolled_back_and_bulk_changes(doctors):
+    client.get("/api/doctors/")
+    with SessionLocal() as db:
+        db.add(Doctor(id=601, full_name="Dr. Never Saved", location="Delhi"))
+        db.flush()
+        db.rollback()
+        db.execute(text("SELECT 1"))
+        db.commit()
+    assert doctor_cache.stats()["entries"] == 1
+
+    with SessionLocal() as db:
+        db.query(Doctor).filter(Doctor.id == 500).update({"consultation_fee": 900})
+        db.commit()
+    assert doctor_cache.stats()["entries"] == 0
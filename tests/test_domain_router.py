@@ -0,0 +1,36 @@
+from backend.app.services.domain_router import GENERAL, domain_from_name, route, tag_chunks
+
+CARDIOLOGY = "Atrial fibrillation raises stroke risk; anticoagulation and ECG monitoring of the heart are advised."
+SKIN = "Atopic eczema causes itching and a dry rash; topical steroids calm the skin."
+PARACETAMOL = "Paracetamol 500 mg every six hours relieves fever; do not exceed four grams a day."
+METFORMIN = "Metformin is the first line drug for type 2 diabetes and is taken with meals."
+
+def test_general_textbook_keeps_unclassified_chunks_general():
+    chunks = [CARDIOLOGY, PARACETAMOL, METFORMIN, PARACETAMOL, METFORMIN]
+    assert tag_chunks("general_medicine_textbook.pdf", chunks) == ["cardiology"] + [GENERAL] * 4
+
+def test_file_name_decides_the_untagged_chunks():
+    chunks = [CARDIOLOGY, PARACETAMOL, METFORMIN]
+    assert tag_chunks("heart_failure_guide.pdf", chunks) == ["cardiology"] * 3
+    assert tag_chunks("backend/data/medical_pdfs/Cardiology-Handbook.pdf", chunks) == ["cardiology"] * 3
+    # A chunk that clearly belongs elsewhere keeps its own domain
+    assert tag_chunks("cardiology_handbook.pdf", [SKIN, METFORMIN]) == ["dermatology", "cardiology"]
+
+def test_a_clear_majority_files_the_rest():
+    assert tag_chunks("handbook.pdf", [CARDIOLOGY, CARDIOLOGY, PARACETAMOL]) == ["cardiology"] * 3
+    # Exactly half is not a majority
+    assert tag_chunks("handbook.pdf", [CARDIOLOGY, PARACETAMOL]) == ["cardiology", GENERAL]
+    # Nor is the largest of several specialties
+    assert tag_chunks("handbook.pdf", [CARDIOLOGY, SKIN, METFORMIN]) == ["cardiology", "dermatology", GENERAL]
+
+def test_file_names():
+    assert domain_from_name("skin_conditions.pdf") == "dermatology"
+    assert domain_from_name("Paediatrics Notes.pdf") == "pediatrics"
+    assert domain_from_name("general_physician_manual.pdf") == GENERAL
+    assert domain_from_name("drug_formulary.pdf") == GENERAL
+
+def test_route():
+    assert route(specialty="Cardiologist") == ["cardiology", GENERAL]
+    assert route(query_text="itchy rash on my arm") == ["dermatology", GENERAL]
+    assert route(query_text="what is the dose of paracetamol") is None
+    assert route(specialty="General Physician", query_text="chest pain and palpitations") is None
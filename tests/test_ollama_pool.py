@@ -0,0 +1,38 @@
+import asyncio
+import pytest
+from backend.app.services.ollama_client import OllamaPool
+
+class StallingClient:
+    """Streams one chunk, then hangs like a wedged daemon"""
+    def __init__(self):
+        self.closed = 0
+
+    async def chat(self, model, messages, options=None, stream=False):
+        async def chunks():
+            try:
+                yield {"message": {"content": "Dengue "}}
+                await asyncio.sleep(3600)
+            finally:
+                self.closed += 1
+        return chunks()
+
+def _collect(pool, model):
+    async def run():
+        tokens = []
+        async for chunk in pool.stream_chat(model, [{"role": "user", "content": "hi"}]):
+            tokens.append(chunk["message"]["content"])
+        return tokens
+    return asyncio.run(run())
+
+def test_stalled_stream_times_out_and_frees_the_slot():
+    pool = OllamaPool(timeout=0.2, max_in_flight=1)
+    pool._ensure_loop()
+    pool._client = client = StallingClient()
+
+    for _ in range(2):  # The second stream only starts if the first released both semaphores
+        with pytest.raises(TimeoutError):
+            _collect(pool, "llama3")
+
+    assert pool.timeouts == 2
+    assert pool.active == {"llama3": 0}
+    assert client.closed == 2
@@ -0,0 +1,61 @@
+import random
+from benchmarks.e2e_fixtures import write_pdf
+from backend.app.services.pdf_chunker import CHUNK_SIZE, extract_chunks, iter_chunks, iter_pages, make_splitter
+
+WORDS = "the patient reports fever cough and joint pain; metformin 500 mg daily. blood pressure is high! why?".split()
+
+def _pages(seed, n_pages, line_break="\n", long_lines=False):
+    rng = random.Random(seed)
+    pages = []
+    for page_number in range(1, n_pages + 1):
+        lines = []
+        for _ in range(rng.randint(20, 40)):
+            n_words = rng.choice([4, 9, 15, 200] if long_lines else [4, 9, 15])
+            lines.append(" ".join(rng.choice(WORDS) for _ in range(n_words)))
+        pages.append((page_number, line_break.join(lines)))
+    return pages
+
+def _whole(pages):
+    return make_splitter().split_text("\n".join(text for _, text in pages))
+
+def test_single_window_matches_whole_document_split():
+    pages = _pages(seed=1, n_pages=3)
+    streamed = list(iter_chunks(iter(pages), window=10**9))
+    assert [chunk for chunk, _ in streamed] == _whole(pages)
+
+def test_line_structured_book_matches_whole_document_split_across_windows():
+    pages = _pages(seed=2, n_pages=60)
+    streamed = [chunk for chunk, _ in iter_chunks(iter(pages))]
+    assert len(streamed) > 100
+    assert streamed == _whole(pages)
+
+def test_mixed_structure_stays_ordered_bounded_and_gap_free():
+    # Paragraph breaks and over-long lines: boundaries may move, coverage may not
+    pages = _pages(seed=3, n_pages=40, line_break="\n\n", long_lines=True)
+    document = "\n".join(text for _, text in pages)
+    streamed = list(iter_chunks(iter(pages)))
+
+    assert abs(len(streamed) - len(_whole(pages))) <= max(2, len(streamed) // 50)
+    end, last_page = 0, 0
+    for chunk, page in streamed:
+        assert len(chunk) <= CHUNK_SIZE
+        assert page >= last_page
+        start = document.find(chunk, max(0, end - CHUNK_SIZE))
+        assert start != -1
+        assert document[end:start].strip() == ""  # Nothing skipped between neighbours
+        end, last_page = max(end, start + len(chunk)), page
+    assert document[end:].strip() == ""
+
+def test_chunks_carry_the_page_they_start_on(tmp_path):
+    path = str(tmp_path / "book.pdf")
+    write_pdf(path, [[f"Page {p} line {n} about fever and hydration." for n in range(40)] for p in range(1, 6)])
+
+    result = extract_chunks(path)
+    assert len(result["sha256"]) == 64
+    assert result["pages"][0] == 1 and result["pages"][-1] == 5
+    assert result["pages"] == sorted(result["pages"])
+    page_texts = dict(iter_pages(path))
+    for chunk, page in zip(result["chunks"], result["pages"]):
+        assert chunk[:40] in page_texts[page]
+
+    assert extract_chunks(path, known_sha256=result["sha256"])["unchanged"] is True
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+from benchmarks.e2e_fixtures import write_pdf
+from backend.app.services import rag_service as rag_module
+from backend.app.services.bm25_index import BM25Index
+from backend.app.services.vector_store import QuantizedVectorStore
+
+def _encode(texts):
+    vectors = np.ones((len(texts), 8), dtype=np.float32)
+    vectors[:, 0] = [len(text) for text in texts]
+    return vectors
+
+@pytest.fixture
+def rag(tmp_path, monkeypatch):
+    monkeypatch.setattr(rag_module, "CHROMA_PATH", str(tmp_path))
+    monkeypatch.setattr(rag_module, "VERSION_FILE", str(tmp_path / "curacore_version"))
+    service = object.__new__(rag_module.RAGService)
+    service._encode_documents = _encode
+    service.store = QuantizedVectorStore(str(tmp_path / "store"))
+    service.bm25 = BM25Index(str(tmp_path / "bm25.pkl"))
+    return service
+
+def _pages(topic, n=6):
+    return [[f"{topic} page {p} line {line} " + "clinical notes " * 6 for line in range(12)] for p in range(n)]
+
+def _ids(rag, source):
+    return set(rag.bm25.source_docs.get(source, ()))
+
+def test_new_version_replaces_the_old_one(rag, tmp_path):
+    path = str(tmp_path / "cardio.pdf")
+    write_pdf(path, _pages("aspirin"))
+    first = rag.ingest_file(path, batch_size=4)
+    old_ids = _ids(rag, "cardio.pdf")
+    assert first["chunks"] == len(old_ids) == rag.store.count()
+
+    write_pdf(path, _pages("clopidogrel", n=3))
+    second = rag.ingest_file(path, batch_size=4)
+    new_ids = _ids(rag, "cardio.pdf")
+    assert second["sha256"] != first["sha256"]
+    assert not new_ids & old_ids
+    assert second["chunks"] == len(new_ids) == rag.store.count()
+    _, texts = rag.store.get(sorted(new_ids))
+    assert all("clopidogrel" in text for text in texts)
+
+def test_failure_half_way_keeps_the_previous_version(rag, tmp_path, monkeypatch):
+    path = str(tmp_path / "cardio.pdf")
+    write_pdf(path, _pages("aspirin"))
+    rag.ingest_file(path, batch_size=4)
+    old_ids = _ids(rag, "cardio.pdf")
+    version = rag.data_version()
+
+    pages = rag_module.iter_pages
+    def broken_pages(file_path):
+        for n, page in enumerate(pages(file_path)):
+            if n == 4:
+                raise ValueError("truncated PDF")
+            yield page
+    monkeypatch.setattr(rag_module, "iter_pages", broken_pages)
+
+    write_pdf(path, _pages("clopidogrel"))
+    assert rag.ingest_file(path, batch_size=4) is None
+    assert _ids(rag, "cardio.pdf") == old_ids
+    assert rag.store.count() == len(old_ids)
+    assert rag.data_version() != version  # Other processes drop what they saw mid-write
@@ -0,0 +1,68 @@
+import numpy as np
+from backend.app.services.semantic_cache import SemanticCache
+
+def _vec(*values):
+    return np.array(values, dtype=np.float32)
+
+def test_close_query_hits_and_distant_query_misses():
+    cache = SemanticCache(threshold=0.9)
+    cache.store(_vec(1, 0, 0), "reply", ["source"])
+
+    hit = cache.lookup(_vec(0.99, 0.05, 0))
+    assert hit["reply"] == "reply" and hit["sources"] == ["source"]
+    assert cache.lookup(_vec(0, 1, 0)) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("backend.app.services.semantic_cache.time.monotonic", lambda: now[0])
+    cache = SemanticCache(threshold=0.9, ttl_seconds=60)
+    cache.store(_vec(1, 0), "reply", [])
+
+    now[0] += 59
+    assert cache.lookup(_vec(1, 0)) is not None
+    now[0] += 2
+    assert cache.lookup(_vec(1, 0)) is None
+    assert cache.stats()["entries"] == 0
+
+def test_least_recently_used_entry_is_evicted():
+    cache = SemanticCache(threshold=0.99, max_entries=2)
+    cache.store(_vec(1, 0, 0), "a", [])
+    cache.store(_vec(0, 1, 0), "b", [])
+    assert cache.lookup(_vec(1, 0, 0))["reply"] == "a"  # "b" is now least recently used
+
+    cache.store(_vec(0, 0, 1), "c", [])
+    assert cache.lookup(_vec(0, 1, 0)) is None
+    assert cache.lookup(_vec(1, 0, 0))["reply"] == "a"
+    assert cache.evictions == 1
+
+def test_byte_bound_evicts_and_oversized_entries_are_skipped():
+    cache = SemanticCache(threshold=0.99, max_bytes=200)
+    cache.store(_vec(1, 0), "x" * 500, [])
+    assert cache.stats()["entries"] == 0
+
+    cache.store(_vec(1, 0), "x" * 100, [])
+    cache.store(_vec(0, 1), "y" * 100, [])
+    assert cache.stats()["entries"] == 1
+    assert cache.stats()["bytes"] <= 200
+
+def test_data_version_change_drops_everything():
+    cache = SemanticCache(threshold=0.9)
+    cache.store(_vec(1, 0), "old answer", [], data_version=1)
+    assert cache.lookup(_vec(1, 0), data_version=1) is not None
+
+    assert cache.lookup(_vec(1, 0), data_version=2) is None
+    assert cache.invalidations == 1
+    assert cache.stats()["entries"] == 0
+
+def test_entries_only_match_their_own_scope():
+    cache = SemanticCache(threshold=0.9)
+    cache.store(_vec(1, 0), "cardiology answer", [], scope="cardiology")
+
+    assert cache.lookup(_vec(1, 0), scope="dermatology") is None
+    assert cache.lookup(_vec(1, 0)) is None
+    assert cache.lookup(_vec(1, 0), scope="cardiology")["reply"] == "cardiology answer"
+
+    cache.store(_vec(1, 0), "unrouted answer", [])
+    assert cache.lookup(_vec(1, 0))["reply"] == "unrouted answer"
+    assert cache.lookup(_vec(1, 0), scope="cardiology")["reply"] == "cardiology answer"
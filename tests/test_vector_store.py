@@ -0,0 +1,113 @@
+import os
+import numpy as np
+import pytest
+from backend.app.services.vector_store import QuantizedVectorStore
+
+DIM = 32
+
+def _corpus(n, seed=0):
+    rng = np.random.default_rng(seed)
+    vectors = rng.standard_normal((n, DIM)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    ids = [f"doc_{i}" for i in range(n)]
+    metas = [{"source": f"file_{i % 4}.pdf", "page": i} for i in range(n)]
+    return ids, [f"text {i}" for i in range(n)], vectors, metas
+
+def _exact_top(vectors, query, k):
+    return list(np.argsort(-(vectors @ query))[:k])
+
+@pytest.mark.parametrize("dtype", ["int8", "float16"])
+def test_top_k_matches_exact_search(tmp_path, dtype):
+    ids, docs, vectors, metas = _corpus(500)
+    store = QuantizedVectorStore(str(tmp_path), dtype=dtype)
+    store.add(ids, docs, vectors.tolist(), metas)
+
+    for q in range(10):
+        query = vectors[q * 7] + 0.1 * vectors[q * 13]
+        query /= np.linalg.norm(query)
+        found, texts, scores = store.query(query.tolist(), 5)
+        assert found == [ids[i] for i in _exact_top(vectors, query, 5)]
+        assert texts == [f"text {found_id.split('_')[1]}" for found_id in found]
+        assert scores == sorted(scores, reverse=True)
+        assert scores[0] == pytest.approx(float(vectors[int(found[0].split("_")[1])] @ query), abs=1e-5)
+
+def test_deleted_and_replaced_rows_are_not_returned(tmp_path):
+    ids, docs, vectors, metas = _corpus(40)
+    store = QuantizedVectorStore(str(tmp_path))
+    store.add(ids, docs, vectors.tolist(), metas)
+
+    store.delete_source("file_0.pdf")
+    assert store.count() == 30
+    found, _, _ = store.query(vectors[0].tolist(), 40)
+    assert len(found) == 30
+    assert not any(metas[int(i.split("_")[1])]["source"] == "file_0.pdf" for i in found)
+
+    # Re-adding an id keeps one live copy, with the new text and vector
+    store.add(["doc_1"], ["replaced"], [vectors[2].tolist()], [metas[1]])
+    assert store.count() == 30
+    assert store.get(["doc_1", "doc_0"]) == (["doc_1"], ["replaced"])
+
+def test_compact_drops_tombstones_and_keeps_results(tmp_path):
+    ids, docs, vectors, metas = _corpus(80)
+    store = QuantizedVectorStore(str(tmp_path))
+    store.add(ids, docs, vectors.tolist(), metas)
+    store.delete_source("file_1.pdf")
+    store.delete_source("file_2.pdf")
+    query = vectors[3].tolist()
+    before = store.query(query, 10)
+
+    store.flush()  # Half the rows are dead: compacts
+    assert store._rows == 40 and len(store._deleted) == 0
+    assert store.query(query, 10) == before
+
+    reopened = QuantizedVectorStore(str(tmp_path))
+    assert reopened.count() == 40
+    assert reopened.query(query, 10)[0] == before[0]
+    assert [page_ids for page_ids, _, _ in reopened.iter_all(page_size=25)][-1][-1] == "doc_79"
+
+@pytest.mark.parametrize("dtype", ["int8", "float16"])
+def test_compaction_by_another_process_is_picked_up_by_readers(tmp_path, dtype):
+    ids, docs, vectors, metas = _corpus(80)
+    writer = QuantizedVectorStore(str(tmp_path), dtype=dtype)  # e.g. ingest_pdfs.py
+    writer.add(ids, docs, vectors.tolist(), metas)
+    reader = QuantizedVectorStore(str(tmp_path), dtype=dtype)  # e.g. the API server, never told to refresh
+
+    writer.delete_source("file_1.pdf")
+    writer.delete_source("file_2.pdf")
+    writer.compact()
+    # Only the new generation's files are left (the old ones stay readable through open handles)
+    assert sorted(name for name in os.listdir(tmp_path) if not name.startswith("chunks.sqlite")) == \
+        sorted(os.path.basename(writer._file(name)) for name in writer._vector_files)
+
+    for q in (0, 3, 4, 7):
+        query = vectors[q]
+        found, texts, scores = reader.query(query.tolist(), 5)
+        live = [i for i in range(80) if metas[i]["source"] not in ("file_1.pdf", "file_2.pdf")]
+        assert found == [ids[live[i]] for i in _exact_top(vectors[live], query, 5)]
+        assert texts == [docs[int(found_id.split("_")[1])] for found_id in found]
+    assert reader._generation == writer._generation == 1
+
+def test_short_read_refreshes_instead_of_failing(tmp_path):
+    ids, docs, vectors, metas = _corpus(40)
+    store = QuantizedVectorStore(str(tmp_path))
+    store.add(ids, docs, vectors.tolist(), metas)
+    os.truncate(store._file("vectors.f32"), 10 * DIM * 4)
+
+    assert store.query(vectors[30].tolist(), 3) == ([], [], [])
+
+def test_caller_arrays_are_not_modified(tmp_path):
+    ids, docs, vectors, metas = _corpus(8)
+    scaled = vectors * 3.0  # Unnormalised float32, the dtype the store converts to
+    original = scaled.copy()
+    store = QuantizedVectorStore(str(tmp_path))
+    store.add(ids, docs, scaled, metas)
+    found, _, _ = store.query(scaled[0], 1)
+
+    assert found == ["doc_0"]
+    np.testing.assert_array_equal(scaled, original)
+
+def test_dtype_mismatch_is_refused(tmp_path):
+    ids, docs, vectors, metas = _corpus(4)
+    QuantizedVectorStore(str(tmp_path), dtype="int8").add(ids, docs, vectors.tolist(), metas)
+    with pytest.raises(ValueError):
+        QuantizedVectorStore(str(tmp_path), dtype="float16")
@@ -0,0 +1,41 @@
+import asyncio
+import io
+import pytest
+from fastapi import HTTPException, UploadFile
+from fastapi.testclient import TestClient
+from backend.app.main import app
+from backend.app.api import voice
+
+client = TestClient(app)
+
+class _CountingFile(io.BytesIO):
+    def __init__(self, data):
+        super().__init__(data)
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self.bytes_read += len(data)
+        return data
+
+@pytest.fixture
+def small_limit(monkeypatch):
+    monkeypatch.setattr(voice.config, "TRANSCRIBE_MAX_UPLOAD_MB", 2)
+    monkeypatch.setattr(voice, "_transcribe", lambda data, suffix, on_partial=None: f"{len(data)} bytes{suffix}")
+
+def test_upload_within_limit_is_transcribed(small_limit):
+    resp = client.post("/api/voice/transcribe", files={"file": ("clip.wav", b"\0" * 1000, "audio/wav")})
+    assert resp.status_code == 200
+    assert resp.json() == {"text": "1000 bytes.wav"}
+
+def test_oversized_upload_is_413(small_limit):
+    resp = client.post("/api/voice/transcribe", files={"file": ("clip.wav", b"\0" * (3 * 1024 * 1024), "audio/wav")})
+    assert resp.status_code == 413
+
+def test_unknown_size_upload_stops_reading_past_the_limit(small_limit):
+    source = _CountingFile(b"\0" * (20 * 1024 * 1024))
+    upload = UploadFile(source, filename="clip.wav")  # No size: must not be read to the end
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(voice._read_upload(upload))
+    assert error.value.status_code == 413
+    assert source.bytes_read <= 2 * 1024 * 1024 + voice.READ_CHUNK_BYTES
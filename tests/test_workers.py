@@ -0,0 +1,39 @@
+import json
+import os
+import stat
+import subprocess
+import sys
+import time
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _config(**env):
+    script = ("import json; from backend.app.core import config; print(json.dumps([config.OLLAMA_MAX_IN_FLIGHT, "
+              "config.OLLAMA_DEFAULT_MODEL_CONCURRENCY, config.OLLAMA_MODEL_CONCURRENCY, config.SUMMARY_WORKERS]))")
+    out = subprocess.run([sys.executable, "-c", script], cwd=ROOT, env={**os.environ, **env},
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out)
+
+def test_ollama_limits_are_split_between_api_workers():
+    limits = {"CURACORE_OLLAMA_MAX_IN_FLIGHT": "4", "CURACORE_OLLAMA_MODEL_CONCURRENCY": "2",
+              "CURACORE_OLLAMA_CONCURRENCY": "gemma:2b=4,llama3=1", "CURACORE_SUMMARY_WORKERS": "2"}
+    assert _config(**limits) == [4, 2, {"gemma:2b": 4, "llama3": 1}, 2]
+    assert _config(CURACORE_API_WORKERS="2", **limits) == [2, 1, {"gemma:2b": 2, "llama3": 1}, 1]
+    # Never below one slot per worker
+    assert _config(CURACORE_API_WORKERS="8", **limits) == [1, 1, {"gemma:2b": 1, "llama3": 1}, 1]
+
+@pytest.mark.skipif(sys.platform == "win32", reason="named pipe, not a socket file")
+def test_model_server_socket_is_private_from_the_start(tmp_path):
+    address = str(tmp_path / "models.sock")
+    proc = subprocess.Popen([sys.executable, "-m", "backend.app.services.model_server", "--address", address],
+                            cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        deadline = time.monotonic() + 30
+        while not os.path.exists(address):
+            assert proc.poll() is None and time.monotonic() < deadline
+            time.sleep(0.05)
+        assert stat.S_IMODE(os.stat(address).st_mode) == 0o600
+    finally:
+        proc.kill()
+        proc.wait()